@@ -93,6 +93,13 @@ def run_migrations_online() -> None:
         with context.begin_transaction():
             context.run_migrations()
 
+    # Migrations may add or rebuild guarded tables; make sure each carries the
+    # org-blocklist trigger before anything writes to it. No-op when the guard
+    # is already in place.
+    from app.core.org_blocklist import install_db_guard
+
+    install_db_guard(connectable)
+
 
 if context.is_offline_mode():
     run_migrations_offline()
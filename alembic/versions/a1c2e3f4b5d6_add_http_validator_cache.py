@@ -0,0 +1,42 @@
+"""add http_validator_cache (ETag/Last-Modified cache for provider REST calls)
+
+Also merges the two heads (runner_heartbeats.restart_requested_at and
+agent_tasks.log) so `alembic upgrade head` has a single target again.
+
+Revision ID: a1c2e3f4b5d6
+Revises: 31f4c9ab7de1, f3d4e5a6b7c8
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = 'a1c2e3f4b5d6'
+down_revision: Union[str, tuple[str, ...], None] = ('31f4c9ab7de1', 'f3d4e5a6b7c8')
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'http_validator_cache',
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('url', sa.Text(), nullable=False),
+        sa.Column('etag', sa.String(), nullable=True),
+        sa.Column('last_modified', sa.String(), nullable=True),
+        sa.Column('status_code', sa.Integer(), nullable=False),
+        sa.Column('headers', postgresql.JSONB(astext_type=sa.Text()), server_default='{}', nullable=False),
+        sa.Column('body', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('cache_key'),
+    )
+    op.create_index('ix_http_validator_cache_last_used', 'http_validator_cache', ['last_used_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_http_validator_cache_last_used', table_name='http_validator_cache')
+    op.drop_table('http_validator_cache')
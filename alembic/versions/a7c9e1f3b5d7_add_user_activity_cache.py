@@ -0,0 +1,43 @@
+"""add_user_activity_cache
+
+Revision ID: a7c9e1f3b5d7
+Revises: f6b8d0e2a4c6
+Create Date: 2026-10-16 00:00:00.000006
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c9e1f3b5d7'
+down_revision: Union[str, None] = 'f6b8d0e2a4c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_activity_cache',
+        sa.Column('connection_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('date_from', sa.Date(), nullable=False),
+        sa.Column('date_to', sa.Date(), nullable=False),
+        sa.Column('username', sa.String(), nullable=False),
+        sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['connection_id'], ['productivity_connections.id'], ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('connection_id', 'date_from', 'date_to'),
+    )
+    op.create_index(
+        'ix_user_activity_cache_last_used', 'user_activity_cache', ['last_used_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_activity_cache_last_used', table_name='user_activity_cache')
+    op.drop_table('user_activity_cache')
@@ -0,0 +1,34 @@
+"""add_branch_heads_to_connections
+
+Revision ID: b2d3e4f5a6c7
+Revises: a1c2e3f4b5d6
+Create Date: 2026-10-16 00:00:00.000001
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d3e4f5a6c7'
+down_revision: Union[str, None] = 'a1c2e3f4b5d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'productivity_connections',
+        sa.Column(
+            'branch_heads',
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=False,
+            server_default='{}',
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('productivity_connections', 'branch_heads')
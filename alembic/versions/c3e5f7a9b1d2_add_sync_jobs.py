@@ -0,0 +1,57 @@
+"""add_sync_jobs
+
+Revision ID: c3e5f7a9b1d2
+Revises: b2d3e4f5a6c7
+Create Date: 2026-10-16 00:00:00.000002
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5f7a9b1d2'
+down_revision: Union[str, None] = 'b2d3e4f5a6c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sync_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('connection_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('trigger', sa.String(), nullable=False),
+        sa.Column('worker', sa.String(), nullable=True),
+        sa.Column('queued_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('commits_synced', sa.Integer(), nullable=True),
+        sa.Column('prs_synced', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ['connection_id'], ['productivity_connections.id'], ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'uq_sync_jobs_active_connection',
+        'sync_jobs',
+        ['connection_id'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+    op.create_index('ix_sync_jobs_status_queued_at', 'sync_jobs', ['status', 'queued_at'])
+    op.create_index(
+        'ix_sync_jobs_connection_queued_at', 'sync_jobs', ['connection_id', 'queued_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sync_jobs_connection_queued_at', table_name='sync_jobs')
+    op.drop_index('ix_sync_jobs_status_queued_at', table_name='sync_jobs')
+    op.drop_index('uq_sync_jobs_active_connection', table_name='sync_jobs')
+    op.drop_table('sync_jobs')
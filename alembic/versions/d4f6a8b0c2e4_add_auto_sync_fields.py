@@ -0,0 +1,35 @@
+"""add_auto_sync_fields
+
+Revision ID: d4f6a8b0c2e4
+Revises: c3e5f7a9b1d2
+Create Date: 2026-10-16 00:00:00.000003
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f6a8b0c2e4'
+down_revision: Union[str, None] = 'c3e5f7a9b1d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'productivity_connections',
+        sa.Column('sync_failures', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.add_column(
+        'productivity_connections',
+        sa.Column('auto_sync_interval_minutes', sa.Integer(), nullable=True),
+    )
+    op.add_column('sync_jobs', sa.Column('run_after', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('sync_jobs', 'run_after')
+    op.drop_column('productivity_connections', 'auto_sync_interval_minutes')
+    op.drop_column('productivity_connections', 'sync_failures')
@@ -0,0 +1,101 @@
+"""add_local_commit_rollup
+
+Revision ID: e5a7c9d1f3b5
+Revises: d4f6a8b0c2e4
+Create Date: 2026-10-16 00:00:00.000004
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c9d1f3b5'
+down_revision: Union[str, None] = 'd4f6a8b0c2e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of app.services.local_commits.normalize_remote as of this revision.
+_SSH_REMOTE = re.compile(r"^[^@]+@[^:]+:([^/]+)/(.+)$")
+_PROTO_REMOTE = re.compile(r"^[a-z]+://[^/]+/(.+)$")
+
+
+def _normalize_remote(remote: str, fallback_repo_name: str) -> str:
+    if not remote:
+        return f"(local) {fallback_repo_name}" if fallback_repo_name else "(local)"
+    s = remote.strip().rstrip("/")
+    if s.endswith(".git"):
+        s = s[:-4]
+    m = _SSH_REMOTE.match(s)
+    if m:
+        return f"{m.group(1)}/{m.group(2)}"
+    m = _PROTO_REMOTE.match(s)
+    if m:
+        parts = m.group(1).split("/")
+        if len(parts) >= 2:
+            return f"{parts[-2]}/{parts[-1]}"
+        return m.group(1)
+    return s
+
+
+def upgrade() -> None:
+    op.add_column(
+        'local_commits',
+        sa.Column('remote_key', sa.String(), nullable=False, server_default=''),
+    )
+    bind = op.get_bind()
+    pairs = bind.execute(
+        sa.text("SELECT DISTINCT remote_url, repo_name FROM local_commits")
+    ).all()
+    for remote_url, repo_name in pairs:
+        bind.execute(
+            sa.text(
+                "UPDATE local_commits SET remote_key = :key "
+                "WHERE remote_url = :remote_url AND repo_name = :repo_name"
+            ),
+            {
+                "key": _normalize_remote(remote_url, repo_name),
+                "remote_url": remote_url,
+                "repo_name": repo_name,
+            },
+        )
+
+    op.create_index(
+        'ix_local_commits_lower_email_committed_at',
+        'local_commits',
+        [sa.text('lower(email)'), 'committed_at'],
+    )
+
+    op.create_table(
+        'local_commit_daily',
+        sa.Column('email', sa.String(), nullable=False),
+        sa.Column('remote_key', sa.String(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('commits', sa.Integer(), nullable=False),
+        sa.Column('additions', sa.Integer(), nullable=False),
+        sa.Column('deletions', sa.Integer(), nullable=False),
+        sa.Column('last_commit', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('remote_url', sa.String(), nullable=False),
+        sa.Column('repo_name', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('email', 'remote_key', 'day'),
+    )
+    op.execute(
+        """
+        INSERT INTO local_commit_daily
+            (email, remote_key, day, commits, additions, deletions,
+             last_commit, remote_url, repo_name)
+        SELECT lower(email), remote_key, (committed_at AT TIME ZONE 'UTC')::date,
+               count(*), sum(additions), sum(deletions),
+               max(committed_at), min(remote_url), min(repo_name)
+        FROM local_commits
+        GROUP BY lower(email), remote_key, (committed_at AT TIME ZONE 'UTC')::date
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('local_commit_daily')
+    op.drop_index('ix_local_commits_lower_email_committed_at', table_name='local_commits')
+    op.drop_column('local_commits', 'remote_key')
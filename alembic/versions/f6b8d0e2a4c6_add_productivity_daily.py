@@ -0,0 +1,61 @@
+"""add_productivity_daily
+
+Revision ID: f6b8d0e2a4c6
+Revises: e5a7c9d1f3b5
+Create Date: 2026-10-16 00:00:00.000005
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b8d0e2a4c6'
+down_revision: Union[str, None] = 'e5a7c9d1f3b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'productivity_daily',
+        sa.Column('connection_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('repository', sa.String(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('commits', sa.Integer(), nullable=False),
+        sa.Column('additions', sa.Integer(), nullable=False),
+        sa.Column('deletions', sa.Integer(), nullable=False),
+        sa.Column('prs', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['connection_id'], ['productivity_connections.id'], ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('connection_id', 'repository', 'day'),
+    )
+    op.execute(
+        """
+        INSERT INTO productivity_daily
+            (connection_id, repository, day, commits, additions, deletions, prs)
+        SELECT connection_id, repository, day,
+               sum(commits), sum(additions), sum(deletions), sum(prs)
+        FROM (
+            SELECT connection_id, repository, date::date AS day,
+                   count(*) AS commits, sum(additions) AS additions,
+                   sum(deletions) AS deletions, 0 AS prs
+            FROM productivity_commits
+            WHERE NOT is_merge
+            GROUP BY connection_id, repository, date::date
+            UNION ALL
+            SELECT connection_id, repository, created_at_remote::date,
+                   0, 0, 0, count(*)
+            FROM productivity_pull_requests
+            GROUP BY connection_id, repository, created_at_remote::date
+        ) AS per_day
+        GROUP BY connection_id, repository, day
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('productivity_daily')
@@ -2,10 +2,12 @@ import logging
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user
-from app.core.db import get_db
+from app.core.db import get_async_db, get_db
+from app.core.pagination import Page, page_params
 from app.models.user import User
 from app.schemas.address_pr import (
     ApproveRequest,
@@ -32,10 +34,11 @@ router = APIRouter(prefix="/address-pr", tags=["address-pr"])
 
 @router.get("/runs", response_model=list[RunRead])
 def list_runs(
+    page: Page = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    runs = svc.list_runs(db, current_user.id)
+    runs = svc.list_runs(db, current_user.id, page)
     return [svc.to_run_read(r) for r in runs]
 
 
@@ -135,25 +138,28 @@ def cancel_run(
 # --- Runner-facing endpoints (execution plane) ---
 
 
+def _claim_run_read(db: Session, runner_id: str, claim=svc.claim_next_run) -> dict | None:
+    run = claim(db, runner_id)
+    return svc.to_run_read(run) if run else None
+
+
 @router.post("/runner/claim", response_model=RunRead | None)
-def runner_claim(
+async def runner_claim(
     data: ClaimRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: bool = Depends(require_runner),
 ):
-    run = svc.claim_next_run(db, data.runner_id)
-    return svc.to_run_read(run) if run else None
+    return await db.run_sync(_claim_run_read, data.runner_id)
 
 
 @router.post("/runner/claim-cleanup", response_model=RunRead | None)
-def runner_claim_cleanup(
+async def runner_claim_cleanup(
     data: ClaimRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: bool = Depends(require_runner),
 ):
     """Atomically claim a cancelled run with a leftover worktree to remove."""
-    run = svc.claim_cancelled_for_cleanup(db, data.runner_id)
-    return svc.to_run_read(run) if run else None
+    return await db.run_sync(_claim_run_read, data.runner_id, svc.claim_cancelled_for_cleanup)
 
 
 @router.patch("/runner/runs/{run_id}", response_model=RunRead)
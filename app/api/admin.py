@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.core import auth_cache, startup
+from app.core.auth import require_admin
+from app.core.db import pool_stats, reset_pool_stats
+from app.models.user import User
+from app.schemas.admin import AuthCacheStats, PoolStats, StartupReport
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/db-pool", response_model=list[PoolStats])
+def get_db_pool_stats(
+    reset: bool = Query(default=False, description="Zero the counters after reading them"),
+    current_user: User = Depends(require_admin),
+):
+    """Connection-pool statistics for this API process, one entry per engine,
+    to size DB_POOL_SIZE / DB_MAX_OVERFLOW from data rather than from
+    QueuePool limit errors."""
+    stats = pool_stats()
+    if reset:
+        reset_pool_stats()
+    return stats
+
+
+@router.get("/auth-cache", response_model=AuthCacheStats)
+def get_auth_cache_stats(
+    reset: bool = Query(default=False, description="Zero the counters after reading them"),
+    current_user: User = Depends(require_admin),
+):
+    """Hit ratio and estimated latency saved by the verified-token cache."""
+    stats = auth_cache.stats()
+    if reset:
+        auth_cache.reset_stats()
+    return stats
+
+
+@router.get("/startup", response_model=StartupReport)
+def get_startup_report(current_user: User = Depends(require_admin)):
+    """How long this process took to boot, step by step, slowest first —
+    including work deferred to first use (`lazy`)."""
+    return startup.report()
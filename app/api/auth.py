@@ -2,6 +2,7 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.core import auth_cache
 from app.core.db import get_db
 from app.core.firebase import verify_firebase_token
 from app.models.user import User
@@ -85,6 +86,7 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
 
     user.last_login = datetime.utcnow()
     db.commit()
+    auth_cache.invalidate_user(user.id)
     db.refresh(user)
 
     return user
@@ -1,11 +1,13 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user
 from app.core.config import settings
-from app.core.db import get_db
+from app.core.db import get_async_db, get_db
+from app.core.pagination import Page, page_params
 from app.models.user import User
 from app.schemas.automations import (
     AutomationCreate,
@@ -22,7 +24,7 @@ from app.services import automation_service as svc
 router = APIRouter(prefix="/automations", tags=["automations"])
 
 
-def require_runner(x_runner_token: str | None = Header(default=None)) -> bool:
+async def require_runner(x_runner_token: str | None = Header(default=None)) -> bool:
     if not settings.RUNNER_TOKEN:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -41,10 +43,11 @@ def require_runner(x_runner_token: str | None = Header(default=None)) -> bool:
 
 @router.get("", response_model=list[AutomationRead])
 def list_automations(
+    page: Page = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return svc.list_automations(db, current_user.id)
+    return svc.list_automations(db, current_user.id, page)
 
 
 @router.get("/skills", response_model=list[str])
@@ -143,12 +146,12 @@ def delete_automation(
 
 
 @router.post("/runner/claim")
-def runner_claim_automation(
+async def runner_claim_automation(
     data: ClaimAutomationRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: bool = Depends(require_runner),
 ):
-    run = svc.claim_next_automation_run(db, data.runner_id)
+    run = await db.run_sync(svc.claim_next_automation_run, data.runner_id)
     if run is None:
         return Response(status_code=status.HTTP_204_NO_CONTENT)
     return run
@@ -1,10 +1,11 @@
 from datetime import date
 
 from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user
-from app.core.db import get_db
+from app.core.db import get_async_db, get_db
 from app.models.user import User
 from app.schemas.briefing import BriefingRead, EventRead
 from app.services import platform_events_service as svc
@@ -13,12 +14,12 @@ router = APIRouter(prefix="/briefing", tags=["briefing"])
 
 
 @router.get("", response_model=BriefingRead)
-def get_briefing(
+async def get_briefing(
     target_date: date | None = Query(default=None, alias="date"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    return svc.build_briefing(db, target_date or date.today())
+    return await db.run_sync(svc.build_briefing, target_date or date.today())
 
 
 @router.get("/events", response_model=list[EventRead])
@@ -2,10 +2,12 @@ import logging
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user
-from app.core.db import get_db
+from app.core.db import get_async_db, get_db
+from app.core.pagination import Page, page_params
 from app.models.user import User
 from app.schemas.code_reviews import (
     ApproveRequest,
@@ -32,10 +34,11 @@ router = APIRouter(prefix="/code-reviews", tags=["code-reviews"])
 
 @router.get("/runs", response_model=list[RunRead])
 def list_runs(
+    page: Page = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    runs = svc.list_runs(db, current_user.id)
+    runs = svc.list_runs(db, current_user.id, page)
     return [svc.to_run_read(r) for r in runs]
 
 
@@ -135,14 +138,18 @@ def cancel_run(
 # --- Runner-facing endpoints (execution plane) ---
 
 
+def _claim_run_read(db: Session, runner_id: str) -> dict | None:
+    run = svc.claim_next_run(db, runner_id)
+    return svc.to_run_read(run) if run else None
+
+
 @router.post("/runner/claim", response_model=RunRead | None)
-def runner_claim(
+async def runner_claim(
     data: ClaimRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: bool = Depends(require_runner),
 ):
-    run = svc.claim_next_run(db, data.runner_id)
-    return svc.to_run_read(run) if run else None
+    return await db.run_sync(_claim_run_read, data.runner_id)
 
 
 @router.patch("/runner/runs/{run_id}", response_model=RunRead)
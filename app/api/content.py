@@ -16,6 +16,7 @@ from sqlalchemy.orm import Session
 from app.core.auth import get_current_user
 from app.core.config import settings
 from app.core.db import get_db
+from app.core.pagination import Page, page_params
 from app.models.user import User
 from app.schemas.content import (
     CadenceWeek,
@@ -61,10 +62,11 @@ def require_runner(x_runner_token: str | None = Header(default=None)) -> bool:
 @router.get("/ideas", response_model=list[IdeaRead])
 def list_ideas(
     status_filter: str | None = None,
+    page: Page = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return svc.list_ideas(db, current_user.id, status_filter)
+    return svc.list_ideas(db, current_user.id, status_filter, page)
 
 
 @router.post("/ideas", response_model=IdeaRead, status_code=status.HTTP_201_CREATED)
@@ -11,11 +11,12 @@ from datetime import datetime
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Header, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user
 from app.core.config import settings
-from app.core.db import get_db
+from app.core.db import get_async_db, get_db
 from app.models.user import User
 from app.schemas.empresa import (
     AgentRead,
@@ -34,7 +35,7 @@ from app.services import empresa_service as svc
 router = APIRouter(prefix="/empresa", tags=["empresa"])
 
 
-def require_runner(x_runner_token: str | None = Header(default=None)) -> bool:
+async def require_runner(x_runner_token: str | None = Header(default=None)) -> bool:
     if not settings.RUNNER_TOKEN:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -205,13 +206,18 @@ def runner_create_task(
     return svc.create_task(db, data.model_dump())
 
 
+def _claim_task_read(db: Session, runner_id: str) -> TaskRead | None:
+    task = svc.claim_next_task(db, runner_id)
+    return TaskRead.model_validate(task) if task else None
+
+
 @router.post("/runner/claim", response_model=TaskRead | None)
-def runner_claim(
+async def runner_claim(
     data: ClaimRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: bool = Depends(require_runner),
 ):
-    return svc.claim_next_task(db, data.runner_id)
+    return await db.run_sync(_claim_task_read, data.runner_id)
 
 
 @router.patch("/runner/tasks/{task_id}", response_model=TaskRead)
@@ -2,11 +2,13 @@ import logging
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Header, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user
 from app.core.config import settings
-from app.core.db import get_db
+from app.core.db import get_async_db, get_db
+from app.core.pagination import Page, page_params
 from app.models.user import User
 from app.schemas.implementations import (
     ClaimRequest,
@@ -31,10 +33,11 @@ router = APIRouter(prefix="/implementations", tags=["implementations"])
 
 @router.get("/runs", response_model=list[RunRead])
 def list_runs(
+    page: Page = Depends(page_params),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    runs = svc.list_runs(db, current_user.id)
+    runs = svc.list_runs(db, current_user.id, page)
     return [svc.to_run_read(r) for r in runs]
 
 
@@ -165,7 +168,7 @@ def get_connection_repos(
 # --- Runner-facing endpoints (execution plane) ---
 
 
-def require_runner(x_runner_token: str | None = Header(default=None)) -> bool:
+async def require_runner(x_runner_token: str | None = Header(default=None)) -> bool:
     """Guards runner endpoints with a shared secret (settings.RUNNER_TOKEN)."""
     if not settings.RUNNER_TOKEN:
         raise HTTPException(
@@ -189,26 +192,31 @@ def runner_register_repos(
     svc.register_repos(data.connection_name, [r.model_dump() for r in data.repos])
 
 
+def _claim_run_read(db: Session, runner_id: str, claim=svc.claim_next_run) -> dict | None:
+    # Serialized inside run_sync: to_run_read touches run.connection, a lazy
+    # load that can't happen once we're back on the event loop.
+    run = claim(db, runner_id)
+    return svc.to_run_read(run) if run else None
+
+
 @router.post("/runner/claim", response_model=RunRead | None)
-def runner_claim(
+async def runner_claim(
     data: ClaimRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: bool = Depends(require_runner),
 ):
     """Atomically claim the next queued run. Returns null when the queue is empty."""
-    run = svc.claim_next_run(db, data.runner_id)
-    return svc.to_run_read(run) if run else None
+    return await db.run_sync(_claim_run_read, data.runner_id)
 
 
 @router.post("/runner/claim-cleanup", response_model=RunRead | None)
-def runner_claim_cleanup(
+async def runner_claim_cleanup(
     data: ClaimRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: bool = Depends(require_runner),
 ):
     """Atomically claim a cancelled run with leftover worktrees to remove."""
-    run = svc.claim_cancelled_for_cleanup(db, data.runner_id)
-    return svc.to_run_read(run) if run else None
+    return await db.run_sync(_claim_run_read, data.runner_id, svc.claim_cancelled_for_cleanup)
 
 
 @router.patch("/runner/runs/{run_id}", response_model=RunRead)
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user
 from app.core.db import get_db
+from app.core.pagination import Page, page_params
 from app.models.bank_account import BankAccount
 from app.models.customer import Customer
 from app.models.invoice import Invoice
@@ -39,6 +40,7 @@ def list_invoices(
     customer_id: UUID | None = Query(None),
     issue_date_from=Query(None),
     issue_date_to=Query(None),
+    page: Page = Depends(page_params),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -53,8 +55,7 @@ def list_invoices(
     if issue_date_to:
         query = query.filter(Invoice.issue_date <= issue_date_to)
 
-    query = query.order_by(Invoice.issue_date.desc())
-    return query.all()
+    return page.apply(query, Invoice.issue_date.desc())
 
 
 @router.get("/{invoice_id}", response_model=InvoiceRead)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.core import metrics
+from app.core.config import settings
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics(authorization: str | None = Header(default=None)):
+    """Per-route request metrics in Prometheus text format (see app/core/metrics.py)."""
+    if settings.METRICS_TOKEN and authorization != f"Bearer {settings.METRICS_TOKEN}":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+        )
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -1,25 +1,34 @@
 import asyncio
 import json
 import logging
-import re
-from datetime import datetime, timedelta, timezone
+import time
+from collections.abc import AsyncIterator
+from datetime import date, datetime, timedelta
 from uuid import UUID
 
 logger = logging.getLogger(__name__)
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core import http_pool
 from app.core.auth import get_current_user
+from app.core.config import settings
 from app.core.db import get_db
 from app.core.encryption import decrypt_value, encrypt_value, mask_pat
+from app.core.org_blocklist import MESSAGE as BLOCKED_MESSAGE, find_blocked
+from app.core.pagination import Page, page_params
 from app.models.contract import Contract
-from app.models.local_commit import LocalCommit
+from app.models.local_commit_daily import LocalCommitDaily
 from app.models.productivity_commit import ProductivityCommit
 from app.models.productivity_connection import ProductivityConnection
+from app.models.productivity_daily import ProductivityDaily
 from app.models.productivity_pull_request import ProductivityPullRequest
+from app.models.sync_job import SyncJob
 from app.models.user import User
 from app.models.user_git_email import UserGitEmail
 from app.schemas.productivity import (
@@ -33,19 +42,16 @@ from app.schemas.productivity import (
     GitEmailCreate,
     GitEmailRead,
     PullRequestRead,
+    RateLimitBudget,
+    SyncJobRead,
     SyncResult,
     UserActivityResponse,
     ValidateTokenRequest,
     ValidateTokenResponse,
 )
+from app.services import github_rate_limit, local_commits, sync_jobs, sync_progress, user_activity_cache
 from app.services.bitbucket_provider import BitbucketProvider
 from app.services.github_provider import GitHubAccessError, GitHubProvider
-from app.services.productivity_sync import (
-    _claim_sync,
-    _release_sync,
-    is_sync_in_flight,
-    sync_connection,
-)
 
 router = APIRouter(prefix="/productivity", tags=["productivity"])
 
@@ -56,29 +62,30 @@ def _end_of_day(date_str: str) -> datetime:
     return dt + timedelta(days=1)
 
 
-def _sync_in_background(connection_id: UUID) -> None:
-    from app.core.db import SessionLocal
-    db = SessionLocal()
+def _parse_day(date_str: str) -> date:
     try:
-        conn = db.query(ProductivityConnection).filter(
-            ProductivityConnection.id == connection_id
-        ).first()
-        if conn:
-            sync_connection(connection_id, db)
-    except Exception as e:
-        logger.exception(f"Background sync failed for connection {connection_id}: {e}")
-        db.rollback()
-        conn = db.query(ProductivityConnection).filter(
-            ProductivityConnection.id == connection_id
-        ).first()
-        if conn:
-            conn.last_sync_attempted_at = datetime.utcnow()
-            conn.last_sync_status = "error"
-            conn.last_sync_error = str(e)
-            db.commit()
-    finally:
-        db.close()
-        _release_sync(connection_id)
+        return datetime.strptime(date_str, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format, expected YYYY-MM-DD")
+
+
+def _rollup_totals(
+    db: Session, connection_ids: list[UUID], date_from: str | None, date_to: str | None
+) -> tuple[int, int, int, int]:
+    """(commits, prs, additions, deletions) of the connections between the two
+    days, inclusive, summed from the daily rollup."""
+    query = db.query(
+        func.coalesce(func.sum(ProductivityDaily.commits), 0),
+        func.coalesce(func.sum(ProductivityDaily.prs), 0),
+        func.coalesce(func.sum(ProductivityDaily.additions), 0),
+        func.coalesce(func.sum(ProductivityDaily.deletions), 0),
+    ).filter(ProductivityDaily.connection_id.in_(connection_ids))
+    if date_from:
+        query = query.filter(ProductivityDaily.day >= _parse_day(date_from))
+    if date_to:
+        query = query.filter(ProductivityDaily.day <= _parse_day(date_to))
+    commits, prs, additions, deletions = query.one()
+    return int(commits), int(prs), int(additions), int(deletions)
 
 
 def _to_connection_read(conn: ProductivityConnection) -> dict:
@@ -98,6 +105,7 @@ def _to_connection_read(conn: ProductivityConnection) -> dict:
         "last_sync_attempted_at": conn.last_sync_attempted_at,
         "last_sync_status": conn.last_sync_status,
         "last_sync_error": conn.last_sync_error,
+        "auto_sync_interval_minutes": conn.auto_sync_interval_minutes,
         "created_at": conn.created_at,
         "updated_at": conn.updated_at,
     }
@@ -125,7 +133,7 @@ def _validate_token(provider: str, pat: str, username: str, workspace: str | Non
         client = BitbucketProvider(pat=pat, username=username, workspace=workspace)
     else:
         return False
-    return asyncio.run(client.validate_token())
+    return http_pool.run(client.validate_token())
 
 
 def _resolve_bitbucket_account(pat: str, username: str) -> str:
@@ -133,7 +141,7 @@ def _resolve_bitbucket_account(pat: str, username: str) -> str:
     its account_id. Raises HTTPException(400) on any mismatch — this is the
     setup-time guard for fix #3."""
     provider = BitbucketProvider(pat=pat, username=username)
-    info = asyncio.run(provider.get_current_user())
+    info = http_pool.run(provider.get_current_user())
     if not info or not info.get("account_id"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -176,12 +184,12 @@ def validate_token_endpoint(
     try:
         if data.provider == "github":
             provider = GitHubProvider(pat=data.pat, username=data.username)
-            valid = asyncio.run(provider.validate_token())
-            orgs = asyncio.run(provider.list_organizations()) if valid else []
+            valid = http_pool.run(provider.validate_token())
+            orgs = http_pool.run(provider.list_organizations()) if valid else []
         elif data.provider == "bitbucket":
             provider = BitbucketProvider(pat=data.pat, username=data.username)
-            valid = asyncio.run(provider.validate_token())
-            orgs = asyncio.run(provider.list_workspaces()) if valid else []
+            valid = http_pool.run(provider.validate_token())
+            orgs = http_pool.run(provider.list_workspaces()) if valid else []
         else:
             valid = False
             orgs = []
@@ -206,9 +214,9 @@ def list_repos_endpoint(
         raise HTTPException(status_code=400, detail=f"Unsupported provider: {data.provider}")
 
     try:
-        return asyncio.run(provider.list_repositories())
+        return http_pool.run(provider.list_repositories())
     except GitHubAccessError as e:
-        raise HTTPException(status_code=400, detail=e.message)
+        raise HTTPException(status_code=429 if e.status == 429 else 400, detail=e.message)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list repositories: {e}")
 
@@ -218,89 +226,65 @@ def list_repos_endpoint(
 
 @router.post("/local-commits/flush")
 async def flush_local_commits(request: Request, db: Session = Depends(get_db)):
-    body = (await request.body()).decode("utf-8", errors="replace")
+    """NDJSON from the shell hook, one commit per line, optionally sent with
+    Content-Encoding: gzip. Lines are parsed as the body streams in and stored
+    LOCAL_COMMITS_FLUSH_CHUNK_SIZE at a time, off the event loop, in one
+    transaction committed once the whole body is in (see
+    app/services/local_commits.py)."""
+    gzipped = request.headers.get("content-encoding", "").strip().lower() == "gzip"
     received = 0
     stored = 0
     duplicates = 0
     errors: list[str] = []
+    batch: list[tuple[int, dict]] = []
 
-    for line in body.splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        received += 1
-        try:
-            data = json.loads(line)
-        except json.JSONDecodeError as e:
-            errors.append(f"line {received}: invalid JSON ({e})")
-            continue
+    def flush() -> None:
+        nonlocal stored, duplicates
+        written, failed = local_commits.store(db, batch)
+        stored += written
+        duplicates += len(batch) - written - len(failed)
+        errors.extend(failed)
+        batch.clear()
 
-        try:
-            h = data["hash"]
-            remote = data.get("remote") or ""
-            existing = (
-                db.query(LocalCommit)
-                .filter(LocalCommit.hash == h, LocalCommit.remote_url == remote)
-                .first()
-            )
-            if existing:
-                duplicates += 1
+    try:
+        async for raw in local_commits.ndjson_lines(request.stream(), gzipped):
+            if raw is None:
+                received += 1
+                errors.append(
+                    f"line {received}: longer than {settings.LOCAL_COMMITS_MAX_LINE_BYTES} bytes"
+                )
                 continue
-
+            line = raw.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+            received += 1
+            # The org-blocklist middleware only sees the compressed bytes.
+            if gzipped and (term := find_blocked(line)):
+                await run_in_threadpool(db.rollback)
+                return JSONResponse(
+                    status_code=451, content={"detail": f"{BLOCKED_MESSAGE} (matched: {term!r})"}
+                )
             try:
-                committed_at = datetime.fromisoformat(data["timestamp"])
-            except (ValueError, KeyError):
-                committed_at = datetime.now(timezone.utc)
-
-            commit = LocalCommit(
-                hash=h,
-                short_hash=h[:7],
-                message=data.get("message") or "",
-                author=data.get("author") or "",
-                email=data.get("email") or "",
-                committed_at=committed_at,
-                branch=data.get("branch") or "",
-                additions=int(data.get("additions") or 0),
-                deletions=int(data.get("deletions") or 0),
-                repo_name=data.get("repo") or "",
-                remote_url=remote,
-                source=data.get("source") or "qwe",
-            )
-            db.add(commit)
-            db.commit()
-            stored += 1
-        except IntegrityError:
-            db.rollback()
-            duplicates += 1
-        except Exception as e:
-            db.rollback()
-            errors.append(f"line {received}: {e}")
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                errors.append(f"line {received}: invalid JSON ({e})")
+                continue
+            try:
+                batch.append((received, local_commits.row_from_payload(data)))
+            except Exception as e:
+                errors.append(f"line {received}: {e}")
+                continue
+            if len(batch) >= settings.LOCAL_COMMITS_FLUSH_CHUNK_SIZE:
+                await run_in_threadpool(flush)
+    except local_commits.InvalidBody as e:
+        await run_in_threadpool(db.rollback)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    await run_in_threadpool(flush)
+    await run_in_threadpool(db.commit)
 
     return {"received": received, "stored": stored, "duplicates": duplicates, "errors": errors}
 
 
-_SSH_REMOTE = re.compile(r"^[^@]+@[^:]+:([^/]+)/(.+)$")
-_PROTO_REMOTE = re.compile(r"^[a-z]+://[^/]+/(.+)$")
-
-
-def _normalize_remote(remote: str, fallback_repo_name: str) -> str:
-    if not remote:
-        return f"(local) {fallback_repo_name}" if fallback_repo_name else "(local)"
-    s = remote.strip().rstrip("/")
-    if s.endswith(".git"):
-        s = s[:-4]
-    m = _SSH_REMOTE.match(s)
-    if m:
-        return f"{m.group(1)}/{m.group(2)}"
-    m = _PROTO_REMOTE.match(s)
-    if m:
-        parts = m.group(1).split("/")
-        if len(parts) >= 2:
-            return f"{parts[-2]}/{parts[-1]}"
-        return m.group(1)
-    return s
-
-
 @router.get("/local-commits/by-repo")
 def local_commits_by_repo(
     from_date: str = Query(..., alias="from"),
@@ -309,8 +293,8 @@ def local_commits_by_repo(
     db: Session = Depends(get_db),
 ):
     try:
-        from_dt = datetime.strptime(from_date, "%Y-%m-%d")
-        to_dt = _end_of_day(to_date)
+        from_day = datetime.strptime(from_date, "%Y-%m-%d").date()
+        to_day = datetime.strptime(to_date, "%Y-%m-%d").date()
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format, expected YYYY-MM-DD")
 
@@ -323,47 +307,40 @@ def local_commits_by_repo(
     aliases.add(current_user.email.lower())
     emails = [e.lower() for e in aliases]
 
+    # SSH and HTTPS clones of a repo already share remote_key, so one group
+    # per key is one entry per repo.
     rows = (
         db.query(
-            LocalCommit.remote_url,
-            LocalCommit.repo_name,
-            func.count(LocalCommit.id).label("commits"),
-            func.sum(LocalCommit.additions).label("additions"),
-            func.sum(LocalCommit.deletions).label("deletions"),
-            func.max(LocalCommit.committed_at).label("last_commit"),
+            LocalCommitDaily.remote_key,
+            func.min(LocalCommitDaily.remote_url).label("remote_url"),
+            func.min(LocalCommitDaily.repo_name).label("repo_name"),
+            func.sum(LocalCommitDaily.commits).label("commits"),
+            func.sum(LocalCommitDaily.additions).label("additions"),
+            func.sum(LocalCommitDaily.deletions).label("deletions"),
+            func.max(LocalCommitDaily.last_commit).label("last_commit"),
         )
         .filter(
-            func.lower(LocalCommit.email).in_(emails),
-            LocalCommit.committed_at >= from_dt,
-            LocalCommit.committed_at < to_dt,
+            LocalCommitDaily.email.in_(emails),
+            LocalCommitDaily.day >= from_day,
+            LocalCommitDaily.day <= to_day,
         )
-        .group_by(LocalCommit.remote_url, LocalCommit.repo_name)
+        .group_by(LocalCommitDaily.remote_key)
         .all()
     )
 
-    # Merge entries that normalize to the same display name (SSH vs HTTPS variants).
-    merged: dict[str, dict] = {}
-    for r in rows:
-        display = _normalize_remote(r.remote_url, r.repo_name)
-        bucket = merged.setdefault(
-            display,
-            {
-                "display": display,
-                "remote_url": r.remote_url,
-                "repo_name": r.repo_name,
-                "commits": 0,
-                "additions": 0,
-                "deletions": 0,
-                "last_commit": None,
-            },
-        )
-        bucket["commits"] += r.commits
-        bucket["additions"] += int(r.additions or 0)
-        bucket["deletions"] += int(r.deletions or 0)
-        if r.last_commit and (bucket["last_commit"] is None or r.last_commit > bucket["last_commit"]):
-            bucket["last_commit"] = r.last_commit
-
-    result = sorted(merged.values(), key=lambda x: x["commits"], reverse=True)
+    result = [
+        {
+            "display": r.remote_key,
+            "remote_url": r.remote_url,
+            "repo_name": r.repo_name,
+            "commits": int(r.commits or 0),
+            "additions": int(r.additions or 0),
+            "deletions": int(r.deletions or 0),
+            "last_commit": r.last_commit,
+        }
+        for r in rows
+    ]
+    result.sort(key=lambda x: x["commits"], reverse=True)
     return result
 
 
@@ -435,15 +412,14 @@ def delete_git_email(
 
 @router.get("/connections", response_model=list[ConnectionListItem])
 def list_connections(
+    page: Page = Depends(page_params),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    return (
-        db.query(ProductivityConnection)
-        .filter(ProductivityConnection.created_by_user_id == current_user.id)
-        .order_by(ProductivityConnection.created_at.desc())
-        .all()
+    query = db.query(ProductivityConnection).filter(
+        ProductivityConnection.created_by_user_id == current_user.id
     )
+    return page.apply(query, ProductivityConnection.created_at.desc())
 
 
 @router.get("/connections/{connection_id}", response_model=ConnectionRead)
@@ -490,9 +466,9 @@ def list_connection_repos(
             provider = BitbucketProvider(pat=pat, username=conn.username, workspace=conn.workspace)
         else:
             raise HTTPException(status_code=400, detail=f"Unsupported provider: {conn.provider}")
-        return asyncio.run(provider.list_repositories())
+        return http_pool.run(provider.list_repositories())
     except GitHubAccessError as e:
-        raise HTTPException(status_code=400, detail=e.message)
+        raise HTTPException(status_code=429 if e.status == 429 else 400, detail=e.message)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list repositories: {e}")
 
@@ -500,7 +476,6 @@ def list_connection_repos(
 @router.post("/connections", response_model=ConnectionRead, status_code=status.HTTP_201_CREATED)
 def create_connection(
     data: ConnectionCreate,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -560,8 +535,7 @@ def create_connection(
         )
     db.refresh(conn)
 
-    if _claim_sync(conn.id):
-        background_tasks.add_task(_sync_in_background, conn.id)
+    sync_jobs.enqueue(db, conn.id, trigger="created")
 
     return _to_connection_read(conn)
 
@@ -685,7 +659,6 @@ def delete_connection(
 )
 def trigger_sync(
     connection_id: UUID,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -700,11 +673,132 @@ def trigger_sync(
     if not conn:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
 
-    if not _claim_sync(connection_id):
-        return SyncResult(connection_id=connection_id, status="in_progress")
+    job, created = sync_jobs.enqueue(db, connection_id, trigger="manual")
+    return SyncResult(
+        connection_id=connection_id,
+        status="started" if created else "in_progress",
+        job_id=job.id,
+    )
+
+
+def _sse(event: dict) -> str:
+    return f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
 
-    background_tasks.add_task(_sync_in_background, connection_id)
-    return SyncResult(connection_id=connection_id, status="started")
+async def _sync_events(connection_id: UUID, request: Request) -> AsyncIterator[str]:
+    async with sync_progress.subscribe(connection_id) as events:
+        # Subscribed before reading the snapshot, so nothing falls in between.
+        snapshot = await asyncio.to_thread(sync_progress.snapshot, connection_id)
+        yield _sse(snapshot)
+        if snapshot["job"] is None:
+            return
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(
+                    events.get(), timeout=settings.SYNC_PROGRESS_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Also covers a worker that died without a sync_finished.
+                snapshot = await asyncio.to_thread(sync_progress.snapshot, connection_id)
+                if snapshot["job"] is None:
+                    yield _sse(snapshot)
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            yield _sse(event)
+            if event["event"] == "sync_finished":
+                return
+
+
+@router.get("/connections/{connection_id}/sync-events")
+def stream_sync_events(
+    connection_id: UUID,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Server-Sent Events for the connection's current (or queued) sync: a
+    `snapshot` first, then progress events through `sync_finished`. Ends right
+    after the snapshot when no sync is queued or running."""
+    conn = (
+        db.query(ProductivityConnection)
+        .filter(
+            ProductivityConnection.id == connection_id,
+            ProductivityConnection.created_by_user_id == current_user.id,
+        )
+        .first()
+    )
+    if not conn:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
+    db.close()  # don't hold a pooled connection for the life of the stream
+
+    return StreamingResponse(
+        _sync_events(connection_id, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/connections/{connection_id}/sync-jobs", response_model=list[SyncJobRead])
+def list_sync_jobs(
+    connection_id: UUID,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """The connection's most recent sync jobs, newest first."""
+    conn = (
+        db.query(ProductivityConnection)
+        .filter(
+            ProductivityConnection.id == connection_id,
+            ProductivityConnection.created_by_user_id == current_user.id,
+        )
+        .first()
+    )
+    if not conn:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
+    return (
+        db.query(SyncJob)
+        .filter(SyncJob.connection_id == connection_id)
+        .order_by(SyncJob.queued_at.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+@router.get("/connections/{connection_id}/rate-limit", response_model=list[RateLimitBudget])
+def get_connection_rate_limit(
+    connection_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """The connection token's GitHub budget (empty for Bitbucket).
+
+    Syncs run in whichever API or scheduler process claimed the job, so this
+    process's own view may be missing or old; when it is older than
+    GITHUB_RATE_LIMIT_SNAPSHOT_MAX_AGE_SECONDS it is refreshed from GitHub's
+    GET /rate_limit, which doesn't count against the budget."""
+    conn = (
+        db.query(ProductivityConnection)
+        .filter(
+            ProductivityConnection.id == connection_id,
+            ProductivityConnection.created_by_user_id == current_user.id,
+        )
+        .first()
+    )
+    if not conn:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
+    if conn.provider != "github":
+        return []
+    pat = decrypt_value(conn.pat_encrypted)
+    key = github_rate_limit.token_key(pat)
+    seen = github_rate_limit.last_observed(key)
+    if seen is None or time.time() - seen > settings.GITHUB_RATE_LIMIT_SNAPSHOT_MAX_AGE_SECONDS:
+        try:
+            http_pool.run(GitHubProvider(pat=pat, username=conn.username).refresh_rate_limit())
+        except Exception as e:
+            logger.warning(f"Could not read GitHub rate limit for connection {connection_id}: {e}")
+    return github_rate_limit.snapshot(key)
 
 
 # --- Commits & PRs ---
@@ -715,6 +809,7 @@ def list_commits(
     connection_id: UUID,
     date_from: str | None = Query(None),
     date_to: str | None = Query(None),
+    page: Page = Depends(page_params),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -739,7 +834,7 @@ def list_commits(
     if date_to:
         query = query.filter(ProductivityCommit.date < _end_of_day(date_to))
 
-    return query.order_by(ProductivityCommit.date.desc()).all()
+    return page.apply(query, ProductivityCommit.date.desc())
 
 
 @router.get("/connections/{connection_id}/pull-requests", response_model=list[PullRequestRead])
@@ -747,6 +842,7 @@ def list_pull_requests(
     connection_id: UUID,
     date_from: str | None = Query(None),
     date_to: str | None = Query(None),
+    page: Page = Depends(page_params),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -770,7 +866,7 @@ def list_pull_requests(
     if date_to:
         query = query.filter(ProductivityPullRequest.created_at_remote < _end_of_day(date_to))
 
-    return query.order_by(ProductivityPullRequest.created_at_remote.desc()).all()
+    return page.apply(query, ProductivityPullRequest.created_at_remote.desc())
 
 
 # --- Stats ---
@@ -795,38 +891,16 @@ def get_connection_stats(
     if not conn:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Connection not found")
 
-    commits_query = db.query(
-        func.count(ProductivityCommit.id),
-        func.coalesce(func.sum(ProductivityCommit.additions), 0),
-        func.coalesce(func.sum(ProductivityCommit.deletions), 0),
-    ).filter(
-        ProductivityCommit.connection_id == connection_id,
-        ProductivityCommit.is_merge.is_(False),
-    )
-
-    if date_from:
-        commits_query = commits_query.filter(ProductivityCommit.date >= date_from)
-    if date_to:
-        commits_query = commits_query.filter(ProductivityCommit.date < _end_of_day(date_to))
-
-    commits_count, total_additions, total_deletions = commits_query.one()
-
-    prs_query = db.query(func.count(ProductivityPullRequest.id)).filter(
-        ProductivityPullRequest.connection_id == connection_id
+    commits_count, prs_count, total_additions, total_deletions = _rollup_totals(
+        db, [connection_id], date_from, date_to
     )
-    if date_from:
-        prs_query = prs_query.filter(ProductivityPullRequest.created_at_remote >= date_from)
-    if date_to:
-        prs_query = prs_query.filter(ProductivityPullRequest.created_at_remote < _end_of_day(date_to))
-
-    prs_count = prs_query.scalar()
 
     return ConnectionStats(
         connection_id=connection_id,
         commits_count=commits_count,
         prs_count=prs_count,
-        total_additions=int(total_additions),
-        total_deletions=int(total_deletions),
+        total_additions=total_additions,
+        total_deletions=total_deletions,
     )
 
 
@@ -852,37 +926,15 @@ def get_aggregated_stats(
             total_commits=0, total_prs=0, total_additions=0, total_deletions=0
         )
 
-    commits_query = db.query(
-        func.count(ProductivityCommit.id),
-        func.coalesce(func.sum(ProductivityCommit.additions), 0),
-        func.coalesce(func.sum(ProductivityCommit.deletions), 0),
-    ).filter(
-        ProductivityCommit.connection_id.in_(connection_ids),
-        ProductivityCommit.is_merge.is_(False),
+    total_commits, total_prs, total_additions, total_deletions = _rollup_totals(
+        db, connection_ids, date_from, date_to
     )
 
-    if date_from:
-        commits_query = commits_query.filter(ProductivityCommit.date >= date_from)
-    if date_to:
-        commits_query = commits_query.filter(ProductivityCommit.date < _end_of_day(date_to))
-
-    total_commits, total_additions, total_deletions = commits_query.one()
-
-    prs_query = db.query(func.count(ProductivityPullRequest.id)).filter(
-        ProductivityPullRequest.connection_id.in_(connection_ids)
-    )
-    if date_from:
-        prs_query = prs_query.filter(ProductivityPullRequest.created_at_remote >= date_from)
-    if date_to:
-        prs_query = prs_query.filter(ProductivityPullRequest.created_at_remote < _end_of_day(date_to))
-
-    total_prs = prs_query.scalar()
-
     return AggregatedStats(
         total_commits=total_commits,
         total_prs=total_prs,
-        total_additions=int(total_additions),
-        total_deletions=int(total_deletions),
+        total_additions=total_additions,
+        total_deletions=total_deletions,
     )
 
 
@@ -912,22 +964,19 @@ def get_user_activity(
         )
 
     try:
-        from_dt = datetime.strptime(date_from, "%Y-%m-%d").replace(tzinfo=timezone.utc)
-        to_dt = (
-            datetime.strptime(date_to, "%Y-%m-%d") + timedelta(days=1)
-        ).replace(tzinfo=timezone.utc) - timedelta(seconds=1)
+        day_from = datetime.strptime(date_from, "%Y-%m-%d").date()
+        day_to = datetime.strptime(date_to, "%Y-%m-%d").date()
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="date_from and date_to must be in YYYY-MM-DD format.",
         )
 
-    pat = decrypt_value(conn.pat_encrypted)
-    provider = GitHubProvider(pat=pat, username=conn.username)
-
     try:
-        result = asyncio.run(provider.fetch_user_activity(from_dt, to_dt))
+        result, fetched_at = user_activity_cache.get_activity(db, conn, day_from, day_to)
     except Exception as exc:
+        if isinstance(exc, GitHubAccessError) and exc.status == 429:
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=exc.message)
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Failed to fetch GitHub activity: {exc}",
@@ -940,4 +989,5 @@ def get_user_activity(
         totals=result["totals"],
         organizations=result["organizations"],
         diagnostics=result["diagnostics"],
+        fetched_at=fetched_at,
     )
@@ -1,11 +1,12 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user
 from app.core.config import settings
-from app.core.db import get_db
+from app.core.db import get_async_db, get_db
 from app.models.user import User
 from app.schemas.runner import HeartbeatIn, HeartbeatOut, RestartOut, RunnerOverview
 from app.services import address_pr_service
@@ -17,7 +18,7 @@ from app.services import runner_service as svc
 router = APIRouter(prefix="/runner", tags=["runner"])
 
 
-def require_runner(x_runner_token: str | None = Header(default=None)) -> bool:
+async def require_runner(x_runner_token: str | None = Header(default=None)) -> bool:
     if not settings.RUNNER_TOKEN:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -41,11 +42,11 @@ def heartbeat(
 
 
 @router.get("/overview", response_model=RunnerOverview)
-def overview(
-    db: Session = Depends(get_db),
+async def overview(
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    return svc.build_overview(db)
+    return await db.run_sync(svc.build_overview)
 
 
 @router.post("/{runner_id}/restart", response_model=RestartOut)
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user
 from app.core.db import get_db
+from app.core.pagination import Page, page_params
 from app.models.bank_account import BankAccount
 from app.models.transaction import Transaction
 from app.models.transaction_category import TransactionCategory
@@ -58,6 +59,7 @@ def list_transactions(
     bank_account_id: UUID | None = Query(None),
     date_from: date | None = Query(None),
     date_to: date | None = Query(None),
+    page: Page = Depends(page_params),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -71,7 +73,7 @@ def list_transactions(
         date_from,
         date_to,
     )
-    return query.order_by(Transaction.date.desc(), Transaction.created_at.desc()).all()
+    return page.apply(query, Transaction.date.desc(), Transaction.created_at.desc())
 
 
 @router.get("/summary", response_model=TransactionSummary)
@@ -4,6 +4,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
+from app.core import auth_cache
 from app.core.db import get_db
 from app.core.auth import get_current_user
 from app.models.user import User
@@ -44,6 +45,7 @@ def update_current_user_profile(
         setattr(current_user, field, value)
 
     db.commit()
+    auth_cache.invalidate_user(current_user.id)
     db.refresh(current_user)
     return current_user
 
@@ -126,4 +128,7 @@ def soft_delete_user(
 
     user.deleted_at = datetime.utcnow()
     db.commit()
+    # The deleted user's cached tokens would otherwise keep authenticating
+    # until they expire.
+    auth_cache.invalidate_user(user.id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -1,11 +1,12 @@
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.auth import get_current_user
 from app.core.config import settings
-from app.core.db import get_db
+from app.core.db import get_async_db, get_db
 from app.models.user import User
 from app.schemas.watchers import (
     ClaimWatcherRequest,
@@ -20,7 +21,7 @@ from app.services import watcher_service as svc
 router = APIRouter(prefix="/watchers", tags=["watchers"])
 
 
-def require_runner(x_runner_token: str | None = Header(default=None)) -> bool:
+async def require_runner(x_runner_token: str | None = Header(default=None)) -> bool:
     if not settings.RUNNER_TOKEN:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -97,12 +98,12 @@ def run_watcher_now(
 
 
 @router.post("/runner/claim", response_model=WatcherClaimRead | None)
-def runner_claim_watcher(
+async def runner_claim_watcher(
     data: ClaimWatcherRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: bool = Depends(require_runner),
 ):
-    watcher = svc.claim_next_watcher(db, data.runner_id)
+    watcher = await db.run_sync(svc.claim_next_watcher, data.runner_id)
     if watcher is None:
         return Response(status_code=status.HTTP_204_NO_CONTENT)
     return watcher
@@ -1,11 +1,17 @@
+import logging
+import time
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
+from app.core import auth_cache
 from app.core.db import get_db
-from app.core.firebase import verify_firebase_token
+from app.core.firebase import FirebaseInitError, verify_firebase_token
 from app.models.user import User
 
+logger = logging.getLogger(__name__)
+
 security = HTTPBearer()
 
 
@@ -24,8 +30,19 @@ def get_current_user(
     """
     token = credentials.credentials
 
+    cached = auth_cache.lookup(db, token)
+    if cached is not None:
+        return cached
+
+    started = time.perf_counter()
     try:
         decoded_token = verify_firebase_token(token)
+    except FirebaseInitError:
+        logger.exception("Firebase Admin SDK is not initialized; cannot verify tokens")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Authentication is unavailable",
+        )
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -50,4 +67,15 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    auth_cache.store(token, decoded_token, user, time.perf_counter() - started)
     return user
+
+
+def require_admin(current_user: User = Depends(get_current_user)) -> User:
+    """FastAPI dependency: like get_current_user, but only lets admins through."""
+    if not current_user.role or current_user.role.name != "ADMIN":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return current_user
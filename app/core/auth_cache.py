@@ -0,0 +1,138 @@
+"""Process-local cache of verified Firebase ID tokens for get_current_user.
+
+Without it every authenticated request pays for `verify_id_token` (a signature
+check against Google's certs) plus a User query, and the UI fires many requests
+per page with the same token. A hit skips both.
+
+Entries are keyed by a SHA-256 of the token and hold the decoded claims plus a
+column snapshot of the User (and its role). The snapshot is re-attached to the
+request's session with `merge(load=False)`, so routes still get a real,
+session-bound User they can modify — without a SELECT.
+
+An entry lives until the token's own `exp`, capped at AUTH_CACHE_MAX_TTL_SECONDS.
+The cap matters because invalidation (`invalidate_user`, called on soft delete,
+/users/me updates and login) only reaches this process; with more than one
+worker, the others keep serving the old snapshot until it ages out.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import settings
+from app.models.user import User
+from app.models.user_role import UserRole
+
+_entries: "OrderedDict[str, dict]" = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "hit_seconds": 0.0, "miss_seconds": 0.0}
+
+
+def _key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _columns(obj) -> dict:
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(type(obj)).column_attrs}
+
+
+def _attach(db: Session, snapshot: dict) -> User:
+    user = User(**snapshot["user"])
+    if snapshot["role"] is not None:
+        role = UserRole(**snapshot["role"])
+        make_transient_to_detached(role)
+        user.role = role
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+def lookup(db: Session, token: str) -> User | None:
+    """Return the cached user for this token attached to `db`, or None on a miss."""
+    if settings.AUTH_CACHE_SIZE <= 0:
+        return None
+    started = time.perf_counter()
+    key = _key(token)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry["expires_at"] <= time.time():
+            del _entries[key]
+            entry = None
+        if entry is None:
+            return None
+        _entries.move_to_end(key)
+    user = _attach(db, entry["snapshot"])
+    with _lock:
+        _stats["hits"] += 1
+        _stats["hit_seconds"] += time.perf_counter() - started
+    return user
+
+
+def store(token: str, claims: dict, user: User, cost_seconds: float) -> None:
+    """Remember a successful verification. `cost_seconds` is what the miss
+    took (verify + query), used to estimate the latency hits save."""
+    with _lock:
+        _stats["misses"] += 1
+        _stats["miss_seconds"] += cost_seconds
+    if settings.AUTH_CACHE_SIZE <= 0:
+        return
+
+    now = time.time()
+    expires_at = min(float(claims.get("exp") or 0), now + settings.AUTH_CACHE_MAX_TTL_SECONDS)
+    if expires_at <= now:
+        return
+
+    role = user.role
+    entry = {
+        "claims": claims,
+        "user_id": user.id,
+        "expires_at": expires_at,
+        "snapshot": {
+            "user": _columns(user),
+            "role": _columns(role) if role is not None else None,
+        },
+    }
+    key = _key(token)
+    with _lock:
+        _entries[key] = entry
+        _entries.move_to_end(key)
+        while len(_entries) > settings.AUTH_CACHE_SIZE:
+            _entries.popitem(last=False)
+
+
+def invalidate_user(user_id: UUID) -> None:
+    """Drop every cached token of a user whose row just changed."""
+    with _lock:
+        for key in [k for k, e in _entries.items() if e["user_id"] == user_id]:
+            del _entries[key]
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
+
+
+def stats() -> dict:
+    with _lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+        avg_miss = _stats["miss_seconds"] / misses if misses else 0.0
+        avg_hit = _stats["hit_seconds"] / hits if hits else 0.0
+        return {
+            "entries": len(_entries),
+            "max_entries": settings.AUTH_CACHE_SIZE,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "avg_hit_ms": round(avg_hit * 1000, 3),
+            "avg_miss_ms": round(avg_miss * 1000, 3),
+            # Every hit would otherwise have cost an average miss.
+            "saved_ms_total": round(hits * max(avg_miss - avg_hit, 0.0) * 1000, 1),
+        }
+
+
+def reset_stats() -> None:
+    with _lock:
+        _stats.update(hits=0, misses=0, hit_seconds=0.0, miss_seconds=0.0)
@@ -3,12 +3,116 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Connection pool for the one engine every route and the runner polling
+    # share. pool_size + max_overflow is the hard ceiling on open connections
+    # per process; past it, checkouts wait DB_POOL_TIMEOUT seconds and then
+    # fail with "QueuePool limit". Size these from GET /admin/db-pool.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_PRE_PING: bool = True
+    # Seconds before a pooled connection is replaced; -1 keeps it forever.
+    DB_POOL_RECYCLE: int = 1800
+    # Per-statement server-side timeout (Postgres statement_timeout), in ms.
+    # 0 disables it.
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+    # Verified-token cache in get_current_user (see app/core/auth_cache.py).
+    # Entries live until the token's exp, capped at the TTL below so changes made
+    # through another worker still show up. AUTH_CACHE_SIZE=0 disables it.
+    AUTH_CACHE_SIZE: int = 1024
+    AUTH_CACHE_MAX_TTL_SECONDS: int = 300
+    # Check the org-blocklist triggers when app.main is imported. Cheap when
+    # nothing changed (see install_db_guard); set false when the deploy runs
+    # `python -m app.core.org_blocklist` or `alembic upgrade` instead.
+    DB_GUARD_ON_BOOT: bool = True
+    # Keyset pagination on list endpoints (app/core/pagination.py). While the
+    # legacy flag is on, requests without ?limit= / ?cursor= still get the full
+    # list; turn it off once the frontend pages everywhere.
+    PAGINATION_LEGACY_UNPAGINATED: bool = True
+    PAGINATION_DEFAULT_LIMIT: int = 100
+    PAGINATION_MAX_LIMIT: int = 500
+    # Repos of one productivity connection fetched at the same time during a
+    # sync (app/services/productivity_sync.py). 1 syncs them one by one.
+    SYNC_REPO_CONCURRENCY: int = 4
+    # Diffstat requests in flight at once per Bitbucket repo being synced
+    # (app/services/bitbucket_provider.py).
+    BITBUCKET_DIFFSTAT_CONCURRENCY: int = 8
+    # GitHub rate-limit budget per token (app/services/github_rate_limit.py).
+    # Syncs stop RESERVE points short of zero so interactive calls still work;
+    # a background request that would overdraw waits for the reset unless
+    # that's longer than MAX_WAIT, in which case it fails as a 429 like before.
+    # Interactive requests (a user is waiting on them) only wait up to
+    # INTERACTIVE_MAX_WAIT before failing.
+    GITHUB_RATE_LIMIT_RESERVE: int = 200
+    GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS: int = 900
+    GITHUB_RATE_LIMIT_INTERACTIVE_MAX_WAIT_SECONDS: int = 5
+    # GET /connections/{id}/rate-limit asks GitHub (GET /rate_limit, free) when
+    # this process hasn't seen the token's budget for this long — syncs run in
+    # whichever process claimed the job, so the local view is often stale.
+    GITHUB_RATE_LIMIT_SNAPSHOT_MAX_AGE_SECONDS: int = 60
+    # ETag/Last-Modified cache for the providers' list GETs (app/services/http_cache.py).
+    # Bodies above MAX_BODY_BYTES aren't stored; entries unread for MAX_AGE_DAYS
+    # are pruned by the scheduler.
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_MAX_BODY_BYTES: int = 2_000_000
+    HTTP_CACHE_MAX_AGE_DAYS: int = 14
+    # Rows per multi-row INSERT ... ON CONFLICT when a sync stores commits/PRs.
+    SYNC_UPSERT_CHUNK_SIZE: int = 500
+    # POST /productivity/local-commits/flush (app/services/local_commits.py):
+    # rows per multi-row INSERT, and the longest NDJSON line accepted.
+    LOCAL_COMMITS_FLUSH_CHUNK_SIZE: int = 500
+    LOCAL_COMMITS_MAX_LINE_BYTES: int = 1_000_000
+    # Sync job workers (app/services/sync_jobs.py): threads per API/scheduler
+    # process draining `sync_jobs` (0 = this process only enqueues), how often
+    # an idle worker polls, when a still-"running" job whose worker is gone is
+    # failed, and how long finished jobs are kept. On Postgres a free
+    # connection lock proves the worker is gone, so STALE_GRACE only has to
+    # cover the claim-to-lock window; STALE_MINUTES is for databases without
+    # advisory locks, where age is all there is to go on.
+    SYNC_JOB_WORKERS: int = 2
+    SYNC_JOB_POLL_SECONDS: float = 5.0
+    SYNC_JOB_STALE_GRACE_SECONDS: int = 60
+    SYNC_JOB_STALE_MINUTES: int = 60
+    SYNC_JOB_RETENTION_DAYS: int = 30
+    # Scheduled syncs of every productivity connection (app/scheduler/auto_sync.py).
+    # INTERVAL is the default per connection (each can override it); a failing
+    # connection waits INTERVAL * 2^failures, up to MAX_BACKOFF. At most
+    # MAX_PER_CYCLE syncs are queued per scheduler cycle, their starts spread
+    # across it.
+    AUTO_SYNC_ENABLED: bool = True
+    AUTO_SYNC_INTERVAL_MINUTES: int = 60
+    AUTO_SYNC_MAX_BACKOFF_MINUTES: int = 24 * 60
+    AUTO_SYNC_MAX_PER_CYCLE: int = 10
+    # GET /productivity/connections/{id}/sync-events (app/services/sync_progress.py):
+    # an idle stream sends an SSE comment this often, which keeps proxies from
+    # closing it and re-checks that its sync is still queued or running.
+    SYNC_PROGRESS_HEARTBEAT_SECONDS: float = 15.0
+    # GET /productivity/user-activity cache (app/services/user_activity_cache.py).
+    # An entry older than TTL is still served, and refreshed in the background;
+    # a range that had ended (plus a day of grace) when fetched never is.
+    # Entries unread for MAX_AGE_DAYS are pruned by the scheduler.
+    USER_ACTIVITY_CACHE_ENABLED: bool = True
+    USER_ACTIVITY_CACHE_TTL_SECONDS: int = 600
+    USER_ACTIVITY_CACHE_MAX_AGE_DAYS: int = 30
+    # Shared keep-alive clients for the GitHub/Bitbucket APIs (app/core/http_pool.py),
+    # one per host per process. Timeouts in seconds; ACQUIRE is how long a
+    # request waits for a free connection once MAX_CONNECTIONS are busy. HTTP/2
+    # needs the optional h2 package and falls back to HTTP/1.1 without it.
+    HTTP_POOL_MAX_CONNECTIONS: int = 20
+    HTTP_POOL_MAX_KEEPALIVE: int = 10
+    HTTP_POOL_KEEPALIVE_EXPIRY: float = 60.0
+    HTTP_POOL_TIMEOUT: float = 30.0
+    HTTP_POOL_ACQUIRE_TIMEOUT: float = 60.0
+    HTTP_POOL_HTTP2: bool = False
     FIREBASE_SERVICE_ACCOUNT_PATH: str = ""
     CORS_ORIGINS: str = "http://localhost:5173"
     ENCRYPTION_KEY: str = ""
     # Shared secret the host-side implementation runner presents (X-Runner-Token)
     # to claim runs and patch status. Empty disables the runner endpoints.
     RUNNER_TOKEN: str = ""
+    # Bearer token Prometheus must present to scrape GET /metrics. Empty leaves
+    # it open (fine when the port is only reachable from the scraper).
+    METRICS_TOKEN: str = ""
     # conexões da fábrica de agentes: steps de implementação nunca pausam para
     # aprovação (gates humanos são só dinheiro/publicação/legal). Display names
     # separados por vírgula.
@@ -1,11 +1,150 @@
+import threading
+import time
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+
+class _PoolStatsMixin:
+    """Running counters of how checkouts behave, for a QueuePool subclass.
+
+    One process shares this pool across every route plus the runner polling,
+    so "QueuePool limit" errors under runner load are the symptom we see —
+    these counters (time spent waiting for a connection, checkouts that had
+    to open an overflow connection, checkouts that gave up) are what tell us
+    whether pool_size or max_overflow is the number to move.
+    """
+
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._checkouts = 0
+            self._wait_total = 0.0
+            self._wait_max = 0.0
+            self._overflow_hits = 0
+            self._timeouts = 0
+
+    def _do_get(self):
+        overflow_before = self._overflow
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+                self._wait_total += time.perf_counter() - start
+            raise
+        waited = time.perf_counter() - start
+        with self._stats_lock:
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            # _overflow only grows when a brand-new connection was opened, and
+            # it is positive only once pool_size is exhausted.
+            if self._overflow > 0 and self._overflow > overflow_before:
+                self._overflow_hits += 1
+        return conn
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            checkouts = self._checkouts
+            return {
+                "pool_size": self.size(),
+                "max_overflow": self._max_overflow,
+                "checked_in": self.checkedin(),
+                "checked_out": self.checkedout(),
+                "overflow": max(self.overflow(), 0),
+                "checkouts": checkouts,
+                "overflow_hits": self._overflow_hits,
+                "timeouts": self._timeouts,
+                "wait_total_ms": round(self._wait_total * 1000, 3),
+                "wait_avg_ms": round(self._wait_total * 1000 / checkouts, 3) if checkouts else 0.0,
+                "wait_max_ms": round(self._wait_max * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(_PoolStatsMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_PoolStatsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _pool_kwargs() -> dict:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+def _connect_args() -> dict:
+    # statement_timeout is a Postgres session setting; pass it as a startup
+    # option so it applies to every pooled connection from the first query.
+    if settings.DB_STATEMENT_TIMEOUT_MS and make_url(settings.DATABASE_URL).get_backend_name() == "postgresql":
+        return {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return {}
+
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    poolclass=InstrumentedQueuePool,
+    connect_args=_connect_args(),
+    **_pool_kwargs(),
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async twin of the engine above, for the few hot endpoints (runner claims,
+# /briefing, /runner/overview) that run as `async def` so they stop competing
+# for Starlette's threadpool. Built on first use: the asyncpg driver is only
+# needed once one of those routes is hit. Tests override get_async_db with an
+# aiosqlite session over their SQLite database (tests/conftest.py).
+_async_engine = None
+_AsyncSessionLocal = None
+
+
+def _async_url():
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() == "postgresql":
+        return url.set(drivername="postgresql+asyncpg")
+    if url.get_backend_name() == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    return url
+
+
+def get_async_engine():
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        connect_args = {}
+        if settings.DB_STATEMENT_TIMEOUT_MS and make_url(settings.DATABASE_URL).get_backend_name() == "postgresql":
+            connect_args = {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+        _async_engine = create_async_engine(
+            _async_url(),
+            poolclass=InstrumentedAsyncQueuePool,
+            connect_args=connect_args,
+            **_pool_kwargs(),
+        )
+        # expire_on_commit=False: attributes must stay readable after commit,
+        # since touching an expired one outside run_sync would need a lazy load.
+        _AsyncSessionLocal = async_sessionmaker(
+            _async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
 Base = declarative_base()
 
 
@@ -15,3 +154,25 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Async counterpart of get_db. Existing sync service functions run on it
+    unchanged through `await db.run_sync(fn, *args)`."""
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+
+def pool_stats() -> list[dict]:
+    """Live statistics for each connection pool this process has opened."""
+    stats = [{"engine": "sync", **engine.pool.stats()}]
+    if _async_engine is not None:
+        stats.append({"engine": "async", **_async_engine.pool.stats()})
+    return stats
+
+
+def reset_pool_stats() -> None:
+    engine.pool.reset_stats()
+    if _async_engine is not None:
+        _async_engine.pool.reset_stats()
@@ -1,9 +1,11 @@
-from cryptography.fernet import Fernet
-
 from app.core.config import settings
 
 
-def _get_fernet() -> Fernet:
+def _get_fernet():
+    # cryptography is imported here, not at module level: only the
+    # productivity connection routes and the sync need it.
+    from cryptography.fernet import Fernet
+
     return Fernet(settings.ENCRYPTION_KEY.encode())
 
 
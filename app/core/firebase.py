@@ -1,21 +1,67 @@
-import firebase_admin
-from firebase_admin import credentials, auth
+import os
+import threading
+
+from app.core import startup
 from app.core.config import settings
 
+# firebase_admin (and the google-auth/grpc stack under it) is imported on first
+# use instead of at boot: it is a large share of import time, and only routes
+# that verify a token need it. `check_config` keeps the cheap part of the old
+# boot-time failure: a missing service-account file still stops startup.
+_init_lock = threading.Lock()
+_initialized = False
+_init_error: Exception | None = None
+
+
+class FirebaseInitError(RuntimeError):
+    """The Admin SDK could not be initialized (bad credentials or config) —
+    a server fault, unlike a token that fails verification."""
+
+
+def check_config() -> None:
+    """Fail fast on boot when the configured service-account file is missing."""
+    path = settings.FIREBASE_SERVICE_ACCOUNT_PATH
+    if path and not os.path.isfile(path):
+        raise FirebaseInitError(f"FIREBASE_SERVICE_ACCOUNT_PATH {path!r} is not a file")
+
 
 def init_firebase() -> None:
-    """Initialize Firebase Admin SDK. Call once at application startup."""
-    if firebase_admin._apps:
+    """Initialize Firebase Admin SDK. Idempotent; verify_firebase_token calls
+    it, so the first authenticated request pays for it instead of startup.
+
+    Raises FirebaseInitError when initialization fails. The failure is kept
+    and raised again on later calls instead of retrying: a broken credential
+    doesn't fix itself without a restart.
+    """
+    global _initialized, _init_error
+    if _initialized:
         return
+    with _init_lock:
+        if _initialized:
+            return
+        if _init_error is not None:
+            raise FirebaseInitError(str(_init_error)) from _init_error
+        with startup.step("init firebase", lazy=True):
+            try:
+                import firebase_admin
+                from firebase_admin import credentials
 
-    if settings.FIREBASE_SERVICE_ACCOUNT_PATH:
-        cred = credentials.Certificate(settings.FIREBASE_SERVICE_ACCOUNT_PATH)
-        firebase_admin.initialize_app(cred)
-    else:
-        firebase_admin.initialize_app()
+                if not firebase_admin._apps:
+                    if settings.FIREBASE_SERVICE_ACCOUNT_PATH:
+                        cred = credentials.Certificate(settings.FIREBASE_SERVICE_ACCOUNT_PATH)
+                        firebase_admin.initialize_app(cred)
+                    else:
+                        firebase_admin.initialize_app()
+            except Exception as e:
+                _init_error = e
+                raise FirebaseInitError(str(e)) from e
+        _initialized = True
 
 
 def verify_firebase_token(id_token: str) -> dict:
     """Verify a Firebase ID token and return the decoded token claims."""
+    from firebase_admin import auth
+
+    init_firebase()
     decoded_token = auth.verify_id_token(id_token)
     return decoded_token
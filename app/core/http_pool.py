@@ -0,0 +1,160 @@
+"""Shared keep-alive HTTP clients for the git providers, one per upstream host.
+
+httpx clients are tied to the event loop they were first used on, and the sync
+routes used to `asyncio.run` every provider call on a fresh loop — so every
+call, and often every page of a crawl, paid a new TCP+TLS handshake. Instead
+the process keeps one event loop on a daemon thread; `run()` executes provider
+coroutines there and `client(host)` hands out that loop's client for the host,
+so connections stay open across calls, requests and syncs.
+
+Coroutines awaited on some other loop still work: they get clients of their
+own for that loop, closed by awaiting `aclose()` on it.
+
+Tests swap the network out per host with `set_transport(host, transport)`
+(e.g. `httpx.ASGITransport(app=stub)` or `httpx.MockTransport(handler)`).
+"""
+import asyncio
+import concurrent.futures
+import http.cookiejar
+import importlib.util
+import logging
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Coroutine, TypeVar
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_loop: asyncio.AbstractEventLoop | None = None
+_thread: threading.Thread | None = None
+_loop_lock = threading.Lock()
+
+# {event loop: {host: client}}. Weak so clients made on a short-lived loop go
+# away with it instead of piling up here.
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+_transports: dict[str, httpx.AsyncBaseTransport] = {}
+
+
+def _http2_available() -> bool:
+    if not settings.HTTP_POOL_HTTP2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP_POOL_HTTP2 is set but the h2 package isn't installed; using HTTP/1.1")
+        return False
+    return True
+
+
+class _NoCookies(http.cookiejar.CookieJar):
+    """A shared client serves every user and token, so a Set-Cookie from one
+    response must never ride along on someone else's request."""
+
+    def set_cookie(self, cookie) -> None:
+        pass
+
+    def extract_cookies(self, response, request) -> None:
+        pass
+
+
+def _new_client(host: str) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_POOL_MAX_KEEPALIVE,
+        keepalive_expiry=settings.HTTP_POOL_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        settings.HTTP_POOL_TIMEOUT,
+        pool=settings.HTTP_POOL_ACQUIRE_TIMEOUT,
+    )
+    transport = _transports.get(host)
+    if transport is not None:
+        return httpx.AsyncClient(transport=transport, timeout=timeout, cookies=_NoCookies())
+    return httpx.AsyncClient(
+        limits=limits, timeout=timeout, http2=_http2_available(), cookies=_NoCookies()
+    )
+
+
+@asynccontextmanager
+async def client(host: str) -> AsyncIterator[httpx.AsyncClient]:
+    """The running loop's shared client for `host`. Leaving the block does not
+    close it — credentials and headers go on each request, not the client."""
+    loop = asyncio.get_running_loop()
+    clients = _clients.setdefault(loop, {})
+    shared = clients.get(host)
+    if shared is None or shared.is_closed:
+        shared = clients[host] = _new_client(host)
+    yield shared
+
+
+async def aclose() -> None:
+    """Close every client that belongs to the running loop."""
+    clients = _clients.pop(asyncio.get_running_loop(), {})
+    for shared in clients.values():
+        await shared.aclose()
+
+
+def _ensure_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _thread
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(
+                target=_loop.run_forever, name="http-pool", daemon=True
+            )
+            _thread.start()
+        return _loop
+
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a provider coroutine on the pool's loop and wait for its result.
+
+    Drop-in for `asyncio.run` in sync code (routes, background tasks). Calls
+    from several threads run concurrently on the one loop.
+    """
+    loop = _ensure_loop()
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError("http_pool.run() called from the pool's own loop; await instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def submit(coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+    """Start a coroutine on the pool's loop without waiting for it."""
+    return asyncio.run_coroutine_threadsafe(coro, _ensure_loop())
+
+
+def set_transport(host: str, transport: httpx.AsyncBaseTransport | None) -> None:
+    """Route every request for `host` through `transport`; None restores the
+    network. Clients already made for the host are closed and rebuilt."""
+    if transport is None:
+        _transports.pop(host, None)
+    else:
+        _transports[host] = transport
+    for loop, clients in list(_clients.items()):
+        stale = clients.pop(host, None)
+        if stale is None:
+            continue
+        if loop is _loop and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(stale.aclose(), loop).result()
+
+
+def shutdown() -> None:
+    """Close the pool loop's clients and stop its thread (app shutdown)."""
+    global _loop, _thread
+    with _loop_lock:
+        loop, thread = _loop, _thread
+        _loop = _thread = None
+    if loop is None or loop.is_closed():
+        return
+    asyncio.run_coroutine_threadsafe(aclose(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join()
+    loop.close()
@@ -0,0 +1,217 @@
+"""Per-route request metrics: latency, SQL statements, DB time, response size.
+
+`MetricsMiddleware` opens a per-request slot in a ContextVar; a global
+`before/after_cursor_execute` listener adds every statement run while that slot
+is active (sync routes in the threadpool and `run_sync` on the async engine
+inherit the context, so both count). When the response starts, the totals go
+out as a `Server-Timing` header — visible in the browser's network panel — and
+when it ends they are folded into process-wide histograms and counters, served
+in Prometheus text format by GET /metrics (app/api/metrics.py).
+
+Routes are labelled by their path template (`/invoices/{invoice_id}`), never
+the raw path, so the label set stays bounded; anything that matched no route
+is `<unmatched>`. Everything is per process, like the pool and auth-cache
+stats: with several workers, scrape each one.
+"""
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.routing import Match
+
+# Seconds. Spans a cached hit to a slow sync/report.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# SQL statements per request; the top buckets are where N+1s show up.
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+_EXCLUDED_PATHS = {"/metrics", "/health"}
+
+_request: ContextVar[dict | None] = ContextVar("metrics_request", default=None)
+_lock = threading.Lock()
+# (method, route) -> aggregate for that route
+_routes: dict[tuple[str, str], dict] = {}
+# (method, route, status) -> count
+_responses: dict[tuple[str, str, int], int] = {}
+_templates: dict = {}
+
+
+# --- SQL hook ---
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _request.get() is not None:
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    current = _request.get()
+    started = conn.info.get("metrics_started")
+    if current is None or not started:
+        return
+    current["queries"] += 1
+    current["db_seconds"] += time.perf_counter() - started.pop()
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time.
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("metrics_started"):
+        conn.info["metrics_started"].pop()
+
+
+# --- Aggregation ---
+
+def _new_route() -> dict:
+    return {
+        "count": 0,
+        "duration_sum": 0.0,
+        "duration_buckets": [0] * len(DURATION_BUCKETS),
+        "queries_sum": 0,
+        "query_buckets": [0] * len(QUERY_BUCKETS),
+        "db_seconds": 0.0,
+        "response_bytes": 0,
+    }
+
+
+def _observe(buckets: list[int], bounds: tuple, value: float) -> None:
+    for i, bound in enumerate(bounds):
+        if value <= bound:
+            buckets[i] += 1
+
+
+def _record(method: str, route: str, status: int, seconds: float, current: dict) -> None:
+    with _lock:
+        agg = _routes.get((method, route))
+        if agg is None:
+            agg = _routes[(method, route)] = _new_route()
+        agg["count"] += 1
+        agg["duration_sum"] += seconds
+        _observe(agg["duration_buckets"], DURATION_BUCKETS, seconds)
+        agg["queries_sum"] += current["queries"]
+        _observe(agg["query_buckets"], QUERY_BUCKETS, current["queries"])
+        agg["db_seconds"] += current["db_seconds"]
+        agg["response_bytes"] += current["bytes"]
+        key = (method, route, status)
+        _responses[key] = _responses.get(key, 0) + 1
+
+
+def _route_template(scope) -> str:
+    """Path template of the route that handled this request. The router
+    leaves the matched endpoint in the scope; map it back to its route."""
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is None or app is None:
+        return "<unmatched>"
+    routes = _templates.get(endpoint)
+    if routes is None:
+        routes = [r for r in app.routes if getattr(r, "endpoint", None) is endpoint]
+        _templates[endpoint] = routes
+    if len(routes) == 1:
+        return routes[0].path
+    for route in routes:
+        if route.matches(scope)[0] == Match.FULL:
+            return route.path
+    return "<unmatched>"
+
+
+def reset() -> None:
+    with _lock:
+        _routes.clear()
+        _responses.clear()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram(lines: list[str], name: str, labels: str, bounds: tuple, buckets: list[int], total, count: int) -> None:
+    for bound, n in zip(bounds, buckets):
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {n}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+    lines.append(f"{name}_sum{{{labels}}} {total}")
+    lines.append(f"{name}_count{{{labels}}} {count}")
+
+
+def render() -> str:
+    """Everything recorded so far, in Prometheus text exposition format."""
+    with _lock:
+        routes = {k: {**v, "duration_buckets": list(v["duration_buckets"]), "query_buckets": list(v["query_buckets"])}
+                  for k, v in _routes.items()}
+        responses = dict(_responses)
+
+    lines = [
+        "# HELP http_requests_total Requests handled, by route and status code.",
+        "# TYPE http_requests_total counter",
+    ]
+    for (method, route, status), n in sorted(responses.items()):
+        lines.append(f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {n}')
+
+    sections = (
+        ("http_request_duration_seconds", "histogram", "Time from request to end of response body."),
+        ("http_request_db_queries", "histogram", "SQL statements executed per request."),
+        ("http_request_db_seconds_total", "counter", "Time spent in SQL statements."),
+        ("http_response_size_bytes_total", "counter", "Response body bytes sent."),
+    )
+    for name, kind, help_text in sections:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (method, route), agg in sorted(routes.items()):
+            labels = f'method="{method}",route="{_escape(route)}"'
+            if name == "http_request_duration_seconds":
+                _histogram(lines, name, labels, DURATION_BUCKETS, agg["duration_buckets"],
+                           round(agg["duration_sum"], 6), agg["count"])
+            elif name == "http_request_db_queries":
+                _histogram(lines, name, labels, QUERY_BUCKETS, agg["query_buckets"],
+                           agg["queries_sum"], agg["count"])
+            elif name == "http_request_db_seconds_total":
+                lines.append(f"{name}{{{labels}}} {round(agg['db_seconds'], 6)}")
+            else:
+                lines.append(f"{name}{{{labels}}} {agg['response_bytes']}")
+    return "\n".join(lines) + "\n"
+
+
+# --- Middleware ---
+
+class MetricsMiddleware:
+    """Pure ASGI, like OrgBlocklistMiddleware, so streaming responses pass
+    through untouched. Add it last (outermost) so it times the whole stack."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"] in _EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        current = {"queries": 0, "db_seconds": 0.0, "bytes": 0}
+        token = _request.set(current)
+        started = time.perf_counter()
+        status = 500
+
+        async def timed_send(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                app_ms = (time.perf_counter() - started) * 1000
+                timing = (
+                    f'app;dur={app_ms:.1f}, '
+                    f'db;dur={current["db_seconds"] * 1000:.1f};desc="{current["queries"]} queries"'
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", timing.encode())]}
+            elif message["type"] == "http.response.body":
+                current["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            _request.reset(token)
+            _record(
+                scope["method"], _route_template(scope), status,
+                time.perf_counter() - started, current,
+            )
@@ -6,8 +6,9 @@ invoices, nothing. The rule is enforced in layers, and each layer fails loudly
 rather than silently dropping the request:
 
   1. this module's ASGI middleware, on every inbound HTTP request;
-  2. the database triggers installed by `install_db_guard`, so even a direct
-     SQL write is rejected;
+  2. the database triggers installed by `install_db_guard` (at boot, after
+     `alembic upgrade`, or via `python -m app.core.org_blocklist`), so even a
+     direct SQL write is rejected;
   3. `runner/org_blocklist.py`, on the host side that actually runs jobs;
   4. `.claude/hooks/org-blocklist.py`, on Claude Code tool calls in this repo.
 
@@ -16,8 +17,11 @@ the runner and hook copies — they are deliberate duplicates, because the three
 processes share no code.
 """
 
+import codecs
+import hashlib
 import json
 import re
+import time
 
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
@@ -29,6 +33,11 @@ BLOCKED_RE = re.compile(
     re.IGNORECASE,
 )
 TICKET_RE = re.compile(r"\bNOV-\d{3,}\b")
+# Both in one pass, each keeping its own case rule. The leading lookahead lists
+# every letter a match can start with: it lets `re` skip ahead with a charset
+# scan instead of trying each alternative at every offset, about 4x faster on
+# large bodies. Update it together with the patterns above.
+ORG_RE = re.compile(f"(?=[nNvVoO])(?:(?i:{BLOCKED_RE.pattern})|{TICKET_RE.pattern})")
 
 MESSAGE = (
     "Blocked: this platform is permanently barred from the NovoEd organisation. "
@@ -48,7 +57,7 @@ def find_blocked(text: str | None) -> str | None:
     """Return the offending substring, or None when the text is clean."""
     if not text:
         return None
-    m = BLOCKED_RE.search(text) or TICKET_RE.search(text)
+    m = ORG_RE.search(text)
     return m.group(0) if m else None
 
 
@@ -63,11 +72,58 @@ def assert_allowed(*values: object) -> None:
             raise OrgBlocked(term)
 
 
+# Characters carried from one chunk into the next scan, so a term split across
+# a chunk boundary is still seen whole. Longer than the longest bounded match
+# ("origami_develop"); ticket keys of any length are kept whole separately.
+_OVERLAP = 64
+
+
+class _StreamScanner:
+    """Runs ORG_RE over a request body one chunk at a time, in bounded memory.
+
+    Each scan covers the new chunk plus the tail of the previous one. A match
+    that runs up to the end of what has arrived so far is left undecided — the
+    next chunk may extend it ("NOV-123" + "4") or break it ("NOV-123" + "abc")
+    — and is carried over whole instead.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        self._tail = ""
+        # The first carried character was scanned already; it's only kept so
+        # \b can see what precedes the new text.
+        self._skip = 0
+
+    def feed(self, chunk: bytes, final: bool = False) -> str | None:
+        window = self._tail + self._decoder.decode(chunk, final)
+        keep_from = max(len(window) - _OVERLAP, self._skip)
+        for m in ORG_RE.finditer(window, self._skip):
+            if m.end() == len(window) and not final:
+                keep_from = min(keep_from, m.start())
+                break
+            return m.group(0)
+        if keep_from > 0:
+            self._tail, self._skip = window[keep_from - 1:], 1
+        else:
+            self._tail, self._skip = window, 0
+        return None
+
+
 class OrgBlocklistMiddleware:
     """Reject any request whose path, query or body references the blocked org.
 
     Written as raw ASGI rather than BaseHTTPMiddleware so the body can be
-    buffered for inspection and then replayed to the app untouched.
+    inspected as it streams in. Each chunk is scanned before the app receives
+    it, so the app never sees a byte that mentions the org: on a match it gets
+    an `http.disconnect` instead (the same as a client dropping mid-upload),
+    its own response is discarded, and the client gets the 451. Endpoints read
+    their whole body before running, so a match in the last chunk still stops
+    the handler. A body the app never reads is never scanned — nor acted upon.
+
+    Streaming endpoints (POST /productivity/local-commits/flush) act on lines
+    as they complete, so a match still stops them before the line holding it.
+    A gzip-encoded body is scanned compressed here, i.e. not really: that
+    endpoint checks each decompressed line with `find_blocked` itself.
     """
 
     def __init__(self, app: ASGIApp) -> None:
@@ -80,33 +136,54 @@ class OrgBlocklistMiddleware:
 
         target = scope.get("path", "") + "?" + (scope.get("query_string", b"").decode("latin-1"))
         term = find_blocked(target)
-
-        body = b""
-        if term is None:
-            more = True
-            while more:
-                message = await receive()
-                if message["type"] == "http.request":
-                    body += message.get("body", b"")
-                    more = message.get("more_body", False)
-                else:  # http.disconnect
-                    more = False
-            term = find_blocked(body.decode("utf-8", "replace"))
-
         if term is not None:
             await self._reject(send, term)
             return
 
-        sent = False
-
-        async def replay() -> Message:
-            nonlocal sent
-            if not sent:
-                sent = True
-                return {"type": "http.request", "body": body, "more_body": False}
-            return await receive()
-
-        await self.app(scope, replay, send)
+        scanner = _StreamScanner()
+        blocked: str | None = None
+        response_started = False
+        response_done = False
+
+        async def scanned_receive() -> Message:
+            nonlocal blocked
+            if blocked is not None:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                blocked = scanner.feed(
+                    message.get("body", b""), final=not message.get("more_body", False)
+                )
+                if blocked is not None:
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started, response_done
+            if blocked is not None:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_done = True
+            await send(message)
+
+        try:
+            await self.app(scope, scanned_receive, guarded_send)
+        except Exception:
+            # The app fails in its own way when told the client left (400 on
+            # body parsing, ClientDisconnect...). Irrelevant once blocked.
+            if blocked is None:
+                raise
+
+        if blocked is None:
+            return
+        if not response_started:
+            await self._reject(send, blocked)
+        elif not response_done:
+            # Too late to change the status of a response already streaming
+            # back; cut it short rather than let the rest through.
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
 
     @staticmethod
     async def _reject(send: Send, term: str) -> None:
@@ -131,20 +208,36 @@ GUARDED_TABLES = (
     "implementation_runs", "implementation_steps",
     "code_review_runs", "code_review_steps",
     "address_pr_runs", "address_pr_steps",
-    "planner_runs", "platform_events", "proposals", "local_commits",
+    "planner_runs", "platform_events", "proposals", "local_commits", "local_commit_daily",
     "recurring_tasks", "ideas", "task_executions", "user_git_emails",
+    "sync_jobs", "productivity_daily", "user_activity_cache",
 )
 
 # POSIX equivalents of BLOCKED_RE / TICKET_RE above.
 _PG_PATTERN = r"novo[[:space:]_-]?ed|novoedweb|venture[[:space:]_-]?shell|origami_(develop|master)"
 _PG_TICKET = r"NOV-[0-9]{3,}"
 
-_GUARD_FN = f"""
-CREATE OR REPLACE FUNCTION brains_org_blocklist() RETURNS trigger AS $fn$
+# Shortest string either pattern can match ("novoed"): varchar(n) columns
+# narrower than this can never carry a blocked term and are left unchecked.
+_MIN_MATCH_LEN = 6
+
+# Column types that can carry org data. Numbers, booleans, timestamps and
+# UUIDs cannot, and skipping them is most of what makes the per-table trigger
+# cheaper than serialising the whole row.
+_TEXT_TYPES = {"text", "character varying", "character", "json", "jsonb"}
+_TEXT_ARRAY_UDTS = {"_text", "_varchar"}
+
+_TABLE_FN = """
+CREATE OR REPLACE FUNCTION {fn}() RETURNS trigger AS $fn$
 DECLARE
-  row_text text := to_jsonb(NEW)::text;
+  row_text text;
 BEGIN
-  IF row_text ~* '{_PG_PATTERN}' OR row_text ~ '{_PG_TICKET}' THEN
+  IF TG_OP = 'INSERT' THEN
+    row_text := concat_ws('|', {inserted});
+  ELSE
+    row_text := concat_ws('|', {changed});
+  END IF;
+  IF row_text ~* '{pattern}' OR row_text ~ '{ticket}' THEN
     RAISE EXCEPTION
       'Blocked organisation referenced in %, write rejected', TG_TABLE_NAME
       USING ERRCODE = 'check_violation';
@@ -154,13 +247,103 @@ END;
 $fn$ LANGUAGE plpgsql;
 """
 
+# UPDATE OF <columns>: an UPDATE whose SET list names none of the checked
+# columns (status flips, heartbeats, counters) doesn't even call the function.
+_TRIGGER_DDL = (
+    'CREATE TRIGGER trg_org_blocklist BEFORE INSERT OR UPDATE OF {columns} ON "{table}" '
+    "FOR EACH ROW EXECUTE FUNCTION {fn}()"
+)
+
+# system_meta row holding, per table, the checksum of the guard DDL last applied.
+GUARD_META_KEY = "org_blocklist_guard"
+
 
-def install_db_guard(engine) -> None:
-    """Create (or refresh) the blocking triggers. Idempotent; safe on every boot."""
+def _text_columns(conn, tables) -> dict[str, list[tuple[str, str]]]:
+    """(column, data_type) of every column of `tables` that can carry org
+    data, in table order, read from the live schema."""
+    from sqlalchemy import text
+
+    rows = conn.execute(
+        text(
+            "SELECT table_name, column_name, data_type, udt_name, character_maximum_length "
+            "FROM information_schema.columns "
+            "WHERE table_schema = 'public' AND table_name = ANY(:tables) "
+            "ORDER BY table_name, ordinal_position"
+        ),
+        {"tables": list(tables)},
+    )
+    columns: dict[str, list[tuple[str, str]]] = {}
+    for table, column, data_type, udt, max_len in rows:
+        if data_type == "ARRAY" and udt not in _TEXT_ARRAY_UDTS:
+            continue
+        if data_type != "ARRAY" and data_type not in _TEXT_TYPES:
+            continue
+        if max_len is not None and max_len < _MIN_MATCH_LEN:
+            continue
+        columns.setdefault(table, []).append((column, data_type))
+    return columns
+
+
+def table_guard_ddl(table: str, columns: list[tuple[str, str]]) -> list[str]:
+    """Statements that (re)install the trigger for one table, checking only
+    `columns` — and on UPDATE, only those whose value actually changed."""
+    fn = f"brains_org_blocklist_{table}"
+    inserted, changed = [], []
+    for column, data_type in columns:
+        new, old = f'NEW."{column}"', f'OLD."{column}"'
+        inserted.append(new)
+        # json has no equality operator; compare its text instead.
+        if data_type == "json":
+            new_cmp, old_cmp = f"{new}::text", f"{old}::text"
+        else:
+            new_cmp, old_cmp = new, old
+        changed.append(f"CASE WHEN {new_cmp} IS DISTINCT FROM {old_cmp} THEN {new} END")
+    return [
+        _TABLE_FN.format(
+            fn=fn,
+            inserted=", ".join(inserted),
+            changed=",\n      ".join(changed),
+            pattern=_PG_PATTERN,
+            ticket=_PG_TICKET,
+        ),
+        f'DROP TRIGGER IF EXISTS trg_org_blocklist ON "{table}"',
+        _TRIGGER_DDL.format(
+            table=table,
+            columns=", ".join(f'"{c}"' for c, _ in columns),
+            fn=fn,
+        ),
+    ]
+
+
+def _checksum(statements: list[str]) -> str:
+    digest = hashlib.sha256()
+    for statement in statements:
+        digest.update(statement.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def install_db_guard(engine, force: bool = False) -> dict:
+    """Make sure every guarded table carries its blocking trigger.
+
+    Each table gets its own function, generated from the live schema, that
+    checks only the text/JSON columns (see table_guard_ddl). DROP/CREATE
+    TRIGGER takes an ACCESS EXCLUSIVE lock on the table, so this does as little
+    as it can: the checksum of each table's DDL is kept in system_meta, and
+    only tables whose DDL changed (new pattern, a migration added a column) or
+    whose trigger is missing are touched. `force` re-applies every table.
+    Concurrent callers (several workers booting) are serialised by an
+    advisory lock. Returns what was done, for the caller to log.
+    """
     from sqlalchemy import text
 
+    started = time.perf_counter()
+    if engine.dialect.name != "postgresql":
+        # plpgsql triggers only exist on Postgres (tests run on SQLite).
+        return {"action": "unsupported", "tables": 0, "seconds": 0.0}
+
     with engine.begin() as conn:
-        conn.execute(text(_GUARD_FN))
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": GUARD_META_KEY})
         existing = {
             row[0]
             for row in conn.execute(text(
@@ -168,11 +351,77 @@ def install_db_guard(engine) -> None:
                 "WHERE table_schema='public' AND table_type='BASE TABLE'"
             ))
         }
-        for table in GUARDED_TABLES:
-            if table not in existing:
-                continue
-            conn.execute(text(f'DROP TRIGGER IF EXISTS trg_org_blocklist ON "{table}"'))
-            conn.execute(text(
-                f'CREATE TRIGGER trg_org_blocklist BEFORE INSERT OR UPDATE ON "{table}" '
-                "FOR EACH ROW EXECUTE FUNCTION brains_org_blocklist()"
+        has_meta = "system_meta" in existing
+        stored: dict = {}
+        if has_meta:
+            raw = conn.execute(
+                text("SELECT value FROM system_meta WHERE key = :key"), {"key": GUARD_META_KEY}
+            ).scalar()
+            try:
+                stored = json.loads(raw) if raw else {}
+            except ValueError:
+                stored = {}  # single checksum written by an older version
+            if not isinstance(stored, dict):
+                stored = {}
+        triggered = {
+            row[0]
+            for row in conn.execute(text(
+                "SELECT c.relname FROM pg_trigger t JOIN pg_class c ON c.oid = t.tgrelid "
+                "WHERE t.tgname = 'trg_org_blocklist' AND NOT t.tgisinternal"
             ))
+        }
+        guarded = [t for t in GUARDED_TABLES if t in existing]
+        columns = _text_columns(conn, guarded)
+
+        checksums: dict[str, str] = {}
+        targets = []
+        for table in guarded:
+            statements = table_guard_ddl(table, columns[table]) if table in columns else []
+            checksums[table] = _checksum(statements)
+            if force or stored.get(table) != checksums[table] or (statements and table not in triggered):
+                targets.append((table, statements))
+
+        for table, statements in targets:
+            if not statements:
+                # Nothing in this table can carry org data.
+                conn.execute(text(f'DROP TRIGGER IF EXISTS trg_org_blocklist ON "{table}"'))
+                conn.execute(text(f"DROP FUNCTION IF EXISTS brains_org_blocklist_{table}()"))
+            for statement in statements:
+                conn.execute(text(statement))
+
+        if len(targets) == len(guarded):
+            # Every table was just re-pointed at its own function, so the
+            # whole-row one they all shared before is no longer referenced.
+            conn.execute(text("DROP FUNCTION IF EXISTS brains_org_blocklist()"))
+
+        if has_meta and stored != checksums:
+            conn.execute(
+                text(
+                    "INSERT INTO system_meta (key, value, created_at) VALUES (:key, :value, now()) "
+                    "ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value"
+                ),
+                {"key": GUARD_META_KEY, "value": json.dumps(checksums, sort_keys=True)},
+            )
+
+    if force or not stored:
+        action = "installed"
+    else:
+        action = "repaired" if targets else "unchanged"
+    return {
+        "action": action,
+        "tables": len(targets),
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+if __name__ == "__main__":
+    # Deploy/migration step: `python -m app.core.org_blocklist [--force]`, for
+    # running with DB_GUARD_ON_BOOT=false.
+    import argparse
+
+    from app.core.db import engine as _engine
+
+    parser = argparse.ArgumentParser(description="Install the org-blocklist database triggers.")
+    parser.add_argument("--force", action="store_true", help="re-apply even if unchanged")
+    result = install_db_guard(_engine, force=parser.parse_args().force)
+    print(f"org-blocklist guard: {result['action']} ({result['tables']} tables, {result['seconds']}s)")
@@ -0,0 +1,146 @@
+"""Keyset (cursor) pagination for list endpoints.
+
+A route takes `page: Page = Depends(page_params)` and hands it to the query:
+
+    rows = page.apply(query, Transaction.date.desc(), Transaction.created_at.desc())
+
+`apply` orders by the given keys plus the primary key as a tiebreaker, and
+returns at most `limit` rows starting after the cursor. Instead of OFFSET it
+filters on the last row's key values, so page 50 costs the same as page 1 and
+rows inserted meanwhile don't shift later pages.
+
+The response body stays the same list it always was; the cursor for the next
+page goes out in the `X-Next-Cursor` header (absent on the last page). Cursors
+are opaque to clients: base64 of the last row's sort values, only valid for
+the endpoint and sort order that produced them.
+
+Migration: while PAGINATION_LEGACY_UNPAGINATED is true, a request with neither
+`limit` nor `cursor` returns the whole list as before. Once the frontend sends
+`limit` everywhere, turn it off and such requests get PAGINATION_DEFAULT_LIMIT
+rows.
+"""
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import and_, inspect, or_
+from sqlalchemy.sql import operators
+
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode(values: list) -> str:
+    def plain(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, (UUID, Decimal)):
+            return str(value)
+        return value
+
+    raw = json.dumps([plain(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _parse(value, python_type):
+    if value is None:
+        return None
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type in (UUID, Decimal, int, float):
+        return python_type(value)
+    return value
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+class Page:
+    """One page request: `limit` rows after `cursor`. Writes the next cursor
+    into the response headers when `apply` finds more rows."""
+
+    def __init__(self, response: Response | None, limit: int | None, cursor: str | None) -> None:
+        self.response = response
+        self.cursor = cursor
+        self.next_cursor: str | None = None
+        if limit is None and cursor is None and settings.PAGINATION_LEGACY_UNPAGINATED:
+            self.limit = None
+        else:
+            self.limit = min(limit or settings.PAGINATION_DEFAULT_LIMIT, settings.PAGINATION_MAX_LIMIT)
+
+    def _keys(self, query, order_by) -> list[tuple]:
+        """(column, descending, attribute name) for each sort key, plus the
+        primary key as a tiebreaker so every row has a distinct position."""
+        mapper = inspect(query.column_descriptions[0]["entity"])
+        keys = []
+        for expr in order_by:
+            modifier = getattr(expr, "modifier", None)
+            column = expr.element if modifier in (operators.desc_op, operators.asc_op) else expr
+            keys.append((column, modifier is operators.desc_op))
+        for pk in mapper.primary_key:
+            if not any(column.compare(pk) for column, _ in keys):
+                keys.append((pk, keys[-1][1] if keys else False))
+        return [
+            (column, descending, mapper.get_property_by_column(column).key)
+            for column, descending in keys
+        ]
+
+    def _after(self, keys: list[tuple]):
+        try:
+            raw = base64.urlsafe_b64decode(self.cursor + "=" * (-len(self.cursor) % 4))
+            values = json.loads(raw)
+            if not isinstance(values, list) or len(values) != len(keys):
+                raise ValueError
+            values = [_parse(v, column.type.python_type) for v, (column, _, _) in zip(values, keys)]
+        except (ValueError, TypeError, NotImplementedError):
+            raise _invalid_cursor()
+
+        # (k1, k2, ...) strictly after (v1, v2, ...) in the sort order, with
+        # each key's own direction: k1 past v1, or k1 = v1 and k2 past v2, ...
+        clauses = []
+        for i, (column, descending, _) in enumerate(keys):
+            past = column < values[i] if descending else column > values[i]
+            equal = [keys[j][0] == values[j] for j in range(i)]
+            clauses.append(and_(*equal, past))
+        return or_(*clauses)
+
+    def apply(self, query, *order_by) -> list:
+        """Order `query` by `order_by` and return this page of it."""
+        if self.limit is None:
+            return query.order_by(*order_by).all()
+
+        keys = self._keys(query, order_by)
+        if self.cursor:
+            query = query.filter(self._after(keys))
+        ordered = [column.desc() if descending else column.asc() for column, descending, _ in keys]
+        rows = query.order_by(*ordered).limit(self.limit + 1).all()
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            last = rows[-1]
+            self.next_cursor = _encode([getattr(last, attr) for _, _, attr in keys])
+            if self.response is not None:
+                self.response.headers[NEXT_CURSOR_HEADER] = self.next_cursor
+        return rows
+
+
+def page_params(
+    response: Response,
+    limit: int | None = Query(None, ge=1, description="Page size; omit for the full list while legacy mode is on"),
+    cursor: str | None = Query(None, description=f"Opaque token from the previous page's {NEXT_CURSOR_HEADER} header"),
+) -> Page:
+    return Page(response, limit, cursor)
+
+
+def paginate(query, page: Page | None, *order_by) -> list:
+    """`page.apply(query, *order_by)`, or the whole ordered list without a
+    page — for service functions that are also called outside a request."""
+    if page is None:
+        return query.order_by(*order_by).all()
+    return page.apply(query, *order_by)
@@ -0,0 +1,66 @@
+"""Where the API's boot time goes.
+
+app.main imports this module first and wraps each step of its own import —
+one per router module, plus the DB guard — in `step()`. Work deferred to first
+use (Firebase init, for instance) records itself with `lazy=True`, so the
+report shows both what a cold start or a `--reload` pays up front and what the
+first request pays instead.
+
+A router's import time is inclusive: whatever shared module it is the first
+to import (fastapi, sqlalchemy, the models) is charged to it. For a per-module
+breakdown of those, run `python -X importtime -c "import app.main"`.
+"""
+import importlib
+import threading
+import time
+from contextlib import contextmanager
+
+_boot_started = time.perf_counter()
+_ready_at: float | None = None
+_steps: list[dict] = []
+_lock = threading.Lock()
+
+
+def record(name: str, seconds: float, lazy: bool = False) -> None:
+    with _lock:
+        _steps.append({
+            "name": name,
+            "ms": round(seconds * 1000, 3),
+            "lazy": lazy,
+            "at_ms": round((time.perf_counter() - _boot_started) * 1000, 3),
+        })
+
+
+@contextmanager
+def step(name: str, lazy: bool = False):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started, lazy)
+
+
+def import_router(module: str):
+    """Import `module` and return its `router`, timing the import."""
+    with step(f"import {module}"):
+        return importlib.import_module(module).router
+
+
+def mark_ready() -> float:
+    """Call from the startup event: boot is over. Returns seconds since boot."""
+    global _ready_at
+    with _lock:
+        if _ready_at is None:
+            _ready_at = time.perf_counter()
+        return _ready_at - _boot_started
+
+
+def report() -> dict:
+    with _lock:
+        ready = _ready_at
+        steps = sorted(_steps, key=lambda s: s["ms"], reverse=True)
+    return {
+        "ready": ready is not None,
+        "startup_ms": round((ready - _boot_started) * 1000, 3) if ready is not None else None,
+        "steps": steps,
+    }
@@ -1,44 +1,91 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from app.api import health
-from app.api.auth import router as auth_router
-from app.api.users import router as users_router
-from app.api.customers import router as customers_router
-from app.api.invoices import router as invoices_router
-from app.api.bank_accounts import router as bank_accounts_router
-from app.api.services import router as services_router
-from app.api.search import router as search_router
-from app.api.transaction_categories import router as transaction_categories_router
-from app.api.transactions import router as transactions_router
-from app.api.contracts import router as contracts_router
-from app.api.productivity import router as productivity_router
-from app.api.implementations import router as implementations_router
-from app.api.automations import router as automations_router
-from app.api.code_reviews import router as code_reviews_router
-from app.api.address_pr import router as address_pr_router
-from app.api.briefing import router as briefing_router
-from app.api.proposals import router as proposals_router
-from app.api.watchers import router as watchers_router
-from app.api.insights import router as insights_router
-from app.api.runner import router as runner_router
-from app.api.content import router as content_router
-from app.api.devocionais import router as devocionais_router
-from app.api.empresa import router as empresa_router
-from app.core.config import settings
-from app.core.firebase import init_firebase
-from app.core.db import engine
-from app.core.org_blocklist import OrgBlocklistMiddleware, install_db_guard
+import logging
+from contextlib import asynccontextmanager
 
-app = FastAPI(title="AI Service API", version="1.0.0")
+# First, so the boot clock starts before fastapi and the routers are imported.
+from app.core import startup
 
-init_firebase()
+with startup.step("import fastapi"):
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+
+with startup.step("import app.core (config, db, http_pool, org_blocklist)"):
+    from app.core import http_pool
+    from app.core.config import settings
+    from app.core.db import engine
+    from app.core.metrics import MetricsMiddleware
+    from app.core.org_blocklist import OrgBlocklistMiddleware, install_db_guard
+    from app.core.pagination import NEXT_CURSOR_HEADER
+
+logger = logging.getLogger(__name__)
+
+# Included in this order. Each import is timed (GET /admin/startup); heavy
+# third-party SDKs (firebase_admin, cryptography, yaml, slack_sdk) are imported
+# by the code that uses them, on first use, not by these modules.
+ROUTERS = (
+    "app.api.health",
+    "app.api.auth",
+    "app.api.users",
+    "app.api.customers",
+    "app.api.invoices",
+    "app.api.bank_accounts",
+    "app.api.services",
+    "app.api.search",
+    "app.api.transaction_categories",
+    "app.api.transactions",
+    "app.api.contracts",
+    "app.api.productivity",
+    "app.api.implementations",
+    "app.api.automations",
+    "app.api.code_reviews",
+    "app.api.address_pr",
+    "app.api.briefing",
+    "app.api.proposals",
+    "app.api.watchers",
+    "app.api.insights",
+    "app.api.runner",
+    "app.api.content",
+    "app.api.devocionais",
+    "app.api.empresa",
+    "app.api.admin",
+    "app.api.metrics",
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Import of this module (routers, DB guard) up to the startup event — the
+    # part --reload pays on every change. Breakdown: GET /admin/startup.
+    app.state.startup_seconds = round(startup.mark_ready(), 3)
+    slowest = ", ".join(f"{s['name']} {s['ms']:.0f}ms" for s in startup.report()["steps"][:3])
+    logger.info("startup took %.3fs (slowest: %s)", app.state.startup_seconds, slowest)
+    # Firebase itself initializes on the first token check; a missing
+    # service-account file should still stop the boot.
+    from app.core import firebase
+    firebase.check_config()
+    # Productivity sync workers draining the shared sync_jobs queue.
+    from app.services import sync_jobs
+    sync_jobs.start_workers()
+    yield
+    sync_jobs.stop_workers()
+    # Close the git providers' keep-alive connections (app/core/http_pool.py).
+    http_pool.shutdown()
+
+
+app = FastAPI(title="AI Service API", version="1.0.0", lifespan=lifespan)
 
 # Permanent block on one organisation — see app/core/org_blocklist.py. The
-# middleware is added first so it wraps everything below it, and the database
-# triggers are (re)installed on every boot so a rebuilt database is never
-# left unguarded.
+# middleware is added first so it wraps everything below it. The database
+# triggers are checked on boot so a rebuilt database is never left unguarded;
+# install_db_guard only takes table locks when the guard DDL changed or a
+# trigger is missing.
 app.add_middleware(OrgBlocklistMiddleware)
-install_db_guard(engine)
+if settings.DB_GUARD_ON_BOOT:
+    with startup.step("install_db_guard"):
+        _guard = install_db_guard(engine)
+    logger.info(
+        "org-blocklist guard: %s (%d tables, %.3fs)",
+        _guard["action"], _guard["tables"], _guard["seconds"],
+    )
 
 app.add_middleware(
     CORSMiddleware,
@@ -46,29 +93,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let the frontend read pagination cursors (app/core/pagination.py).
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
-app.include_router(health.router)
-app.include_router(auth_router)
-app.include_router(users_router)
-app.include_router(customers_router)
-app.include_router(invoices_router)
-app.include_router(bank_accounts_router)
-app.include_router(services_router)
-app.include_router(search_router)
-app.include_router(transaction_categories_router)
-app.include_router(transactions_router)
-app.include_router(contracts_router)
-app.include_router(productivity_router)
-app.include_router(implementations_router)
-app.include_router(automations_router)
-app.include_router(code_reviews_router)
-app.include_router(address_pr_router)
-app.include_router(briefing_router)
-app.include_router(proposals_router)
-app.include_router(watchers_router)
-app.include_router(insights_router)
-app.include_router(runner_router)
-app.include_router(content_router)
-app.include_router(devocionais_router)
-app.include_router(empresa_router)
+# Outermost: per-route latency, SQL count/time and response size, exposed at
+# GET /metrics and as a Server-Timing header (app/core/metrics.py).
+app.add_middleware(MetricsMiddleware)
+
+_routers = [startup.import_router(module) for module in ROUTERS]
+with startup.step("include routers"):
+    for _router in _routers:
+        app.include_router(_router)
@@ -15,7 +15,12 @@ from app.models.task_execution import TaskExecution
 from app.models.productivity_connection import ProductivityConnection
 from app.models.productivity_commit import ProductivityCommit
 from app.models.productivity_pull_request import ProductivityPullRequest
+from app.models.productivity_daily import ProductivityDaily
 from app.models.local_commit import LocalCommit
+from app.models.local_commit_daily import LocalCommitDaily
+from app.models.http_validator_cache import HttpValidatorCache
+from app.models.user_activity_cache import UserActivityCache
+from app.models.sync_job import SyncJob
 from app.models.user_git_email import UserGitEmail
 from app.models.implementation_run import ImplementationRun
 from app.models.implementation_step import ImplementationStep
@@ -57,7 +62,12 @@ __all__ = [
     "ProductivityConnection",
     "ProductivityCommit",
     "ProductivityPullRequest",
+    "ProductivityDaily",
     "LocalCommit",
+    "LocalCommitDaily",
+    "HttpValidatorCache",
+    "UserActivityCache",
+    "SyncJob",
     "UserGitEmail",
     "ImplementationRun",
     "ImplementationStep",
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer, LargeBinary, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.db import Base
+
+
+class HttpValidatorCache(Base):
+    """Last 200 response of a conditional-request-capable provider GET, with
+    its validators (ETag / Last-Modified) — see app/services/http_cache.py.
+
+    Keyed by a hash of the token identity and the full URL, so two tokens
+    never see each other's responses. One row per URL (upserted); rows nobody
+    has read in HTTP_CACHE_MAX_AGE_DAYS are pruned.
+    """
+
+    __tablename__ = "http_validator_cache"
+
+    __table_args__ = (
+        Index("ix_http_validator_cache_last_used", "last_used_at"),
+    )
+
+    cache_key = Column(String(64), primary_key=True)
+    url = Column(Text, nullable=False)
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    status_code = Column(Integer, nullable=False, default=200)
+    # Only the headers a provider reads back (content-type, link).
+    headers = Column(JSONB, nullable=False, default=dict, server_default="{}")
+    body = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_used_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.core.db import Base
@@ -14,6 +14,8 @@ class LocalCommit(Base):
         UniqueConstraint("hash", "remote_url", name="uq_local_commits_hash_remote"),
         Index("ix_local_commits_committed_at", "committed_at"),
         Index("ix_local_commits_email", "email"),
+        # Matches the case-insensitive email + date-range filters on this table.
+        Index("ix_local_commits_lower_email_committed_at", text("lower(email)"), "committed_at"),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -28,5 +30,8 @@ class LocalCommit(Base):
     deletions = Column(Integer, nullable=False, default=0)
     repo_name = Column(String, nullable=False)
     remote_url = Column(String, nullable=False, default="", server_default="")
+    # remote_url normalized so SSH and HTTPS clones of one repo share a key
+    # ("owner/repo"; "(local) <repo>" without a remote). Set at ingest.
+    remote_key = Column(String, nullable=False, default="", server_default="")
     source = Column(String, nullable=False, default="qwe", server_default="qwe")
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Date, DateTime, Integer, String
+
+from app.core.db import Base
+
+
+class LocalCommitDaily(Base):
+    """Per-day rollup of local_commits by author email and normalized remote,
+    maintained at ingest (app/services/local_commits.py). The by-repo report
+    aggregates these rows instead of scanning local_commits."""
+
+    __tablename__ = "local_commit_daily"
+
+    email = Column(String, primary_key=True)  # lowercased
+    remote_key = Column(String, primary_key=True)  # LocalCommit.remote_key
+    day = Column(Date, primary_key=True)  # UTC day of committed_at
+    commits = Column(Integer, nullable=False, default=0)
+    additions = Column(Integer, nullable=False, default=0)
+    deletions = Column(Integer, nullable=False, default=0)
+    last_commit = Column(DateTime(timezone=True), nullable=False)
+    # One raw remote/repo name behind remote_key, shown alongside it.
+    remote_url = Column(String, nullable=False, default="")
+    repo_name = Column(String, nullable=False, default="")
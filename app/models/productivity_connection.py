@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 
@@ -46,10 +46,20 @@ class ProductivityConnection(Base):
     last_sync_attempted_at = Column(DateTime, nullable=True)
     last_sync_status = Column(String, nullable=True)  # "success" or "error"
     last_sync_error = Column(Text, nullable=True)
+    # Syncs in a row that ended in error; the scheduler's auto-sync backs off
+    # exponentially on it (app/scheduler/auto_sync.py). Reset by a clean sync.
+    sync_failures = Column(Integer, nullable=False, default=0, server_default="0")
+    # Minutes between scheduled syncs; NULL uses AUTO_SYNC_INTERVAL_MINUTES,
+    # 0 turns auto-sync off for this connection.
+    auto_sync_interval_minutes = Column(Integer, nullable=True)
     # Per-repository sync watermark: {repo_full_name: ISO-8601 timestamp}. Lets a
     # newly-added repo get its own backfill instead of inheriting the connection's
     # last_synced_at (which would skip everything committed before the repo was added).
     repo_synced_at = Column(JSONB, nullable=False, default=dict, server_default="{}")
+    # Branch head OIDs seen by the last clean sync: {repo: {branch: oid}}. A
+    # GitHub branch whose head hasn't moved has no new commits, so the next sync
+    # skips its history crawl entirely.
+    branch_heads = Column(JSONB, nullable=False, default=dict, server_default="{}")
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Date, ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.db import Base
+
+
+class ProductivityDaily(Base):
+    """Per-day rollup of a connection's synced commits and PRs by repository,
+    maintained as sync inserts rows (app/services/productivity_rollup.py). The
+    stats endpoints sum these rows instead of scanning the raw tables."""
+
+    __tablename__ = "productivity_daily"
+
+    connection_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("productivity_connections.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    repository = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)  # day of the stored (UTC) timestamp
+    # Commit figures exclude merge commits, like the stats always have.
+    commits = Column(Integer, nullable=False, default=0)
+    additions = Column(Integer, nullable=False, default=0)
+    deletions = Column(Integer, nullable=False, default=0)
+    prs = Column(Integer, nullable=False, default=0)  # by created_at_remote
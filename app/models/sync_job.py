@@ -0,0 +1,48 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.db import Base
+
+
+class SyncJob(Base):
+    """One productivity sync of a connection, queued by the API (and the
+    scheduler) and run by whichever worker claims it first — see
+    app/services/sync_jobs.py. The table is the shared view every process has
+    of what is queued, running or finished."""
+
+    __tablename__ = "sync_jobs"
+
+    __table_args__ = (
+        # At most one queued-or-running job per connection: enqueueing while
+        # one is pending hands back that job instead of stacking another.
+        Index(
+            "uq_sync_jobs_active_connection",
+            "connection_id",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'running')"),
+            sqlite_where=text("status IN ('queued', 'running')"),
+        ),
+        Index("ix_sync_jobs_status_queued_at", "status", "queued_at"),
+        Index("ix_sync_jobs_connection_queued_at", "connection_id", "queued_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    connection_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("productivity_connections.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    status = Column(String, nullable=False, default="queued")  # queued | running | done | error
+    trigger = Column(String, nullable=False)  # "manual" | "created" | "scheduled"
+    worker = Column(String, nullable=True)  # host:pid/thread that ran it
+    queued_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Not claimed before this; staggers the scheduler's auto-syncs.
+    run_after = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    commits_synced = Column(Integer, nullable=True)
+    prs_synced = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
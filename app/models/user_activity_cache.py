@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from app.core.db import Base
+
+
+class UserActivityCache(Base):
+    """Last GitHub contributions summary fetched for GET
+    /productivity/user-activity, per primary connection and date range — see
+    app/services/user_activity_cache.py.
+
+    A connection belongs to one user, so the key is per user too. `username`
+    is the login the summary was fetched for; an entry for another login (the
+    connection was re-pointed) counts as a miss.
+    """
+
+    __tablename__ = "user_activity_cache"
+
+    __table_args__ = (
+        Index("ix_user_activity_cache_last_used", "last_used_at"),
+    )
+
+    connection_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("productivity_connections.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    date_from = Column(Date, primary_key=True)
+    date_to = Column(Date, primary_key=True)
+    username = Column(String, nullable=False)
+    # {"totals", "organizations", "diagnostics"} as the provider returned it.
+    result = Column(JSONB, nullable=False)
+    fetched_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_used_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,82 @@
+"""Scheduled productivity syncs, so the stats pages don't stay stale until
+someone clicks Sync.
+
+Each cycle queues a sync job (trigger "scheduled", see app/services/sync_jobs.py)
+for every connection whose interval has elapsed since its last attempt — most
+overdue first, at most AUTO_SYNC_MAX_PER_CYCLE. To keep syncs from piling onto
+the providers' rate limits at once:
+
+- every connection's due time carries a stable jitter of up to a tenth of its
+  interval, so connections created or synced together drift apart instead of
+  coming due in the same cycle forever;
+- the jobs of one cycle get `run_after` spread evenly across the cycle.
+
+A connection whose last syncs failed waits interval * 2^failures (capped at
+AUTO_SYNC_MAX_BACKOFF_MINUTES) before the next try; a clean sync resets it.
+"""
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.productivity_connection import ProductivityConnection
+from app.models.sync_job import SyncJob
+from app.services import sync_jobs
+
+logger = logging.getLogger("scheduler.auto_sync")
+
+JITTER_FRACTION = 0.1
+# 2^10 × the interval is already far past any sane backoff cap.
+MAX_BACKOFF_EXPONENT = 10
+
+
+def interval_for(conn: ProductivityConnection) -> int:
+    """Minutes between scheduled syncs of the connection; 0 = auto-sync off."""
+    if conn.auto_sync_interval_minutes is not None:
+        return conn.auto_sync_interval_minutes
+    return settings.AUTO_SYNC_INTERVAL_MINUTES
+
+
+def next_sync_at(conn: ProductivityConnection) -> datetime | None:
+    """When the connection is next due, or None when auto-sync is off for it."""
+    interval = interval_for(conn)
+    if interval <= 0:
+        return None
+    failures = min(conn.sync_failures or 0, MAX_BACKOFF_EXPONENT)
+    wait = min(interval * 2 ** failures, max(settings.AUTO_SYNC_MAX_BACKOFF_MINUTES, interval))
+    # Stable per connection: the UUID's low bits pick a point in [0, 1).
+    jitter = (conn.id.int % 1000) / 1000 * JITTER_FRACTION * interval
+    last = conn.last_sync_attempted_at or conn.created_at
+    return last + timedelta(minutes=wait + jitter)
+
+
+def queue_due_syncs(db: Session, spread_seconds: int, now: datetime | None = None) -> int:
+    """Queue the connections that are due; returns how many were queued."""
+    if not settings.AUTO_SYNC_ENABLED or settings.AUTO_SYNC_MAX_PER_CYCLE <= 0:
+        return 0
+    now = now or datetime.utcnow()
+    busy = {
+        row.connection_id
+        for row in db.query(SyncJob.connection_id).filter(SyncJob.status.in_(sync_jobs.ACTIVE))
+    }
+    due: list[tuple[datetime, ProductivityConnection]] = []
+    for conn in db.query(ProductivityConnection).all():
+        if conn.id in busy:
+            continue
+        at = next_sync_at(conn)
+        if at is not None and at <= now:
+            due.append((at, conn))
+    due.sort(key=lambda pair: pair[0])
+    due = due[:settings.AUTO_SYNC_MAX_PER_CYCLE]
+
+    step = spread_seconds / len(due) if due else 0
+    queued = 0
+    for i, (_, conn) in enumerate(due):
+        _, created = sync_jobs.enqueue(
+            db, conn.id, trigger="scheduled", run_after=now + timedelta(seconds=i * step)
+        )
+        queued += created
+    if queued:
+        logger.info("Queued %d scheduled syncs (%d due)", queued, len(due))
+    return queued
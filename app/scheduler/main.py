@@ -37,6 +37,10 @@ def _init_models():
     from app.models.implementation_step import ImplementationStep  # noqa: F401
     from app.models.platform_event import PlatformEvent  # noqa: F401
     from app.models.proposal import Proposal  # noqa: F401
+    from app.models.http_validator_cache import HttpValidatorCache  # noqa: F401
+    from app.models.sync_job import SyncJob  # noqa: F401
+    from app.models.productivity_daily import ProductivityDaily  # noqa: F401
+    from app.models.user_activity_cache import UserActivityCache  # noqa: F401
 
 
 _init_models()
@@ -46,6 +50,8 @@ from app.scheduler.materializer import materialize_pending_executions  # noqa: E
 from app.scheduler.executor import execute_pending_tasks  # noqa: E402
 from app.scheduler.automation_materializer import materialize_automation_runs  # noqa: E402
 from app.scheduler.watchdog import run_watchdog  # noqa: E402
+from app.scheduler.auto_sync import queue_due_syncs  # noqa: E402
+from app.services import http_cache, sync_jobs, user_activity_cache  # noqa: E402
 
 INTERVAL_SECONDS = 300  # 5 minutes
 
@@ -59,6 +65,11 @@ def run_cycle() -> None:
         materialize_planner_runs(db)
         maybe_send_daily_digest(db)
         run_watchdog(db)
+        http_cache.prune(db)
+        user_activity_cache.prune(db)
+        sync_jobs.recover_stale(db)
+        sync_jobs.prune(db)
+        queue_due_syncs(db, spread_seconds=INTERVAL_SECONDS)
     except Exception:
         logger.exception("Scheduler cycle failed")
     finally:
@@ -138,6 +149,8 @@ async def main() -> None:
     # approval buttons work (no-op if SLACK_APP_TOKEN isn't set). Non-blocking.
     from app.slack.actions import start_socket_mode
     start_socket_mode()
+    # This process drains the sync_jobs queue too, alongside the API workers.
+    sync_jobs.start_workers()
     run_cycle()
     while True:
         await asyncio.sleep(INTERVAL_SECONDS)
@@ -0,0 +1,55 @@
+from pydantic import BaseModel
+
+
+class PoolStats(BaseModel):
+    """Snapshot of the shared SQLAlchemy connection pool for this process.
+
+    `checked_out` / `overflow` are live; the rest are counters since boot (or
+    the last reset). `overflow_hits` counts checkouts that had to open a
+    connection beyond pool_size, and `timeouts` the ones that gave up with
+    "QueuePool limit".
+    """
+
+    engine: str  # "sync" or "async"
+    pool_size: int
+    max_overflow: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    overflow_hits: int
+    timeouts: int
+    wait_total_ms: float
+    wait_avg_ms: float
+    wait_max_ms: float
+
+
+class AuthCacheStats(BaseModel):
+    """Verified-token cache in get_current_user. `saved_ms_total` estimates the
+    latency hits avoided: each hit priced at an average miss (token verify +
+    user query) minus what the hit itself cost."""
+
+    entries: int
+    max_entries: int
+    hits: int
+    misses: int
+    hit_ratio: float
+    avg_hit_ms: float
+    avg_miss_ms: float
+    saved_ms_total: float
+
+
+class StartupStep(BaseModel):
+    name: str
+    ms: float
+    lazy: bool  # deferred to first use rather than paid at boot
+    at_ms: float  # when it finished, since the process started importing app.main
+
+
+class StartupReport(BaseModel):
+    """Boot timing for this process (see app/core/startup.py). `startup_ms` is
+    null until the startup event has fired."""
+
+    ready: bool
+    startup_ms: float | None
+    steps: list[StartupStep]
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, field_validator, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 VALID_PROVIDERS = ("github", "bitbucket")
@@ -64,6 +64,8 @@ class ConnectionUpdate(BaseModel):
     custom_name: str | None = None
     selected_repos: list[str] | None = None
     is_primary: bool | None = None
+    # Minutes between scheduled syncs; null = the server default, 0 = off.
+    auto_sync_interval_minutes: int | None = Field(None, ge=0)
 
 
 class ConnectionRead(BaseModel):
@@ -81,6 +83,7 @@ class ConnectionRead(BaseModel):
     last_sync_attempted_at: datetime | None
     last_sync_status: str | None
     last_sync_error: str | None
+    auto_sync_interval_minutes: int | None = None
     created_at: datetime
     updated_at: datetime
 
@@ -158,7 +161,42 @@ class SyncResult(BaseModel):
     status: str  # "started" | "in_progress" | "completed"
     commits_synced: int = 0
     prs_synced: int = 0
+    # GitHub: branches whose history was crawled vs. skipped because their head
+    # hadn't moved since the last clean sync.
+    branches_crawled: int = 0
+    branches_skipped: int = 0
     errors: list[str] = []
+    # The queued (or already pending) sync job, for GET .../sync-jobs.
+    job_id: UUID | None = None
+
+
+class SyncJobRead(BaseModel):
+    id: UUID
+    connection_id: UUID
+    status: str  # "queued" | "running" | "done" | "error"
+    trigger: str  # "manual" | "created" | "scheduled"
+    worker: str | None = None
+    queued_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    commits_synced: int | None = None
+    prs_synced: int | None = None
+    error: str | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class RateLimitBudget(BaseModel):
+    resource: str  # "core" (REST), "graphql", "search"
+    limit: int | None = None
+    remaining: int | None = None
+    used: int | None = None
+    reset_at: datetime | None = None
+    last_cost: int | None = None  # GraphQL points the last query cost
+    paused: bool = False  # syncs/watchers are holding off until reset_at
+    paused_until: datetime | None = None
+    observed_at: datetime | None = None
 
 
 class UserActivityRepo(BaseModel):
@@ -193,6 +231,9 @@ class UserActivityResponse(BaseModel):
     totals: UserActivityTotals
     organizations: list[UserActivityOrg]
     diagnostics: UserActivityDiagnostics
+    # When the summary was fetched from GitHub; a cached one may be older than
+    # the cache TTL while its background refresh runs.
+    fetched_at: datetime | None = None
 
 
 class GitEmailCreate(BaseModel):
@@ -10,8 +10,9 @@ from datetime import datetime
 from uuid import UUID
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session, lazyload
+from sqlalchemy.orm import Session, lazyload, selectinload
 
+from app.core.pagination import Page, paginate
 from app.models.address_pr_run import AddressPrRun
 from app.models.address_pr_step import AddressPrStep
 from app.services import platform_events_service as events
@@ -126,13 +127,13 @@ def get_run(db: Session, run_id: UUID) -> AddressPrRun | None:
     return db.query(AddressPrRun).filter(AddressPrRun.id == run_id).first()
 
 
-def list_runs(db: Session, user_id: UUID) -> list[AddressPrRun]:
-    return (
+def list_runs(db: Session, user_id: UUID, page: Page | None = None) -> list[AddressPrRun]:
+    query = (
         db.query(AddressPrRun)
+        .options(selectinload(AddressPrRun.steps))
         .filter(AddressPrRun.created_by_user_id == user_id)
-        .order_by(AddressPrRun.created_at.desc())
-        .all()
     )
+    return paginate(query, page, AddressPrRun.created_at.desc())
 
 
 def has_active_run_for_pr(db: Session, pr_url: str) -> bool:
@@ -5,10 +5,11 @@ from datetime import date, datetime, time
 from pathlib import Path
 from uuid import UUID
 
-from sqlalchemy import and_, or_, select, text, update
+from sqlalchemy import and_, func, or_, select, text, update
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.pagination import Page, paginate
 
 logger = logging.getLogger(__name__)
 from app.models.automation import Automation
@@ -44,8 +45,14 @@ def _serialize_run(run: AutomationRun) -> dict:
     }
 
 
-def _serialize_automation(automation: Automation, recent_runs_limit: int = 5) -> dict:
-    runs = automation.runs[:recent_runs_limit]
+def _serialize_automation(
+    automation: Automation,
+    recent_runs_limit: int = 5,
+    recent_runs: list[AutomationRun] | None = None,
+) -> dict:
+    # `recent_runs` comes pre-fetched from list views; otherwise this loads the
+    # full `automation.runs` collection, fine for a single automation.
+    runs = recent_runs if recent_runs is not None else automation.runs[:recent_runs_limit]
     return {
         "id": automation.id,
         "name": automation.name,
@@ -89,14 +96,44 @@ def list_available_skills() -> list[str]:
     return sorted(f"/{name}" for name in names)
 
 
-def list_automations(db: Session, user_id: UUID) -> list[dict]:
-    automations = (
-        db.query(Automation)
-        .filter(Automation.user_id == user_id, Automation.ephemeral.is_(False))
-        .order_by(Automation.created_at.desc())
+def list_automations(db: Session, user_id: UUID, page: Page | None = None) -> list[dict]:
+    query = db.query(Automation).filter(
+        Automation.user_id == user_id, Automation.ephemeral.is_(False)
+    )
+    automations = paginate(query, page, Automation.created_at.desc())
+    recent = _recent_runs(db, [a.id for a in automations])
+    return [_serialize_automation(a, recent_runs=recent.get(a.id, [])) for a in automations]
+
+
+def _recent_runs(db: Session, automation_ids: list[UUID], limit: int = 5) -> dict[UUID, list[AutomationRun]]:
+    """The `limit` most recent runs of each automation, in one query — instead
+    of loading every automation's whole run history one lazy load at a time."""
+    if not automation_ids:
+        return {}
+    ranked = (
+        select(
+            AutomationRun.id,
+            func.row_number()
+            .over(
+                partition_by=AutomationRun.automation_id,
+                order_by=(AutomationRun.scheduled_for.desc(), AutomationRun.created_at.desc()),
+            )
+            .label("rank"),
+        )
+        .where(AutomationRun.automation_id.in_(automation_ids))
+        .subquery()
+    )
+    runs = (
+        db.query(AutomationRun)
+        .join(ranked, ranked.c.id == AutomationRun.id)
+        .filter(ranked.c.rank <= limit)
+        .order_by(AutomationRun.scheduled_for.desc(), AutomationRun.created_at.desc())
         .all()
     )
-    return [_serialize_automation(a) for a in automations]
+    by_automation: dict[UUID, list[AutomationRun]] = {}
+    for run in runs:
+        by_automation.setdefault(run.automation_id, []).append(run)
+    return by_automation
 
 
 def create_ephemeral_run(db: Session, user_id: UUID, payload: dict) -> dict:
@@ -1,10 +1,15 @@
+import asyncio
 import logging
 from datetime import datetime
 
 import httpx
 
+from app.core import http_pool
+from app.core.config import settings
+
 logger = logging.getLogger(__name__)
 
+HOST = "api.bitbucket.org"
 BASE_URL = "https://api.bitbucket.org/2.0"
 
 _MERGE_MESSAGE_PREFIXES = ("Merge ", "Merged ")
@@ -34,6 +39,8 @@ class BitbucketProvider:
         self.workspace = workspace or username
         self.pat = pat
         self.external_account_id = external_account_id
+        # Sent per request: the pooled client is shared by every connection.
+        self.auth = httpx.BasicAuth(username, pat)
 
     async def validate_token(self) -> bool:
         """Confirm the PAT/username combo authenticates successfully.
@@ -47,19 +54,16 @@ class BitbucketProvider:
         authenticated the request but is enforcing a scope restriction on
         it — i.e. the credentials ARE valid, per plain HTTP semantics.
         """
-        async with httpx.AsyncClient(**self._client_kwargs()) as client:
-            resp = await client.get(f"{BASE_URL}/user")
+        async with http_pool.client(HOST) as client:
+            resp = await client.get(f"{BASE_URL}/user", auth=self.auth)
             return resp.status_code in (200, 403)
 
-    def _client_kwargs(self) -> dict:
-        return {"auth": httpx.BasicAuth(self.username, self.pat)}
-
     async def get_current_user(self) -> dict | None:
         """Fetch the account that owns the PAT. Returns None on failure.
         Bitbucket's `username` field is deprecated (GDPR); `nickname` is the
         public handle and `account_id` is the stable opaque identifier."""
-        async with httpx.AsyncClient(**self._client_kwargs()) as client:
-            resp = await client.get(f"{BASE_URL}/user")
+        async with http_pool.client(HOST) as client:
+            resp = await client.get(f"{BASE_URL}/user", auth=self.auth)
             if resp.status_code != 200:
                 return None
             data = resp.json()
@@ -74,9 +78,11 @@ class BitbucketProvider:
     async def list_workspaces(self) -> list[dict]:
         workspaces: list[dict] = []
 
-        async with httpx.AsyncClient(**self._client_kwargs()) as client:
+        async with http_pool.client(HOST) as client:
             # Try /workspaces first
-            resp = await client.get(f"{BASE_URL}/workspaces", params={"pagelen": 100})
+            resp = await client.get(
+                f"{BASE_URL}/workspaces", params={"pagelen": 100}, auth=self.auth
+            )
             if resp.status_code == 200:
                 data = resp.json()
                 for ws in data.get("values", []):
@@ -94,7 +100,7 @@ class BitbucketProvider:
             url: str | None = f"{BASE_URL}/repositories"
             params: dict = {"pagelen": 100, "role": "member"}
             while url:
-                resp = await client.get(url, params=params)
+                resp = await client.get(url, params=params, auth=self.auth)
                 if resp.status_code != 200:
                     break
                 data = resp.json()
@@ -119,9 +125,9 @@ class BitbucketProvider:
         repos: list[str] = []
         url: str | None = f"{BASE_URL}/repositories/{self.workspace}"
 
-        async with httpx.AsyncClient(**self._client_kwargs()) as client:
+        async with http_pool.client(HOST) as client:
             while url:
-                resp = await client.get(url, params={"pagelen": 100})
+                resp = await client.get(url, params={"pagelen": 100}, auth=self.auth)
                 if resp.status_code != 200:
                     logger.warning(f"Bitbucket list repos failed: {resp.status_code}")
                     break
@@ -152,13 +158,16 @@ class BitbucketProvider:
         return self.username in {c for c in candidates if c}
 
     async def _get_main_branch(self, client: httpx.AsyncClient, repo: str) -> str | None:
-        resp = await client.get(f"{BASE_URL}/repositories/{repo}")
+        resp = await client.get(f"{BASE_URL}/repositories/{repo}", auth=self.auth)
         if resp.status_code != 200:
             return None
         return (resp.json().get("mainbranch") or {}).get("name")
 
     async def fetch_commits(
-        self, repo: str, since: datetime | None = None
+        self,
+        repo: str,
+        since: datetime | None = None,
+        known_diffstats: dict[str, dict] | None = None,
     ) -> list[dict]:
         """Crawl the repo's main branch only.
 
@@ -173,75 +182,102 @@ class BitbucketProvider:
         main branch anyway (same hash unless squashed), so scoping to just
         the main branch is both far cheaper and a more accurate picture of
         shipped work than counting commits still stuck on abandoned branches.
+
+        Diffstats are fetched concurrently (up to BITBUCKET_DIFFSTAT_CONCURRENCY)
+        while the next commits page downloads. `known_diffstats` maps hashes
+        whose stats are already stored to {"additions", "deletions"}; those
+        commits cost no diffstat call at all.
         """
         commits: list[dict] = []
         seen: set[str] = set()
-
-        async with httpx.AsyncClient(**self._client_kwargs()) as client:
-            branch = await self._get_main_branch(client, repo)
-            url: str | None = (
-                f"{BASE_URL}/repositories/{repo}/commits/{branch}"
-                if branch
-                else f"{BASE_URL}/repositories/{repo}/commits"
-            )
-
-            stop = False
-            params: dict = {"pagelen": 100}
-            while url:
-                resp = await client.get(url, params=params)
-                if resp.status_code != 200:
-                    logger.warning(
-                        f"Bitbucket fetch commits failed for {repo}@{branch or 'default'}: "
-                        f"{resp.status_code}"
-                    )
-                    break
-
-                data = resp.json()
-
-                for item in data.get("values", []):
-                    commit_date = datetime.fromisoformat(
-                        item["date"].replace("Z", "+00:00")
-                    )
-                    if since and commit_date < since:
-                        stop = True
+        known = known_diffstats or {}
+        semaphore = asyncio.Semaphore(max(1, settings.BITBUCKET_DIFFSTAT_CONCURRENCY))
+        pending: list[tuple[dict, asyncio.Task]] = []
+
+        async with http_pool.client(HOST) as client:
+
+            async def _diffstat(sha: str) -> dict:
+                async with semaphore:
+                    return await self._get_diffstat(client, repo, sha)
+
+            try:
+                branch = await self._get_main_branch(client, repo)
+                url: str | None = (
+                    f"{BASE_URL}/repositories/{repo}/commits/{branch}"
+                    if branch
+                    else f"{BASE_URL}/repositories/{repo}/commits"
+                )
+
+                stop = False
+                params: dict = {"pagelen": 100}
+                while url:
+                    resp = await client.get(url, params=params, auth=self.auth)
+                    if resp.status_code != 200:
+                        logger.warning(
+                            f"Bitbucket fetch commits failed for {repo}@{branch or 'default'}: "
+                            f"{resp.status_code}"
+                        )
                         break
 
-                    author_raw = item.get("author", {})
-                    author_user = author_raw.get("user", {}) or {}
-                    if not self._is_self_author(author_user):
-                        continue
-
-                    sha = item["hash"]
-                    if sha in seen:
-                        continue
-                    seen.add(sha)
-
-                    author_name = (
-                        author_user.get("display_name")
-                        or author_raw.get("raw", "unknown").split("<")[0].strip()
-                    )
-
-                    diffstat = await self._get_diffstat(client, repo, sha)
-
-                    commits.append({
-                        "hash": sha,
-                        "short_hash": sha[:7],
-                        "message": item.get("message", "").split("\n")[0],
-                        "author": author_name,
-                        "date": item["date"],
-                        "additions": diffstat["additions"],
-                        "deletions": diffstat["deletions"],
-                        "repository": repo,
-                        "is_merge": is_merge_commit(
-                            item.get("parents"), item.get("message")
-                        ),
-                    })
+                    data = resp.json()
+
+                    for item in data.get("values", []):
+                        commit_date = datetime.fromisoformat(
+                            item["date"].replace("Z", "+00:00")
+                        )
+                        if since and commit_date < since:
+                            stop = True
+                            break
+
+                        author_raw = item.get("author", {})
+                        author_user = author_raw.get("user", {}) or {}
+                        if not self._is_self_author(author_user):
+                            continue
+
+                        sha = item["hash"]
+                        if sha in seen:
+                            continue
+                        seen.add(sha)
+
+                        author_name = (
+                            author_user.get("display_name")
+                            or author_raw.get("raw", "unknown").split("<")[0].strip()
+                        )
+
+                        commit = {
+                            "hash": sha,
+                            "short_hash": sha[:7],
+                            "message": item.get("message", "").split("\n")[0],
+                            "author": author_name,
+                            "date": item["date"],
+                            "additions": 0,
+                            "deletions": 0,
+                            "repository": repo,
+                            "is_merge": is_merge_commit(
+                                item.get("parents"), item.get("message")
+                            ),
+                        }
+                        commits.append(commit)
+                        if sha in known:
+                            commit["additions"] = known[sha]["additions"]
+                            commit["deletions"] = known[sha]["deletions"]
+                        else:
+                            # Starts now; runs while the next page is fetched.
+                            pending.append((commit, asyncio.create_task(_diffstat(sha))))
+
+                    if stop:
+                        break
+                    url = data.get("next")
+                    params = {}
 
-                if stop:
-                    break
-                url = data.get("next")
-                params = {}
+                stats = await asyncio.gather(*(task for _, task in pending))
+            finally:
+                for _, task in pending:
+                    task.cancel()
 
+        for (commit, _), diffstat in zip(pending, stats):
+            commit["additions"] = diffstat["additions"]
+            commit["deletions"] = diffstat["deletions"]
         return commits
 
     async def _get_diffstat(
@@ -252,7 +288,7 @@ class BitbucketProvider:
         url: str | None = f"{BASE_URL}/repositories/{repo}/diffstat/{sha}"
 
         while url:
-            resp = await client.get(url)
+            resp = await client.get(url, auth=self.auth)
             if resp.status_code != 200:
                 break
 
@@ -275,10 +311,10 @@ class BitbucketProvider:
         # every sync (no early exit existed at all).
         params: dict = {"pagelen": 50, "state": "MERGED,OPEN,DECLINED", "sort": "-created_on"}
 
-        async with httpx.AsyncClient(**self._client_kwargs()) as client:
+        async with http_pool.client(HOST) as client:
             stop = False
             while url:
-                resp = await client.get(url, params=params)
+                resp = await client.get(url, params=params, auth=self.auth)
                 if resp.status_code != 200:
                     break
 
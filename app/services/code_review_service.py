@@ -10,8 +10,9 @@ from datetime import datetime
 from uuid import UUID
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session, lazyload
+from sqlalchemy.orm import Session, lazyload, selectinload
 
+from app.core.pagination import Page, paginate
 from app.models.code_review_run import CodeReviewRun
 from app.models.code_review_step import CodeReviewStep
 from app.services import platform_events_service as events
@@ -147,13 +148,13 @@ def get_run(db: Session, run_id: UUID) -> CodeReviewRun | None:
     return db.query(CodeReviewRun).filter(CodeReviewRun.id == run_id).first()
 
 
-def list_runs(db: Session, user_id: UUID) -> list[CodeReviewRun]:
-    return (
+def list_runs(db: Session, user_id: UUID, page: Page | None = None) -> list[CodeReviewRun]:
+    query = (
         db.query(CodeReviewRun)
+        .options(selectinload(CodeReviewRun.steps))
         .filter(CodeReviewRun.created_by_user_id == user_id)
-        .order_by(CodeReviewRun.created_at.desc())
-        .all()
     )
+    return paginate(query, page, CodeReviewRun.created_at.desc())
 
 
 def approve_step(
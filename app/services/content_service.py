@@ -20,6 +20,7 @@ from fastapi import HTTPException, status
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.core.pagination import Page, paginate
 from app.models.idea import Idea
 from app.models.user import User
 from app.models.video import Video
@@ -220,17 +221,25 @@ def _serialize_idea(idea: Idea, video_count: int | None = None) -> dict:
     }
 
 
-def list_ideas(db: Session, user_id: UUID, status_filter: str | None = None) -> list[dict]:
-    counts = dict(
-        db.query(Video.idea_id, func.count(Video.id))
-        .filter(Video.user_id == user_id, Video.idea_id.isnot(None))
-        .group_by(Video.idea_id)
-        .all()
-    )
+def list_ideas(
+    db: Session,
+    user_id: UUID,
+    status_filter: str | None = None,
+    page: Page | None = None,
+) -> list[dict]:
     query = db.query(Idea).filter(Idea.user_id == user_id)
     if status_filter:
         query = query.filter(Idea.status == status_filter)
-    ideas = query.order_by(Idea.created_at.desc()).all()
+    ideas = paginate(query, page, Idea.created_at.desc())
+    counts = {}
+    if ideas:
+        # Video counts for this page's ideas only.
+        counts = dict(
+            db.query(Video.idea_id, func.count(Video.id))
+            .filter(Video.user_id == user_id, Video.idea_id.in_([i.id for i in ideas]))
+            .group_by(Video.idea_id)
+            .all()
+        )
     return [_serialize_idea(i, counts.get(i.id, 0)) for i in ideas]
 
 
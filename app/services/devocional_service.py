@@ -25,8 +25,6 @@ import re
 from datetime import date, datetime
 from pathlib import Path
 
-import yaml
-
 from app.core.config import settings
 
 _FILENAME_RE = re.compile(r"^\d{4}-\d{2}-\d{2}-(.+)\.md$")
@@ -47,6 +45,8 @@ def _imagem_url(frontmatter: dict) -> str | None:
 
 
 def _parse_markdown(text: str) -> tuple[dict, str] | None:
+    import yaml  # lazy: only this page needs it, keep it off the boot path
+
     parts = text.split("---", 2)
     if len(parts) < 3:
         return None
@@ -68,6 +68,8 @@ def _load_ledger() -> dict[str, datetime]:
 
 
 def _load_video_meta() -> dict[str, dict]:
+    import yaml
+
     videos_dir = Path(settings.DEVOCIONAL_VIDEOS_DIR)
     if not videos_dir.is_dir():
         return {}
@@ -83,6 +85,8 @@ def _load_video_meta() -> dict[str, dict]:
 
 
 def list_devocionais() -> list[dict]:
+    import yaml
+
     content_dir = Path(settings.DEVOCIONAL_CONTENT_DIR)
     if not content_dir.is_dir():
         return []
@@ -148,6 +152,8 @@ def get_devocional(slug: str) -> dict | None:
     """Same merge as `list_devocionais`, for a single slug — plus the fields
     the list doesn't need: the full blog body (`roteiro`), the condensed
     Telegram message, and the extra narrated-video metadata."""
+    import yaml
+
     content_dir = Path(settings.DEVOCIONAL_CONTENT_DIR)
     if not content_dir.is_dir():
         return None
@@ -1,12 +1,16 @@
+import asyncio
 import logging
 from datetime import datetime
 
 import httpx
 
+from app.core import http_pool
+from app.services import github_rate_limit, http_cache
 from app.services.bitbucket_provider import is_merge_commit
 
 logger = logging.getLogger(__name__)
 
+HOST = "api.github.com"
 BASE_URL = "https://api.github.com"
 GRAPHQL_URL = "https://api.github.com/graphql"
 
@@ -18,6 +22,7 @@ _UNSET = object()
 # GitHub rate limit and caused later repos in a sync to be skipped entirely).
 COMMIT_HISTORY_QUERY = """
 query($owner: String!, $name: String!, $expr: String!, $since: GitTimestamp, $cursor: String, $author: CommitAuthor) {
+  rateLimit { cost remaining limit resetAt }
   repository(owner: $owner, name: $name) {
     object(expression: $expr) {
       ... on Commit {
@@ -40,6 +45,83 @@ query($owner: String!, $name: String!, $expr: String!, $since: GitTimestamp, $cu
 """
 
 
+# The user's PRs across every repo in a few pages, instead of listing each
+# repo's PRs and filtering by author on our side.
+PR_SEARCH_QUERY = """
+query($q: String!, $cursor: String) {
+  rateLimit { cost remaining limit resetAt }
+  search(type: ISSUE, query: $q, first: 100, after: $cursor) {
+    issueCount
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      ... on PullRequest {
+        number
+        title
+        state
+        url
+        createdAt
+        mergedAt
+        repository { nameWithOwner }
+      }
+    }
+  }
+}
+"""
+# GitHub search never returns more than this many results for one query.
+SEARCH_RESULT_CAP = 1000
+
+_PR_STATUS = {"OPEN": "open", "MERGED": "merged", "CLOSED": "closed"}
+
+# Branch heads for fetch_branch_heads: refs of one repo, 100 per page.
+_REFS_FIELD = (
+    'refs(refPrefix: "refs/heads/", first: 100, after: $cursor) '
+    "{ pageInfo { hasNextPage endCursor } nodes { name target { oid } } }"
+)
+BRANCH_HEADS_PAGE_QUERY = f"""
+query($owner: String!, $name: String!, $cursor: String) {{
+  rateLimit {{ cost remaining limit resetAt }}
+  repository(owner: $owner, name: $name) {{ {_REFS_FIELD} }}
+}}
+"""
+# Repos per aliased branch-heads query; keeps each query's node count (and its
+# GraphQL point cost) well under GitHub's limits.
+BRANCH_HEADS_BATCH = 20
+
+
+def _ref_heads(refs: dict) -> dict[str, str]:
+    return {
+        node["name"]: (node.get("target") or {}).get("oid")
+        for node in refs.get("nodes") or []
+        if (node.get("target") or {}).get("oid")
+    }
+
+
+# A rate-limited request waits for the reset and is retried this many times.
+RATE_LIMIT_RETRIES = 3
+
+
+def _is_rate_limited(resp: httpx.Response) -> bool:
+    """Primary limits are a 403/429 with X-RateLimit-Remaining: 0; secondary
+    (abuse) limits carry Retry-After. A plain 403 is a permissions problem."""
+    if resp.status_code == 429:
+        return True
+    return resp.status_code == 403 and (
+        resp.headers.get("X-RateLimit-Remaining") == "0"
+        or "Retry-After" in resp.headers
+    )
+
+
+def _graphql_rate_limited(resp: httpx.Response) -> bool:
+    """GraphQL can also report exhaustion as a 200 with a RATE_LIMITED error."""
+    if resp.status_code != 200:
+        return False
+    try:
+        errors = resp.json().get("errors") or []
+    except (ValueError, AttributeError):
+        return False
+    return any(isinstance(err, dict) and err.get("type") == "RATE_LIMITED" for err in errors)
+
+
 class GitHubAccessError(Exception):
     def __init__(self, status: int, message: str, sso_url: str | None = None):
         self.status = status
@@ -50,6 +132,7 @@ class GitHubAccessError(Exception):
 
 USER_CONTRIBUTIONS_QUERY = """
 query($login: String!, $from: DateTime!, $to: DateTime!) {
+  rateLimit { cost remaining limit resetAt }
   user(login: $login) {
     contributionsCollection(from: $from, to: $to) {
       totalCommitContributions
@@ -86,28 +169,95 @@ query($login: String!, $from: DateTime!, $to: DateTime!) {
 
 
 class GitHubProvider:
-    def __init__(self, pat: str, username: str, org: str | None = None):
+    def __init__(
+        self,
+        pat: str,
+        username: str,
+        org: str | None = None,
+        priority: str = github_rate_limit.INTERACTIVE,
+    ):
         self.pat = pat
         self.username = username
         self.org = org
+        # Syncs pass BACKGROUND so they leave GITHUB_RATE_LIMIT_RESERVE of the
+        # token's budget for interactive calls (see github_rate_limit).
+        self.priority = priority
+        self.budget_key = github_rate_limit.token_key(pat)
         self._author_id = _UNSET
+        # Repos are synced concurrently; only the first fetch_commits resolves.
+        self._author_lock = asyncio.Lock()
         self.headers = {
             "Authorization": f"token {pat}",
             "Accept": "application/vnd.github.v3+json",
         }
 
+    async def _request(
+        self,
+        client: httpx.AsyncClient,
+        method: str,
+        url: str,
+        resource: str = "core",
+        cache: bool = False,
+        **kwargs,
+    ) -> httpx.Response:
+        """Send a request within the token's rate-limit budget. A rate-limited
+        403/429 (or GraphQL 200 with a RATE_LIMITED error) pauses until the
+        reset and retries instead of failing the caller; after a few tries the
+        response is returned for it to handle.
+
+        `cache=True` makes the GET conditional (see http_cache): a 304 comes
+        back as the stored 200, and doesn't cost rate limit.
+        """
+        entry = None
+        if cache:
+            cache_url = http_cache.full_url(url, kwargs.get("params"))
+            entry = await http_cache.lookup(self.budget_key, cache_url)
+            if entry:
+                kwargs["headers"] = {**kwargs.get("headers", {}), **http_cache.validators(entry)}
+        for _ in range(RATE_LIMIT_RETRIES):
+            try:
+                await github_rate_limit.acquire(
+                    self.budget_key, resource, priority=self.priority
+                )
+            except github_rate_limit.BudgetExhausted as e:
+                raise GitHubAccessError(429, str(e))
+            resp = await client.request(method, url, **kwargs)
+            if not _is_rate_limited(resp) and not (
+                resource == "graphql" and _graphql_rate_limited(resp)
+            ):
+                github_rate_limit.observe(self.budget_key, resp.headers, resource)
+                if cache:
+                    resp = await http_cache.resolve(self.budget_key, cache_url, entry, resp)
+                return resp
+            github_rate_limit.exhausted(self.budget_key, resource, resp.headers)
+            logger.warning(
+                f"GitHub {resource} rate limit hit on {url}; pausing until reset"
+            )
+        return resp
+
+    async def refresh_rate_limit(self) -> None:
+        """Read every budget of the token from GET /rate_limit into
+        github_rate_limit. GitHub doesn't charge this call, so it bypasses
+        `acquire` and works even when the budget is spent."""
+        async with http_pool.client(HOST) as client:
+            resp = await client.get(f"{BASE_URL}/rate_limit", headers=self.headers)
+        resp.raise_for_status()
+        github_rate_limit.observe_rate_limit(self.budget_key, resp.json())
+
     async def validate_token(self) -> bool:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(f"{BASE_URL}/user", headers=self.headers)
+        async with http_pool.client(HOST) as client:
+            resp = await self._request(
+                client, "GET", f"{BASE_URL}/user", headers=self.headers
+            )
             return resp.status_code == 200
 
     async def list_organizations(self) -> list[dict]:
         orgs: list[dict] = []
-        async with httpx.AsyncClient() as client:
+        async with http_pool.client(HOST) as client:
             page = 1
             while True:
-                resp = await client.get(
-                    f"{BASE_URL}/user/orgs",
+                resp = await self._request(
+                    client, "GET", f"{BASE_URL}/user/orgs", cache=True,
                     headers=self.headers,
                     params={"per_page": 100, "page": page},
                 )
@@ -128,7 +278,7 @@ class GitHubProvider:
 
     async def list_repositories(self) -> list[str]:
         repos: list[str] = []
-        async with httpx.AsyncClient() as client:
+        async with http_pool.client(HOST) as client:
             if self.org:
                 url = f"{BASE_URL}/orgs/{self.org}/repos"
             else:
@@ -136,8 +286,8 @@ class GitHubProvider:
 
             page = 1
             while True:
-                resp = await client.get(
-                    url,
+                resp = await self._request(
+                    client, "GET", url, cache=True,
                     headers=self.headers,
                     params={"per_page": 100, "page": page},
                 )
@@ -195,11 +345,11 @@ class GitHubProvider:
 
     async def list_branches(self, repo: str) -> list[str]:
         branches: list[str] = []
-        async with httpx.AsyncClient() as client:
+        async with http_pool.client(HOST) as client:
             page = 1
             while True:
-                resp = await client.get(
-                    f"{BASE_URL}/repos/{repo}/branches",
+                resp = await self._request(
+                    client, "GET", f"{BASE_URL}/repos/{repo}/branches", cache=True,
                     headers=self.headers,
                     params={"per_page": 100, "page": page},
                 )
@@ -219,8 +369,8 @@ class GitHubProvider:
     async def _graphql(
         self, client: httpx.AsyncClient, query: str, variables: dict
     ) -> dict:
-        resp = await client.post(
-            GRAPHQL_URL,
+        resp = await self._request(
+            client, "POST", GRAPHQL_URL, resource="graphql",
             headers={**self.headers, "Content-Type": "application/json"},
             json={"query": query, "variables": variables},
         )
@@ -242,11 +392,14 @@ class GitHubProvider:
             )
         resp.raise_for_status()
         payload = resp.json()
-        # GraphQL can also report exhaustion as a 200 with a RATE_LIMITED error.
+        github_rate_limit.observe_graphql(
+            self.budget_key, (payload.get("data") or {}).get("rateLimit")
+        )
+        # A RATE_LIMITED 200 that outlasted _request's retries.
         for err in payload.get("errors") or []:
             if err.get("type") == "RATE_LIMITED":
                 raise GitHubAccessError(
-                    403, f"GitHub GraphQL rate limited: {err.get('message')}"
+                    429, f"GitHub GraphQL rate limited: {err.get('message')}"
                 )
         return payload
 
@@ -254,8 +407,12 @@ class GitHubProvider:
         """Resolve the GraphQL node id for self.username once, so commit history
         can be filtered server-side by author. Falls back to None (client-side
         login matching) if it can't be resolved."""
-        if self._author_id is not _UNSET:
-            return self._author_id
+        async with self._author_lock:
+            if self._author_id is _UNSET:
+                await self._fetch_author_id(client)
+        return self._author_id
+
+    async def _fetch_author_id(self, client: httpx.AsyncClient) -> None:
         try:
             payload = await self._graphql(
                 client,
@@ -269,21 +426,73 @@ class GitHubProvider:
         except Exception as e:
             logger.warning(f"Could not resolve author id for {self.username}: {e}")
             self._author_id = None
-        return self._author_id
+
+    async def fetch_branch_heads(self, repos: list[str]) -> dict[str, dict[str, str]]:
+        """Head OID of every branch of `repos`: {repo: {branch: oid}}.
+
+        BRANCH_HEADS_BATCH repos per GraphQL query (one aliased `repository`
+        field each) instead of a paginated REST branch list per repo. A repo
+        missing from the result couldn't be read; callers fall back to a full
+        crawl for it.
+        """
+        heads: dict[str, dict[str, str]] = {}
+        async with http_pool.client(HOST) as client:
+            for i in range(0, len(repos), BRANCH_HEADS_BATCH):
+                batch = repos[i:i + BRANCH_HEADS_BATCH]
+                params, fields, variables = ["$cursor: String"], [], {"cursor": None}
+                for n, repo in enumerate(batch):
+                    owner, _, name = repo.partition("/")
+                    params.append(f"$o{n}: String!, $n{n}: String!")
+                    fields.append(f"r{n}: repository(owner: $o{n}, name: $n{n}) {{ {_REFS_FIELD} }}")
+                    variables.update({f"o{n}": owner, f"n{n}": name})
+                query = (
+                    f"query({', '.join(params)}) {{\n"
+                    "  rateLimit { cost remaining limit resetAt }\n  "
+                    + "\n  ".join(fields)
+                    + "\n}"
+                )
+                payload = await self._graphql(client, query, variables)
+                data = payload.get("data") or {}
+                for n, repo in enumerate(batch):
+                    refs = (data.get(f"r{n}") or {}).get("refs")
+                    if refs is None:
+                        continue
+                    heads[repo] = _ref_heads(refs)
+                    cursor = (refs.get("pageInfo") or {}).get("endCursor")
+                    more = (refs.get("pageInfo") or {}).get("hasNextPage")
+                    # Past the first 100 branches, page that one repo on its own.
+                    while more:
+                        owner, _, name = repo.partition("/")
+                        page = await self._graphql(
+                            client,
+                            BRANCH_HEADS_PAGE_QUERY,
+                            {"owner": owner, "name": name, "cursor": cursor},
+                        )
+                        refs = ((page.get("data") or {}).get("repository") or {}).get("refs") or {}
+                        heads[repo].update(_ref_heads(refs))
+                        cursor = (refs.get("pageInfo") or {}).get("endCursor")
+                        more = (refs.get("pageInfo") or {}).get("hasNextPage")
+        return heads
 
     async def fetch_commits(
-        self, repo: str, since: datetime | None = None
+        self,
+        repo: str,
+        since: datetime | None = None,
+        branches: list[str] | None = None,
     ) -> list[dict]:
+        """Commits by self.username on `branches` (default: every branch of
+        the repo, from the REST branch list) since `since`."""
         owner, _, name = repo.partition("/")
         commits: list[dict] = []
         seen: set[str] = set()
-        branches = await self.list_branches(repo)
-        if not branches:
-            branches = [""]
+        if branches is None:
+            branches = await self.list_branches(repo)
+            if not branches:
+                branches = [""]
 
         since_iso = since.isoformat() if since else None
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with http_pool.client(HOST) as client:
             author_id = await self._resolve_author_id(client)
             author_filter = {"id": author_id} if author_id else None
 
@@ -348,16 +557,21 @@ class GitHubProvider:
             "from": date_from.isoformat().replace("+00:00", "Z"),
             "to": date_to.isoformat().replace("+00:00", "Z"),
         }
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(
-                GRAPHQL_URL,
+        async with http_pool.client(HOST) as client:
+            resp = await self._request(
+                client, "POST", GRAPHQL_URL, resource="graphql",
                 headers={**self.headers, "Content-Type": "application/json"},
                 json={"query": USER_CONTRIBUTIONS_QUERY, "variables": variables},
             )
             resp.raise_for_status()
             payload = resp.json()
+        github_rate_limit.observe_graphql(
+            self.budget_key, (payload.get("data") or {}).get("rateLimit")
+        )
 
         if payload.get("errors"):
+            if any(err.get("type") == "RATE_LIMITED" for err in payload["errors"]):
+                raise GitHubAccessError(429, "GitHub GraphQL rate limited")
             raise RuntimeError(f"GitHub GraphQL error: {payload['errors']}")
 
         user_data = (payload.get("data") or {}).get("user")
@@ -443,18 +657,64 @@ class GitHubProvider:
             },
         }
 
+    async def search_pull_requests(
+        self, since: datetime | None = None, repos: list[str] | None = None
+    ) -> dict[str, list[dict]] | None:
+        """self.username's PRs updated since `since`, grouped by repo, from one
+        GraphQL search (scoped to self.org when set). Same dict shape as
+        fetch_pull_requests; repos outside `repos` are dropped.
+
+        Returns None when the search would be truncated at SEARCH_RESULT_CAP —
+        the caller then lists PRs per repo over REST instead.
+        """
+        q = f"author:{self.username} is:pr"
+        if since:
+            q += f" updated:>={since.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+        if self.org:
+            q += f" org:{self.org}"
+        wanted = set(repos) if repos is not None else None
+
+        by_repo: dict[str, list[dict]] = {}
+        cursor: str | None = None
+        async with http_pool.client(HOST) as client:
+            while True:
+                payload = await self._graphql(client, PR_SEARCH_QUERY, {"q": q, "cursor": cursor})
+                search = (payload.get("data") or {}).get("search")
+                if search is None:
+                    raise RuntimeError(f"GitHub PR search failed: {payload.get('errors')}")
+                if search.get("issueCount", 0) > SEARCH_RESULT_CAP:
+                    return None
+                for node in search.get("nodes") or []:
+                    repo = (node.get("repository") or {}).get("nameWithOwner")
+                    if not repo or (wanted is not None and repo not in wanted):
+                        continue
+                    by_repo.setdefault(repo, []).append({
+                        "number": node["number"],
+                        "title": node["title"],
+                        "status": _PR_STATUS.get(node.get("state"), "open"),
+                        "repository": repo,
+                        "url": node["url"],
+                        "created_at_remote": node["createdAt"],
+                        "merged_at": node.get("mergedAt"),
+                    })
+                page_info = search.get("pageInfo") or {}
+                if not page_info.get("hasNextPage"):
+                    break
+                cursor = page_info.get("endCursor")
+        return by_repo
+
     async def fetch_pull_requests(
         self, repo: str, since: datetime | None = None
     ) -> list[dict]:
         prs: list[dict] = []
         params: dict = {"state": "all", "per_page": 100, "sort": "updated", "direction": "desc"}
 
-        async with httpx.AsyncClient() as client:
+        async with http_pool.client(HOST) as client:
             page = 1
             while True:
                 params["page"] = page
-                resp = await client.get(
-                    f"{BASE_URL}/repos/{repo}/pulls",
+                resp = await self._request(
+                    client, "GET", f"{BASE_URL}/repos/{repo}/pulls", cache=True,
                     headers=self.headers,
                     params=params,
                 )
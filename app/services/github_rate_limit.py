@@ -0,0 +1,231 @@
+"""Process-wide GitHub rate-limit budget, per token and per resource.
+
+GitHub meters each token separately for REST ("core", 5000/h), GraphQL
+("graphql", 5000 points/h) and search. Every connection, sync, user-activity
+call and watcher that shares a PAT draws from the same budget, and the old
+code only noticed after the fact — a 403/429 — and gave up on the rest of the
+sync. Here every GitHubProvider request first `acquire`s from the budget and
+then reports what GitHub said (`observe` for the X-RateLimit-* headers,
+`observe_graphql` for the `rateLimit { cost remaining }` field), so:
+
+- a background caller (sync) stops GITHUB_RATE_LIMIT_RESERVE short of zero,
+  leaving that much for interactive calls like /user-activity;
+- a background caller that would overdraw waits for the reset instead of
+  failing, as long as that's within GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS; an
+  interactive one waits at most GITHUB_RATE_LIMIT_INTERACTIVE_MAX_WAIT_SECONDS
+  and then fails fast (429), since a request thread is held meanwhile;
+- the runner's watcher claims skip tokens that are paused (`is_paused`).
+
+Budgets are keyed by a SHA-256 of the token and live in this process only;
+calls made elsewhere with the same token (another API worker, the scheduler's
+sync workers, the host-side runner) show up the next time a response here
+carries fresh headers, or when GET /rate_limit is read (`observe_rate_limit`).
+"""
+import asyncio
+import hashlib
+import threading
+import time
+from datetime import datetime
+
+from app.core.config import settings
+
+BACKGROUND = "background"
+INTERACTIVE = "interactive"
+
+# {(token key, resource): budget}
+_budgets: dict[tuple[str, str], dict] = {}
+_lock = threading.Lock()
+
+
+class BudgetExhausted(Exception):
+    def __init__(self, resource: str, reset_at: float):
+        self.resource = resource
+        self.reset_at = reset_at
+        super().__init__(
+            f"GitHub {resource} budget exhausted until "
+            f"{datetime.utcfromtimestamp(reset_at).isoformat()}Z"
+        )
+
+
+def token_key(pat: str) -> str:
+    return hashlib.sha256(pat.encode()).hexdigest()
+
+
+def _floor(priority: str) -> int:
+    return settings.GITHUB_RATE_LIMIT_RESERVE if priority == BACKGROUND else 0
+
+
+def _max_wait(priority: str) -> int:
+    if priority == BACKGROUND:
+        return settings.GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS
+    return settings.GITHUB_RATE_LIMIT_INTERACTIVE_MAX_WAIT_SECONDS
+
+
+def _wait_for(budget: dict | None, cost: int, priority: str, now: float) -> float:
+    """Seconds to wait before spending `cost`; 0 when it fits (or nothing is known)."""
+    if budget is None or budget["remaining"] is None:
+        return 0.0
+    if budget["reset_at"] is not None and budget["reset_at"] <= now:
+        return 0.0  # window rolled over; the next response refreshes it
+    if budget["remaining"] - cost >= _floor(priority):
+        return 0.0
+    reset_at = budget["reset_at"] or now + 60
+    return max(reset_at - now, 0.0) + 1
+
+
+async def acquire(key: str, resource: str, cost: int = 1, priority: str = INTERACTIVE) -> None:
+    """Wait until `cost` fits in the budget, then reserve it.
+
+    The reservation is optimistic — the next response's headers overwrite it —
+    but it stops concurrent repos of one sync from all spending the last point.
+    Raises BudgetExhausted when the wait would exceed the priority's maximum.
+    """
+    while True:
+        now = time.time()
+        with _lock:
+            budget = _budgets.get((key, resource))
+            if budget is not None and budget["reset_at"] is not None and budget["reset_at"] <= now:
+                # Window over: assume it refilled until a response says otherwise.
+                budget["remaining"] = budget["limit"]
+                budget["reset_at"] = None
+            wait = _wait_for(budget, cost, priority, now)
+            if wait == 0:
+                if budget is not None and budget["remaining"] is not None:
+                    budget["remaining"] -= cost
+                return
+        if wait > _max_wait(priority):
+            raise BudgetExhausted(resource, now + wait)
+        with _lock:
+            budget["paused_until"] = now + wait
+        try:
+            await asyncio.sleep(wait)
+        finally:
+            with _lock:
+                budget["paused_until"] = None
+
+
+def _update(key: str, resource: str, **fields) -> None:
+    with _lock:
+        budget = _budgets.setdefault((key, resource), {
+            "resource": resource,
+            "limit": None,
+            "remaining": None,
+            "used": None,
+            "reset_at": None,
+            "last_cost": None,
+            "paused_until": None,
+        })
+        budget.update({k: v for k, v in fields.items() if v is not None})
+        budget["observed_at"] = time.time()
+
+
+def _int(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def observe(key: str, headers, default_resource: str = "core") -> None:
+    """Record the X-RateLimit-* headers of a GitHub response."""
+    remaining = _int(headers.get("X-RateLimit-Remaining"))
+    if remaining is None:
+        return
+    _update(
+        key,
+        headers.get("X-RateLimit-Resource") or default_resource,
+        limit=_int(headers.get("X-RateLimit-Limit")),
+        remaining=remaining,
+        used=_int(headers.get("X-RateLimit-Used")),
+        reset_at=_int(headers.get("X-RateLimit-Reset")),
+    )
+
+
+def observe_graphql(key: str, rate_limit: dict | None) -> None:
+    """Record a GraphQL `rateLimit { cost remaining limit resetAt }` block."""
+    if not rate_limit:
+        return
+    reset_at = None
+    if rate_limit.get("resetAt"):
+        reset_at = datetime.fromisoformat(rate_limit["resetAt"].replace("Z", "+00:00")).timestamp()
+    _update(
+        key,
+        "graphql",
+        limit=_int(rate_limit.get("limit")),
+        remaining=_int(rate_limit.get("remaining")),
+        reset_at=reset_at,
+        last_cost=_int(rate_limit.get("cost")),
+    )
+
+
+def observe_rate_limit(key: str, payload: dict) -> None:
+    """Record the body of GET /rate_limit: every resource's budget at once."""
+    for resource, budget in (payload.get("resources") or {}).items():
+        if not isinstance(budget, dict) or _int(budget.get("remaining")) is None:
+            continue
+        _update(
+            key,
+            resource,
+            limit=_int(budget.get("limit")),
+            remaining=_int(budget.get("remaining")),
+            used=_int(budget.get("used")),
+            reset_at=_int(budget.get("reset")),
+        )
+
+
+def exhausted(key: str, resource: str, headers) -> None:
+    """A rate-limit response (403/429, or a GraphQL RATE_LIMITED 200): nothing
+    left until the reset (or for Retry-After seconds on a secondary limit)."""
+    retry_after = _int(headers.get("Retry-After"))
+    reset_at = _int(headers.get("X-RateLimit-Reset"))
+    if retry_after is not None:
+        reset_at = int(time.time()) + retry_after
+    _update(
+        key,
+        headers.get("X-RateLimit-Resource") or resource,
+        remaining=0,
+        reset_at=reset_at or int(time.time()) + 60,
+    )
+
+
+def any_paused(priority: str = BACKGROUND) -> bool:
+    now = time.time()
+    with _lock:
+        return any(_wait_for(b, 1, priority, now) > 0 for b in _budgets.values())
+
+
+def is_paused(key: str, priority: str = BACKGROUND) -> bool:
+    """True when any resource of this token has no room for a `priority` call."""
+    now = time.time()
+    with _lock:
+        return any(
+            _wait_for(budget, 1, priority, now) > 0
+            for (k, _), budget in _budgets.items()
+            if k == key
+        )
+
+
+def last_observed(key: str) -> float | None:
+    """When anything about this token's budget was last recorded here (epoch
+    seconds), or None if never."""
+    with _lock:
+        times = [b["observed_at"] for (k, _), b in _budgets.items() if k == key]
+    return max(times, default=None)
+
+
+def snapshot(key: str) -> list[dict]:
+    """Current budgets of one token, for GET /productivity/connections/{id}/rate-limit."""
+    now = time.time()
+    with _lock:
+        budgets = [dict(b) for (k, _), b in _budgets.items() if k == key]
+    for budget in budgets:
+        budget["paused"] = _wait_for(budget, 1, BACKGROUND, now) > 0
+        for field in ("reset_at", "paused_until", "observed_at"):
+            if budget.get(field) is not None:
+                budget[field] = datetime.utcfromtimestamp(budget[field])
+    return sorted(budgets, key=lambda b: b["resource"])
+
+
+def clear() -> None:
+    with _lock:
+        _budgets.clear()
@@ -0,0 +1,156 @@
+"""Conditional-request cache for provider REST GETs (ETag / Last-Modified).
+
+List endpoints (branches, repos, orgs, pull requests) used to be downloaded in
+full on every sync even when nothing changed. Now the last 200 of each such
+GET is kept in `http_validator_cache` with its validators; the next request
+sends If-None-Match / If-Modified-Since and a 304 is answered from the stored
+body. GitHub doesn't count 304s against the rate limit, so an incremental sync
+of an idle repo costs next to nothing.
+
+Entries are keyed by the token identity (`github_rate_limit.token_key`) plus
+the full URL, so tokens with different access never share a response. Bodies
+that match the org blocklist are never stored (the DB trigger only sees text
+columns, not the raw body). Every DB touch runs in a worker thread on its own
+session: the callers are coroutines on the shared HTTP pool loop.
+"""
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.org_blocklist import ORG_RE
+from app.models.http_validator_cache import HttpValidatorCache
+
+logger = logging.getLogger(__name__)
+
+# Response headers a provider reads back from a replayed 304.
+_KEPT_HEADERS = ("content-type", "link")
+
+
+def cache_key(token_key: str, url: str) -> str:
+    return hashlib.sha256(f"{token_key} GET {url}".encode()).hexdigest()
+
+
+def full_url(url: str, params: dict | None) -> str:
+    return str(httpx.URL(url, params=params))
+
+
+def _load(key: str) -> dict | None:
+    db = SessionLocal()
+    try:
+        entry = db.get(HttpValidatorCache, key)
+        if entry is None:
+            return None
+        return {
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "status_code": entry.status_code,
+            "headers": dict(entry.headers or {}),
+            "body": entry.body,
+        }
+    finally:
+        db.close()
+
+
+def _store(key: str, url: str, resp: httpx.Response) -> None:
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        db.merge(HttpValidatorCache(
+            cache_key=key,
+            url=url,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+            status_code=resp.status_code,
+            headers={h: resp.headers[h] for h in _KEPT_HEADERS if h in resp.headers},
+            body=resp.content,
+            updated_at=now,
+            last_used_at=now,
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _touch(key: str) -> None:
+    db = SessionLocal()
+    try:
+        entry = db.get(HttpValidatorCache, key)
+        if entry is not None:
+            entry.last_used_at = datetime.utcnow()
+            db.commit()
+    finally:
+        db.close()
+
+
+async def lookup(token_key: str, url: str) -> dict | None:
+    """The stored entry for this token+URL, or None (also when disabled)."""
+    if not settings.HTTP_CACHE_ENABLED:
+        return None
+    try:
+        return await asyncio.to_thread(_load, cache_key(token_key, url))
+    except Exception as e:
+        logger.warning(f"HTTP cache lookup failed for {url}: {e}")
+        return None
+
+
+def validators(entry: dict | None) -> dict:
+    """Conditional-request headers to send for a cached entry."""
+    if not entry:
+        return {}
+    headers = {}
+    if entry["etag"]:
+        headers["If-None-Match"] = entry["etag"]
+    if entry["last_modified"]:
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+async def resolve(
+    token_key: str, url: str, entry: dict | None, resp: httpx.Response
+) -> httpx.Response:
+    """Turn a 304 into the cached response; remember a cacheable 200.
+
+    Cache failures are logged and otherwise ignored — the request itself
+    already succeeded.
+    """
+    key = cache_key(token_key, url)
+    try:
+        if resp.status_code == 304 and entry is not None:
+            await asyncio.to_thread(_touch, key)
+            return httpx.Response(
+                entry["status_code"],
+                headers=entry["headers"],
+                content=entry["body"],
+                request=resp.request,
+            )
+        if (
+            settings.HTTP_CACHE_ENABLED
+            and resp.status_code == 200
+            and ("ETag" in resp.headers or "Last-Modified" in resp.headers)
+            and len(resp.content) <= settings.HTTP_CACHE_MAX_BODY_BYTES
+            and not ORG_RE.search(resp.content.decode("utf-8", "replace"))
+        ):
+            await asyncio.to_thread(_store, key, url, resp)
+    except Exception as e:
+        logger.warning(f"HTTP cache update failed for {url}: {e}")
+    return resp
+
+
+def prune(db: Session) -> int:
+    """Delete entries nobody has read in HTTP_CACHE_MAX_AGE_DAYS (a repo that
+    was deselected, a deleted connection); returns how many. Run by the
+    scheduler every cycle."""
+    cutoff = datetime.utcnow() - timedelta(days=settings.HTTP_CACHE_MAX_AGE_DAYS)
+    deleted = (
+        db.query(HttpValidatorCache)
+        .filter(HttpValidatorCache.last_used_at < cutoff)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
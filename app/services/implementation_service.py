@@ -9,8 +9,9 @@ from datetime import datetime
 from uuid import UUID
 
 from sqlalchemy import select
-from sqlalchemy.orm import Session, lazyload
+from sqlalchemy.orm import Session, lazyload, selectinload
 
+from app.core.pagination import Page, paginate
 from app.models.implementation_run import ImplementationRun
 from app.models.implementation_step import ImplementationStep
 from app.services import connection_registry
@@ -180,13 +181,13 @@ def get_run(db: Session, run_id: UUID) -> ImplementationRun | None:
     return db.query(ImplementationRun).filter(ImplementationRun.id == run_id).first()
 
 
-def list_runs(db: Session, user_id: UUID) -> list[ImplementationRun]:
-    return (
+def list_runs(db: Session, user_id: UUID, page: Page | None = None) -> list[ImplementationRun]:
+    query = (
         db.query(ImplementationRun)
+        .options(selectinload(ImplementationRun.steps))
         .filter(ImplementationRun.created_by_user_id == user_id)
-        .order_by(ImplementationRun.created_at.desc())
-        .all()
     )
+    return paginate(query, page, ImplementationRun.created_at.desc())
 
 
 def approve_step(db: Session, run: ImplementationRun, step_id: UUID) -> ImplementationRun:
@@ -0,0 +1,220 @@
+"""Ingestion of the shell hook's NDJSON commit log (POST /productivity/local-commits/flush).
+
+A hook flushing a backlog sends thousands of lines at once. They used to be
+read into memory whole and stored one SELECT + INSERT + COMMIT per line; now
+`ndjson_lines` splits the body as it streams in (inflating gzip bodies in
+bounded steps) and `store` writes each chunk of rows with one multi-row
+INSERT ... ON CONFLICT (hash, remote_url) DO NOTHING RETURNING, so duplicates
+cost nothing and are still counted exactly.
+
+The rows that RETURNING reports as new are also added, in the same
+transaction, to the `local_commit_daily` rollup (per lowercased email,
+normalized remote and UTC day) that GET /local-commits/by-repo reads.
+
+`store` never commits: the endpoint keeps the whole flush in one transaction
+and commits at the end, so a body rejected halfway (451, corrupt gzip)
+leaves nothing of it behind.
+"""
+import re
+import zlib
+from collections.abc import AsyncIterator, Iterator
+from datetime import date, datetime, timezone
+
+from sqlalchemy import case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.local_commit import LocalCommit
+from app.models.local_commit_daily import LocalCommitDaily
+
+_SSH_REMOTE = re.compile(r"^[^@]+@[^:]+:([^/]+)/(.+)$")
+_PROTO_REMOTE = re.compile(r"^[a-z]+://[^/]+/(.+)$")
+
+# Decompressed bytes produced per inflate step, so a small gzip body that
+# expands hugely is never held in memory at once.
+_INFLATE_STEP = 64 * 1024
+
+
+class InvalidBody(Exception):
+    """The body isn't valid for its Content-Encoding (corrupt or truncated gzip)."""
+
+
+def _inflate(inflater, data: bytes) -> Iterator[bytes]:
+    out = inflater.decompress(data, _INFLATE_STEP)
+    while True:
+        yield out
+        if not inflater.unconsumed_tail:
+            return
+        out = inflater.decompress(inflater.unconsumed_tail, _INFLATE_STEP)
+
+
+async def ndjson_lines(chunks: AsyncIterator[bytes], gzipped: bool = False) -> AsyncIterator[bytes | None]:
+    """Lines of a (possibly gzip-encoded) body, yielded as soon as they are
+    complete. A line longer than LOCAL_COMMITS_MAX_LINE_BYTES is dropped as it
+    streams and stands as None, so the caller can still count and report it."""
+    limit = settings.LOCAL_COMMITS_MAX_LINE_BYTES
+    inflater = zlib.decompressobj(zlib.MAX_WBITS | 16) if gzipped else None
+    buf = b""
+    oversized = False
+
+    def split(piece: bytes) -> Iterator[bytes | None]:
+        nonlocal buf, oversized
+        buf += piece
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            if oversized or len(line) > limit:
+                oversized = False
+                yield None
+            else:
+                yield line
+        if len(buf) > limit:
+            oversized, buf = True, b""
+
+    try:
+        async for chunk in chunks:
+            for piece in _inflate(inflater, chunk) if inflater else (chunk,):
+                for line in split(piece):
+                    yield line
+        if inflater:
+            for line in split(inflater.flush()):
+                yield line
+            if not inflater.eof:
+                raise InvalidBody("truncated gzip body")
+    except zlib.error as e:
+        raise InvalidBody(f"invalid gzip body ({e})") from e
+
+    if oversized:
+        yield None
+    elif buf.strip():
+        yield buf
+
+
+def normalize_remote(remote: str, fallback_repo_name: str) -> str:
+    """"owner/repo" for SSH and HTTPS remotes alike; "(local) <repo>" without one."""
+    if not remote:
+        return f"(local) {fallback_repo_name}" if fallback_repo_name else "(local)"
+    s = remote.strip().rstrip("/")
+    if s.endswith(".git"):
+        s = s[:-4]
+    m = _SSH_REMOTE.match(s)
+    if m:
+        return f"{m.group(1)}/{m.group(2)}"
+    m = _PROTO_REMOTE.match(s)
+    if m:
+        parts = m.group(1).split("/")
+        if len(parts) >= 2:
+            return f"{parts[-2]}/{parts[-1]}"
+        return m.group(1)
+    return s
+
+
+def row_from_payload(data: dict) -> dict:
+    """One NDJSON record as a local_commits row; raises on a malformed record."""
+    h = data["hash"]
+    try:
+        committed_at = datetime.fromisoformat(data["timestamp"])
+    except (ValueError, KeyError, TypeError):
+        committed_at = datetime.now(timezone.utc)
+    return {
+        "hash": h,
+        "short_hash": h[:7],
+        "message": data.get("message") or "",
+        "author": data.get("author") or "",
+        "email": data.get("email") or "",
+        "committed_at": committed_at,
+        "branch": data.get("branch") or "",
+        "additions": int(data.get("additions") or 0),
+        "deletions": int(data.get("deletions") or 0),
+        "repo_name": data.get("repo") or "",
+        "remote_url": data.get("remote") or "",
+        "remote_key": normalize_remote(data.get("remote") or "", data.get("repo") or ""),
+        "source": data.get("source") or "qwe",
+    }
+
+
+def _utc(ts: datetime) -> datetime:
+    # Postgres reads an offset-less timestamp in the session time zone, UTC here.
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts.astimezone(timezone.utc)
+
+
+def _roll_up(db: Session, inserted: list[dict]) -> None:
+    """Add newly inserted commit rows to their local_commit_daily rows."""
+    buckets: dict[tuple[str, str, date], dict] = {}
+    for c in inserted:
+        committed_at = _utc(c["committed_at"])
+        key = (c["email"].lower(), c["remote_key"], committed_at.date())
+        b = buckets.setdefault(key, {
+            "email": key[0],
+            "remote_key": key[1],
+            "day": key[2],
+            "commits": 0,
+            "additions": 0,
+            "deletions": 0,
+            "last_commit": committed_at,
+            "remote_url": c["remote_url"],
+            "repo_name": c["repo_name"],
+        })
+        b["commits"] += 1
+        b["additions"] += c["additions"]
+        b["deletions"] += c["deletions"]
+        b["last_commit"] = max(b["last_commit"], committed_at)
+    if not buckets:
+        return
+    table = LocalCommitDaily.__table__
+    stmt = pg_insert(LocalCommitDaily).values(list(buckets.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["email", "remote_key", "day"],
+        set_={
+            "commits": table.c.commits + stmt.excluded.commits,
+            "additions": table.c.additions + stmt.excluded.additions,
+            "deletions": table.c.deletions + stmt.excluded.deletions,
+            "last_commit": case(
+                (stmt.excluded.last_commit > table.c.last_commit, stmt.excluded.last_commit),
+                else_=table.c.last_commit,
+            ),
+        },
+    )
+    db.execute(stmt)
+
+
+def _insert(db: Session, rows: list[dict]) -> int:
+    stmt = (
+        pg_insert(LocalCommit)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=["hash", "remote_url"])
+        .returning(LocalCommit.hash, LocalCommit.remote_url)
+    )
+    by_key = {(r["hash"], r["remote_url"]): r for r in rows}
+    inserted = [by_key[tuple(key)] for key in db.execute(stmt).all()]
+    _roll_up(db, inserted)
+    return len(inserted)
+
+
+def store(db: Session, numbered_rows: list[tuple[int, dict]]) -> tuple[int, list[str]]:
+    """Insert a chunk of (line number, row) in the session's transaction,
+    without committing; returns (rows stored, errors).
+
+    Rows already present (or repeated within the chunk) are skipped by the
+    ON CONFLICT, so `len(numbered_rows) - stored - len(errors)` is the exact
+    duplicate count. If the chunk as a whole is rejected (a value the database
+    refuses), its savepoint is rolled back and it is retried row by row so
+    only the offending lines fail.
+    """
+    if not numbered_rows:
+        return 0, []
+    try:
+        with db.begin_nested():
+            return _insert(db, [row for _, row in numbered_rows]), []
+    except Exception:
+        pass
+
+    stored = 0
+    errors: list[str] = []
+    for line_no, row in numbered_rows:
+        try:
+            with db.begin_nested():
+                stored += _insert(db, [row])
+        except Exception as e:
+            errors.append(f"line {line_no}: {e}")
+    return stored, errors
@@ -17,7 +17,7 @@ from datetime import date, datetime, timedelta
 from uuid import UUID
 
 from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from app.models.address_pr_run import AddressPrRun
 from app.models.automation_run import AutomationRun
@@ -255,7 +255,12 @@ def _awaiting_approval_items(db: Session) -> list[dict]:
             )
         )
 
-    for run in db.query(AutomationRun).filter(AutomationRun.status == "awaiting_approval").all():
+    for run in (
+        db.query(AutomationRun)
+        .options(joinedload(AutomationRun.automation))
+        .filter(AutomationRun.status == "awaiting_approval")
+        .all()
+    ):
         automation = run.automation
         items.append(
             _awaiting_item(
@@ -0,0 +1,137 @@
+"""Daily per-repository rollup of synced commits and PRs (`productivity_daily`).
+
+GET /connections/{id}/stats and GET /stats used to count and sum the raw
+productivity_commits / productivity_pull_requests rows on every view. Sync now
+adds each newly inserted row to its (connection, repository, day) rollup row in
+the same transaction (`add_commits`, `add_pull_requests`), and the endpoints
+sum at most one row per repo and day.
+
+Rows are only ever added by sync (commits are insert-only, and a PR upsert
+never changes its repository or creation date), so counting inserts keeps the
+rollup exact. `rebuild` recomputes it from the raw tables for backfills:
+`python -m app.services.productivity_rollup [--connection ID]`.
+"""
+from collections.abc import Iterable
+from datetime import date, datetime
+from uuid import UUID
+
+from sqlalchemy import func, insert, literal, select, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.productivity_commit import ProductivityCommit
+from app.models.productivity_connection import ProductivityConnection
+from app.models.productivity_daily import ProductivityDaily
+from app.models.productivity_pull_request import ProductivityPullRequest
+
+_COUNTS = ("commits", "additions", "deletions", "prs")
+
+
+def _bucket(buckets: dict, connection_id: UUID, repository: str, day: date) -> dict:
+    return buckets.setdefault((repository, day), {
+        "connection_id": connection_id,
+        "repository": repository,
+        "day": day,
+        **dict.fromkeys(_COUNTS, 0),
+    })
+
+
+def _upsert(db: Session, buckets: dict) -> None:
+    if not buckets:
+        return
+    table = ProductivityDaily.__table__
+    stmt = pg_insert(ProductivityDaily).values(list(buckets.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["connection_id", "repository", "day"],
+        set_={name: table.c[name] + stmt.excluded[name] for name in _COUNTS},
+    )
+    db.execute(stmt)
+
+
+def add_commits(db: Session, connection_id: UUID, inserted: Iterable) -> None:
+    """Add newly inserted commits, as (repository, date, additions, deletions,
+    is_merge) rows with `date` as stored, to the rollup. Merges are skipped."""
+    buckets: dict = {}
+    for repository, committed, additions, deletions, is_merge in inserted:
+        if is_merge:
+            continue
+        b = _bucket(buckets, connection_id, repository, committed.date())
+        b["commits"] += 1
+        b["additions"] += additions or 0
+        b["deletions"] += deletions or 0
+    _upsert(db, buckets)
+
+
+def add_pull_requests(db: Session, connection_id: UUID, created: Iterable[tuple[str, datetime]]) -> None:
+    """Add newly inserted PRs, as (repository, created_at_remote) rows with the
+    timestamp as stored, to the rollup."""
+    buckets: dict = {}
+    for repository, created_at in created:
+        _bucket(buckets, connection_id, repository, created_at.date())["prs"] += 1
+    _upsert(db, buckets)
+
+
+def rebuild(db: Session, connection_id: UUID) -> int:
+    """Recompute the connection's rollup from its raw rows (not committed);
+    returns how many rollup rows it now has."""
+    db.query(ProductivityDaily).filter(
+        ProductivityDaily.connection_id == connection_id
+    ).delete(synchronize_session=False)
+
+    c, p = ProductivityCommit, ProductivityPullRequest
+    commits = (
+        select(
+            c.repository, func.date(c.date).label("day"),
+            func.count().label("commits"),
+            func.sum(c.additions).label("additions"),
+            func.sum(c.deletions).label("deletions"),
+            literal(0).label("prs"),
+        )
+        .where(c.connection_id == connection_id, c.is_merge.is_(False))
+        .group_by(c.repository, func.date(c.date))
+    )
+    prs = (
+        select(
+            p.repository, func.date(p.created_at_remote).label("day"),
+            literal(0), literal(0), literal(0),
+            func.count().label("prs"),
+        )
+        .where(p.connection_id == connection_id)
+        .group_by(p.repository, func.date(p.created_at_remote))
+    )
+    both = union_all(commits, prs).subquery()
+    totals = select(
+        literal(connection_id, ProductivityDaily.connection_id.type),
+        both.c.repository, both.c.day,
+        *(func.sum(both.c[name]) for name in _COUNTS),
+    ).group_by(both.c.repository, both.c.day)
+    result = db.execute(
+        insert(ProductivityDaily).from_select(
+            ["connection_id", "repository", "day", *_COUNTS], totals
+        )
+    )
+    return result.rowcount
+
+
+if __name__ == "__main__":
+    # Backfill step: `python -m app.services.productivity_rollup [--connection ID]`.
+    import argparse
+
+    import app.models  # noqa: F401  (resolve every relationship)
+    from app.core.db import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Rebuild the daily productivity rollup.")
+    parser.add_argument("--connection", type=UUID, help="only this connection (default: all)")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        ids = [args.connection] if args.connection else [
+            row[0] for row in session.query(ProductivityConnection.id).all()
+        ]
+        for conn_id in ids:
+            rows = rebuild(session, conn_id)
+            session.commit()  # one transaction per connection
+            print(f"{conn_id}: {rows} rollup rows")
+    finally:
+        session.close()
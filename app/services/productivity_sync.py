@@ -1,16 +1,20 @@
 import asyncio
 import logging
-import threading
+from collections.abc import Iterator
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
+from sqlalchemy import tuple_
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
+from app.core import http_pool
+from app.core.config import settings
 from app.core.encryption import decrypt_value
 from app.models.productivity_commit import ProductivityCommit
 from app.models.productivity_connection import ProductivityConnection
 from app.models.productivity_pull_request import ProductivityPullRequest
+from app.services import github_rate_limit, productivity_rollup, sync_progress
 from app.services.bitbucket_provider import BitbucketProvider
 from app.services.github_provider import GitHubAccessError, GitHubProvider
 
@@ -21,31 +25,6 @@ logger = logging.getLogger(__name__)
 # 20+ minutes. Subsequent syncs use the connection's last_synced_at.
 DEFAULT_BACKFILL_DAYS = 7
 
-# Process-local guard against stampedes when the same connection is synced
-# concurrently (e.g. user double-clicks Sync). Worker-local — fine for the
-# single-uvicorn-worker setup; if we ever scale horizontally this needs to
-# move to Postgres advisory locks.
-_in_flight: set[UUID] = set()
-_in_flight_lock = threading.Lock()
-
-
-def is_sync_in_flight(connection_id: UUID) -> bool:
-    with _in_flight_lock:
-        return connection_id in _in_flight
-
-
-def _claim_sync(connection_id: UUID) -> bool:
-    with _in_flight_lock:
-        if connection_id in _in_flight:
-            return False
-        _in_flight.add(connection_id)
-        return True
-
-
-def _release_sync(connection_id: UUID) -> None:
-    with _in_flight_lock:
-        _in_flight.discard(connection_id)
-
 
 def _get_provider(connection: ProductivityConnection):
     pat = decrypt_value(connection.pat_encrypted)
@@ -55,6 +34,7 @@ def _get_provider(connection: ProductivityConnection):
             pat=pat,
             username=connection.username,
             org=connection.workspace,
+            priority=github_rate_limit.BACKGROUND,
         )
     elif connection.provider == "bitbucket":
         return BitbucketProvider(
@@ -67,30 +47,233 @@ def _get_provider(connection: ProductivityConnection):
         raise ValueError(f"Unknown provider: {connection.provider}")
 
 
+def _stored_diffstats(
+    db: Session, connection_id: UUID, repo: str, since: datetime
+) -> dict[str, dict]:
+    """{hash: {"additions", "deletions"}} of this repo's commits already stored
+    from `since` on, so a resync doesn't ask Bitbucket for their diffstats again."""
+    rows = (
+        db.query(ProductivityCommit.hash, ProductivityCommit.additions, ProductivityCommit.deletions)
+        .filter(
+            ProductivityCommit.connection_id == connection_id,
+            ProductivityCommit.repository == repo,
+            # `date` is naive UTC; a day of slack covers non-UTC offsets.
+            ProductivityCommit.date >= since.replace(tzinfo=None) - timedelta(days=1),
+        )
+        .all()
+    )
+    return {h: {"additions": a, "deletions": d} for h, a, d in rows}
+
+
+def _parse_ts(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _chunks(rows: list[dict]) -> Iterator[list[dict]]:
+    size = max(1, settings.SYNC_UPSERT_CHUNK_SIZE)
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def _store_commits(db: Session, connection_id: UUID, commits_data: list[dict]) -> int:
+    """Insert new commits, skipping ones already stored; returns how many were new.
+
+    One multi-row INSERT per chunk instead of one per commit. RETURNING only
+    yields the rows that were actually inserted, so the count stays exact, and
+    exactly those rows are added to the daily rollup.
+    """
+    rows = [
+        {
+            "connection_id": connection_id,
+            "hash": c["hash"],
+            "short_hash": c["short_hash"],
+            "message": c["message"],
+            "author": c["author"],
+            "date": c["date"],
+            "additions": c["additions"],
+            "deletions": c["deletions"],
+            "repository": c["repository"],
+            "is_merge": c.get("is_merge", False),
+        }
+        for c in commits_data
+    ]
+    inserted = 0
+    for chunk in _chunks(rows):
+        stmt = (
+            pg_insert(ProductivityCommit)
+            .values(chunk)
+            .on_conflict_do_nothing(index_elements=["connection_id", "hash", "repository"])
+            .returning(
+                ProductivityCommit.repository,
+                ProductivityCommit.date,
+                ProductivityCommit.additions,
+                ProductivityCommit.deletions,
+                ProductivityCommit.is_merge,
+            )
+        )
+        new_rows = db.execute(stmt).all()
+        productivity_rollup.add_commits(db, connection_id, new_rows)
+        inserted += len(new_rows)
+    return inserted
+
+
+def _store_pull_requests(db: Session, connection_id: UUID, prs_data: list[dict]) -> int:
+    """Upsert PRs (status/title/merged_at refresh on conflict); returns rows written."""
+    # ON CONFLICT DO UPDATE can't touch the same row twice in one statement, so
+    # keep only the last copy of a PR the provider returned more than once.
+    latest = {
+        (pr["repository"], pr["number"]): {
+            "connection_id": connection_id,
+            "number": pr["number"],
+            "title": pr["title"],
+            "status": pr["status"],
+            "repository": pr["repository"],
+            "url": pr["url"],
+            "created_at_remote": pr["created_at_remote"],
+            "merged_at": pr.get("merged_at"),
+        }
+        for pr in prs_data
+    }
+    upserted = 0
+    for chunk in _chunks(list(latest.values())):
+        # Only PRs not stored yet count towards the daily rollup; syncs of a
+        # connection never overlap, so nothing can insert them in between.
+        known = set(
+            db.query(ProductivityPullRequest.repository, ProductivityPullRequest.number)
+            .filter(
+                ProductivityPullRequest.connection_id == connection_id,
+                tuple_(ProductivityPullRequest.repository, ProductivityPullRequest.number).in_(
+                    [(pr["repository"], pr["number"]) for pr in chunk]
+                ),
+            )
+            .all()
+        )
+        stmt = pg_insert(ProductivityPullRequest).values(chunk)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["connection_id", "number", "repository"],
+            set_={
+                "status": stmt.excluded.status,
+                "title": stmt.excluded.title,
+                "merged_at": stmt.excluded.merged_at,
+            },
+        ).returning(
+            ProductivityPullRequest.repository,
+            ProductivityPullRequest.number,
+            ProductivityPullRequest.created_at_remote,
+        )
+        written = db.execute(stmt).all()
+        productivity_rollup.add_pull_requests(
+            db, connection_id,
+            [(repo, created) for repo, number, created in written if (repo, number) not in known],
+        )
+        upserted += len(written)
+    return upserted
+
+
+def _rate_limit_left(provider) -> dict[str, int] | None:
+    """{resource: requests left} of a GitHub token, for progress events."""
+    if not isinstance(provider, GitHubProvider):
+        return None
+    return {
+        b["resource"]: b["remaining"]
+        for b in github_rate_limit.snapshot(provider.budget_key)
+        if b["remaining"] is not None
+    }
+
+
 def sync_connection(connection_id: UUID, db: Session) -> dict:
-    connection = db.query(ProductivityConnection).filter(
-        ProductivityConnection.id == connection_id
-    ).first()
+    # The whole sync is one coroutine on the shared HTTP pool loop, so every
+    # repo and page reuses the same keep-alive connections. The caller's thread
+    # just waits; the session is only touched on the coroutine's behalf, from
+    # worker threads, meanwhile.
+    try:
+        result = http_pool.run(_sync_connection(connection_id, db))
+    except Exception as e:
+        sync_progress.publish(connection_id, "sync_finished", status="error", error=str(e)[:1000])
+        raise
+    sync_progress.publish(
+        connection_id, "sync_finished",
+        status="error" if result["errors"] else "success",
+        commits_synced=result["commits_synced"],
+        prs_synced=result["prs_synced"],
+        errors=len(result["errors"]),
+    )
+    return result
+
+
+async def _sync_connection(connection_id: UUID, db: Session) -> dict:
+    # Every DB touch runs in a worker thread, never on the pool loop itself:
+    # blocking psycopg2 I/O there would stall every other sync and provider
+    # call in the process, and a pool checkout could wait on request threads
+    # that hold connections while they wait for this loop. db_lock keeps the
+    # session to one thread at a time.
+    db_lock = asyncio.Lock()
+
+    async def _db(fn, *args, **kwargs):
+        async with db_lock:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def _publish(event: str, **fields) -> None:
+        await asyncio.to_thread(sync_progress.publish, connection_id, event, **fields)
+
+    connection = await _db(
+        lambda: db.query(ProductivityConnection)
+        .filter(ProductivityConnection.id == connection_id)
+        .first()
+    )
 
     if not connection:
         raise ValueError("Connection not found")
 
+    # Read up front: after a commit the instance is expired, and reloading an
+    # attribute would run a query on this loop.
+    selected_repos = connection.selected_repos
+    watermarks = dict(connection.repo_synced_at or {})
+    stored_heads = dict(connection.branch_heads or {})
+    conn_last_synced = connection.last_synced_at
+
+    def _save(**fields) -> None:
+        for name, value in fields.items():
+            setattr(connection, name, value)
+        db.commit()
+
+    def _record_outcome(errors: list[str]) -> None:
+        connection.last_sync_attempted_at = datetime.utcnow()
+        if errors:
+            connection.last_sync_status = "error"
+            connection.last_sync_error = "; ".join(errors)
+            connection.sync_failures = (connection.sync_failures or 0) + 1
+        else:
+            connection.last_synced_at = connection.last_sync_attempted_at
+            connection.last_sync_status = "success"
+            connection.last_sync_error = None
+            connection.sync_failures = 0
+        db.commit()
+
+    def _store(store_fn, rows: list[dict]) -> int:
+        try:
+            stored = store_fn(db, connection_id, rows)
+            db.commit()
+            return stored
+        except Exception:
+            db.rollback()
+            raise
+
     provider = _get_provider(connection)
 
     errors: list[str] = []
 
     if connection.provider == "bitbucket" and not connection.external_account_id:
         try:
-            info = asyncio.run(provider.get_current_user())
+            info = await provider.get_current_user()
         except Exception as e:
             logger.warning(
                 f"Bitbucket /user lookup failed for connection {connection_id}: {e}"
             )
             info = None
         if info and info.get("account_id"):
-            connection.external_account_id = info["account_id"]
             provider.external_account_id = info["account_id"]
-            db.commit()
+            await _db(_save, external_account_id=info["account_id"])
         else:
             # Without account_id, _is_self_author falls back to matching
             # nickname/username/display_name against `connection.username` —
@@ -118,23 +301,22 @@ def sync_connection(connection_id: UUID, db: Session) -> dict:
     # every remaining repo.
     abort_reason: str | None = None
 
-    if connection.selected_repos:
-        repos = connection.selected_repos
+    if selected_repos:
+        repos = selected_repos
     else:
         try:
-            repos = asyncio.run(provider.list_repositories())
+            repos = await provider.list_repositories()
         except Exception as e:
             logger.error(f"Failed to list repos for connection {connection_id}: {e}")
             error_msg = f"Failed to list repositories: {str(e)}"
-            connection.last_sync_attempted_at = datetime.utcnow()
-            connection.last_sync_status = "error"
-            connection.last_sync_error = error_msg
-            db.commit()
+            await _db(_record_outcome, [error_msg])
             return {
                 "connection_id": connection_id,
                 "status": "completed",
                 "commits_synced": 0,
                 "prs_synced": 0,
+                "branches_crawled": 0,
+                "branches_skipped": 0,
                 "errors": [error_msg],
             }
 
@@ -142,15 +324,13 @@ def sync_connection(connection_id: UUID, db: Session) -> dict:
     # and no commits in the DB) gets a bounded backfill, so a repo added long
     # after the connection still picks up its recent history instead of being
     # silently bounded to the connection's last_synced_at.
-    watermarks = dict(connection.repo_synced_at or {})
-    existing_repos = {
+    existing_repos = await _db(lambda: {
         row[0]
         for row in db.query(ProductivityCommit.repository)
         .filter(ProductivityCommit.connection_id == connection_id)
         .distinct()
         .all()
-    }
-    conn_last_synced = connection.last_synced_at
+    })
     if conn_last_synced and conn_last_synced.tzinfo is None:
         conn_last_synced = conn_last_synced.replace(tzinfo=timezone.utc)
 
@@ -170,114 +350,174 @@ def sync_connection(connection_id: UUID, db: Session) -> dict:
         )
         return datetime.now(timezone.utc) - timedelta(days=DEFAULT_BACKFILL_DAYS)
 
-    for repo in repos:
-        if abort_reason:
-            errors.append(f"Skipped {repo}: {abort_reason}")
-            continue
-
-        since = _since_for(repo)
-        repo_errored = False
+    since_by_repo = {repo: _since_for(repo) for repo in repos}
+    repos_done = 0
+    await _publish("sync_started", repos_total=len(repos))
 
+    # GitHub: the user's PRs across every repo from one search, fanned out per
+    # repo below. None (search failed or would be truncated) means each repo
+    # lists its PRs over REST as before.
+    prs_by_repo: dict[str, list[dict]] | None = None
+    if isinstance(provider, GitHubProvider) and repos:
         try:
-            commits_data = asyncio.run(provider.fetch_commits(repo, since))
-            for c in commits_data:
-                stmt = pg_insert(ProductivityCommit).values(
-                    connection_id=connection_id,
-                    hash=c["hash"],
-                    short_hash=c["short_hash"],
-                    message=c["message"],
-                    author=c["author"],
-                    date=c["date"],
-                    additions=c["additions"],
-                    deletions=c["deletions"],
-                    repository=c["repository"],
-                    is_merge=c.get("is_merge", False),
-                ).on_conflict_do_nothing(
-                    constraint="uq_commit_connection_hash_repo"
-                )
-                result = db.execute(stmt)
-                if result.rowcount > 0:
-                    total_commits += 1
-            db.commit()
-        except GitHubAccessError as e:
-            db.rollback()
-            repo_errored = True
-            logger.warning(f"GitHub access error fetching commits for {repo}: {e}")
-            errors.append(f"Commits error for {repo}: {e.message}")
-            if e.status in (401, 403, 429):
-                abort_reason = e.message
-                continue
+            prs_by_repo = await provider.search_pull_requests(
+                min(since_by_repo.values()), list(repos)
+            )
         except Exception as e:
-            db.rollback()
-            repo_errored = True
-            logger.warning(f"Failed to fetch commits for {repo}: {e}")
-            errors.append(f"Commits error for {repo}: {str(e)}")
+            logger.warning(
+                f"PR search failed for connection {connection_id}, "
+                f"listing PRs per repo: {e}"
+            )
 
+    # Branch heads (GitHub only): a branch whose head OID matches the one the
+    # last clean sync saw has no new commits, so its history isn't crawled. A
+    # repo whose heads couldn't be read falls back to crawling every branch.
+    current_heads: dict[str, dict[str, str]] = {}
+    branches_crawled = 0
+    branches_skipped = 0
+    if isinstance(provider, GitHubProvider) and repos:
         try:
-            prs_data = asyncio.run(provider.fetch_pull_requests(repo, since))
-            for pr in prs_data:
-                stmt = pg_insert(ProductivityPullRequest).values(
-                    connection_id=connection_id,
-                    number=pr["number"],
-                    title=pr["title"],
-                    status=pr["status"],
-                    repository=pr["repository"],
-                    url=pr["url"],
-                    created_at_remote=pr["created_at_remote"],
-                    merged_at=pr.get("merged_at"),
-                ).on_conflict_do_update(
-                    constraint="uq_pr_connection_number_repo",
-                    set_={
-                        "status": pr["status"],
-                        "title": pr["title"],
-                        "merged_at": pr.get("merged_at"),
-                    },
-                )
-                result = db.execute(stmt)
-                if result.rowcount > 0:
-                    total_prs += 1
-            db.commit()
-        except GitHubAccessError as e:
-            db.rollback()
-            repo_errored = True
-            logger.warning(f"GitHub access error fetching PRs for {repo}: {e}")
-            errors.append(f"PRs error for {repo}: {e.message}")
-            if e.status in (401, 403, 429):
-                abort_reason = e.message
-                continue
+            current_heads = await provider.fetch_branch_heads(list(repos))
         except Exception as e:
-            db.rollback()
-            repo_errored = True
-            logger.warning(f"Failed to fetch PRs for {repo}: {e}")
-            errors.append(f"PRs error for {repo}: {str(e)}")
-
-        # Advance the per-repo watermark only when the repo synced cleanly, so a
-        # partial/errored repo is retried (inserts are idempotent) next run.
-        if not repo_errored:
-            watermarks[repo] = datetime.now(timezone.utc).isoformat()
-            connection.repo_synced_at = dict(watermarks)
-            db.commit()
+            logger.warning(
+                f"Couldn't read branch heads for connection {connection_id}, "
+                f"crawling every branch: {e}"
+            )
 
-    # Drop watermarks for repos no longer tracked so the map can't grow unbounded.
-    pruned = {r: ts for r, ts in watermarks.items() if r in set(repos)}
-    if pruned != (connection.repo_synced_at or {}):
-        connection.repo_synced_at = pruned
-        db.commit()
+    # Repos are fetched concurrently, at most SYNC_REPO_CONCURRENCY at a time
+    # per connection so one big account can't exhaust its rate limit in a burst.
+    # Each repo's DB work goes through _db, so a repo's store-and-commit runs
+    # whole before another repo's statements reach the shared session.
+    semaphore = asyncio.Semaphore(max(1, settings.SYNC_REPO_CONCURRENCY))
+
+    async def _sync_repo(repo: str) -> list[str]:
+        nonlocal abort_reason, total_commits, total_prs, branches_crawled, branches_skipped, repos_done
+        repo_errors: list[str] = []
+
+        async with semaphore:
+            if abort_reason:
+                repos_done += 1
+                await _publish(
+                    "repo_skipped",
+                    repo=repo, reason=abort_reason,
+                    repos_done=repos_done, repos_total=len(repos),
+                )
+                return [f"Skipped {repo}: {abort_reason}"]
+
+            await _publish("repo_started", repo=repo)
+            repo_commits = repo_prs = 0
+            try:
+                since = since_by_repo[repo]
+                repo_errored = False
+
+                heads = current_heads.get(repo)
+                try:
+                    if isinstance(provider, BitbucketProvider):
+                        commits_data = await provider.fetch_commits(
+                            repo, since,
+                            known_diffstats=await _db(
+                                _stored_diffstats, db, connection_id, repo, since
+                            ),
+                        )
+                    elif heads is None:
+                        commits_data = await provider.fetch_commits(repo, since)
+                    else:
+                        seen = stored_heads.get(repo) or {}
+                        moved = [b for b, oid in heads.items() if seen.get(b) != oid]
+                        branches_crawled += len(moved)
+                        branches_skipped += len(heads) - len(moved)
+                        commits_data = (
+                            await provider.fetch_commits(repo, since, branches=moved)
+                            if moved
+                            else []
+                        )
+                    repo_commits = await _db(_store, _store_commits, commits_data)
+                    total_commits += repo_commits
+                except GitHubAccessError as e:
+                    repo_errored = True
+                    logger.warning(f"GitHub access error fetching commits for {repo}: {e}")
+                    repo_errors.append(f"Commits error for {repo}: {e.message}")
+                    if e.status in (401, 403, 429):
+                        abort_reason = abort_reason or e.message
+                        return repo_errors
+                except Exception as e:
+                    repo_errored = True
+                    logger.warning(f"Failed to fetch commits for {repo}: {e}")
+                    repo_errors.append(f"Commits error for {repo}: {str(e)}")
+
+                try:
+                    if prs_by_repo is None:
+                        prs_data = await provider.fetch_pull_requests(repo, since)
+                    else:
+                        # The search ran from the oldest watermark; keep what the
+                        # REST path would have returned for this repo's own.
+                        prs_data = [
+                            pr for pr in prs_by_repo.get(repo, [])
+                            if _parse_ts(pr["created_at_remote"]) >= since
+                        ]
+                    repo_prs = await _db(_store, _store_pull_requests, prs_data)
+                    total_prs += repo_prs
+                except GitHubAccessError as e:
+                    repo_errored = True
+                    logger.warning(f"GitHub access error fetching PRs for {repo}: {e}")
+                    repo_errors.append(f"PRs error for {repo}: {e.message}")
+                    if e.status in (401, 403, 429):
+                        abort_reason = abort_reason or e.message
+                        return repo_errors
+                except Exception as e:
+                    repo_errored = True
+                    logger.warning(f"Failed to fetch PRs for {repo}: {e}")
+                    repo_errors.append(f"PRs error for {repo}: {str(e)}")
+
+                # Advance the per-repo watermark only when the repo synced cleanly, so a
+                # partial/errored repo is retried (inserts are idempotent) next run.
+                if not repo_errored:
+                    watermarks[repo] = datetime.now(timezone.utc).isoformat()
+                    fields = {"repo_synced_at": dict(watermarks)}
+                    if heads is not None:
+                        stored_heads[repo] = heads
+                        fields["branch_heads"] = dict(stored_heads)
+                    await _db(_save, **fields)
+            finally:
+                repos_done += 1
+                await _publish(
+                    "repo_finished",
+                    repo=repo, commits=repo_commits, prs=repo_prs, errors=len(repo_errors),
+                    commits_synced=total_commits, prs_synced=total_prs,
+                    repos_done=repos_done, repos_total=len(repos),
+                    rate_limit=_rate_limit_left(provider),
+                )
 
-    connection.last_sync_attempted_at = datetime.utcnow()
-    if errors:
-        connection.last_sync_status = "error"
-        connection.last_sync_error = "; ".join(errors)
-    else:
-        connection.last_synced_at = connection.last_sync_attempted_at
-        connection.last_sync_status = "success"
-        connection.last_sync_error = None
-    db.commit()
+        return repo_errors
+
+    # gather keeps the results in repo order, so the error summary reads the
+    # same as it did when repos were synced one by one.
+    for repo_errors in await asyncio.gather(*(_sync_repo(repo) for repo in repos)):
+        errors.extend(repo_errors)
+
+    # Drop watermarks and heads for repos no longer tracked so the maps can't
+    # grow unbounded.
+    tracked = set(repos)
+    pruned = {r: ts for r, ts in watermarks.items() if r in tracked}
+    pruned_heads = {r: h for r, h in stored_heads.items() if r in tracked}
+    # The connection holds exactly `watermarks` / `stored_heads` by now.
+    if pruned != watermarks or pruned_heads != stored_heads:
+        await _db(_save, repo_synced_at=pruned, branch_heads=pruned_heads)
+
+    if current_heads:
+        logger.info(
+            f"Connection {connection_id}: crawled {branches_crawled} branches, "
+            f"skipped {branches_skipped} unchanged"
+        )
+
+    await _db(_record_outcome, errors)
 
     return {
         "connection_id": connection_id,
         "status": "completed",
         "commits_synced": total_commits,
         "prs_synced": total_prs,
+        "branches_crawled": branches_crawled,
+        "branches_skipped": branches_skipped,
         "errors": errors,
     }
@@ -0,0 +1,293 @@
+"""Productivity syncs as rows in `sync_jobs`, shared by every process.
+
+Syncs used to run as FastAPI BackgroundTasks guarded by an in-process set, so
+two uvicorn workers (or the API and the scheduler) could sync the same
+connection at once and neither could tell what the other was doing. Now:
+
+- `enqueue` inserts a queued job; a partial unique index allows one queued or
+  running job per connection, so a double-clicked Sync gets the pending job
+  back instead of a second one;
+- worker threads (`start_workers`, SYNC_JOB_WORKERS per API/scheduler
+  process) `claim_next` with FOR UPDATE SKIP LOCKED and run the job while
+  holding a Postgres advisory lock on the connection, so a sync can never
+  overlap another one, whichever process started it;
+- jobs left "running" by a worker that died are failed (`recover_stale`)
+  when workers start and on every scheduler cycle; the scheduler also prunes
+  old finished ones (`prune`).
+
+On SQLite (tests) there are no advisory locks; the row state alone is used.
+"""
+import logging
+import os
+import socket
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import or_, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import SessionLocal, engine
+from app.models.productivity_connection import ProductivityConnection
+from app.models.sync_job import SyncJob
+from app.services.productivity_sync import sync_connection
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+ACTIVE = (QUEUED, RUNNING)
+
+# First half of the two-int advisory lock key; the second is hashtext(connection id).
+_LOCK_NAMESPACE = 0x53594E43  # "SYNC"
+
+_wake = threading.Event()
+_stop = threading.Event()
+_threads: list[threading.Thread] = []
+
+
+def _worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}/{threading.current_thread().name}"
+
+
+def active_job(db: Session, connection_id: UUID) -> SyncJob | None:
+    return (
+        db.query(SyncJob)
+        .filter(SyncJob.connection_id == connection_id, SyncJob.status.in_(ACTIVE))
+        .first()
+    )
+
+
+def enqueue(
+    db: Session, connection_id: UUID, trigger: str, run_after: datetime | None = None
+) -> tuple[SyncJob, bool]:
+    """Queue a sync of the connection, to start no earlier than `run_after`;
+    returns (job, created). When one is already queued or running, that job is
+    returned with created=False."""
+    existing = active_job(db, connection_id)
+    if existing is not None:
+        return existing, False
+    job = SyncJob(
+        connection_id=connection_id, status=QUEUED, trigger=trigger, run_after=run_after
+    )
+    db.add(job)
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another process queued one between our check and the insert.
+        db.rollback()
+        existing = active_job(db, connection_id)
+        if existing is None:
+            raise
+        return existing, False
+    db.refresh(job)
+    _wake.set()
+    return job, True
+
+
+def claim_next(db: Session, worker: str) -> UUID | None:
+    """Mark the oldest queued job running and return its id (None when idle)."""
+    now = datetime.utcnow()
+    stmt = (
+        select(SyncJob)
+        .where(
+            SyncJob.status == QUEUED,
+            or_(SyncJob.run_after.is_(None), SyncJob.run_after <= now),
+        )
+        .order_by(SyncJob.queued_at.asc())
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    job = db.execute(stmt).scalars().first()
+    if job is None:
+        db.rollback()
+        return None
+    job.status = RUNNING
+    job.started_at = now
+    job.worker = worker
+    db.commit()
+    return job.id
+
+
+@contextmanager
+def connection_lock(connection_id: UUID) -> Iterator[bool]:
+    """Session-level advisory lock on the connection, held on a dedicated
+    pooled connection for the duration of the block. Yields whether it was
+    acquired; always True off Postgres."""
+    if engine.dialect.name != "postgresql":
+        yield True
+        return
+    params = {"ns": _LOCK_NAMESPACE, "id": str(connection_id)}
+    with engine.connect() as conn:
+        acquired = conn.execute(
+            text("SELECT pg_try_advisory_lock(:ns, hashtext(:id))"), params
+        ).scalar()
+        conn.commit()
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                try:
+                    conn.execute(text("SELECT pg_advisory_unlock(:ns, hashtext(:id))"), params)
+                    conn.commit()
+                except Exception:
+                    # Don't return a connection that may still hold the lock.
+                    conn.invalidate()
+                    raise
+
+
+def _finish(db: Session, job_id: UUID, status: str, result: dict | None = None,
+            error: str | None = None) -> None:
+    job = db.get(SyncJob, job_id)
+    if job is None:  # connection deleted mid-sync; the job went with it
+        return
+    job.status = status
+    job.finished_at = datetime.utcnow()
+    if result is not None:
+        job.commits_synced = result["commits_synced"]
+        job.prs_synced = result["prs_synced"]
+    job.error = error
+    db.commit()
+
+
+def run_job(job_id: UUID) -> None:
+    """Run a claimed job to completion; never raises."""
+    db = SessionLocal()
+    try:
+        job = db.get(SyncJob, job_id)
+        if job is None:
+            return
+        connection_id = job.connection_id
+        with connection_lock(connection_id) as locked:
+            if not locked:
+                _finish(db, job_id, ERROR, error="Another sync of this connection is already running")
+                return
+            try:
+                result = sync_connection(connection_id, db)
+            except Exception as e:
+                logger.exception(f"Sync job {job_id} failed for connection {connection_id}: {e}")
+                db.rollback()
+                conn = db.get(ProductivityConnection, connection_id)
+                if conn:
+                    conn.last_sync_attempted_at = datetime.utcnow()
+                    conn.last_sync_status = "error"
+                    conn.last_sync_error = str(e)
+                    conn.sync_failures = (conn.sync_failures or 0) + 1
+                    db.commit()
+                _finish(db, job_id, ERROR, error=str(e))
+                return
+        errors = result["errors"]
+        _finish(db, job_id, ERROR if errors else DONE, result, "; ".join(errors) or None)
+    except Exception:
+        logger.exception(f"Sync job {job_id} could not be recorded")
+    finally:
+        db.close()
+
+
+def drain(worker: str | None = None) -> int:
+    """Claim and run queued jobs until none are left; returns how many ran."""
+    ran = 0
+    while not _stop.is_set():
+        db = SessionLocal()
+        try:
+            job_id = claim_next(db, worker or _worker_name())
+        finally:
+            db.close()
+        if job_id is None:
+            return ran
+        run_job(job_id)
+        ran += 1
+    return ran
+
+
+def _worker_loop() -> None:
+    while not _stop.is_set():
+        try:
+            drain()
+        except Exception:
+            logger.exception("Sync job worker cycle failed")
+        _wake.wait(settings.SYNC_JOB_POLL_SECONDS)
+        _wake.clear()
+
+
+def start_workers(count: int | None = None) -> None:
+    """Start the worker threads of this process (no-op when already running),
+    first failing jobs a previous run of it left "running"."""
+    if _threads:
+        return
+    db = SessionLocal()
+    try:
+        recovered = recover_stale(db)
+        if recovered:
+            logger.warning(f"Failed {recovered} sync job(s) abandoned by a stopped worker")
+    except Exception:
+        logger.exception("Could not recover stale sync jobs")
+    finally:
+        db.close()
+    _stop.clear()
+    for i in range(settings.SYNC_JOB_WORKERS if count is None else count):
+        thread = threading.Thread(target=_worker_loop, name=f"sync-job-{i}", daemon=True)
+        thread.start()
+        _threads.append(thread)
+
+
+def stop_workers(timeout: float = 5.0) -> None:
+    """Ask the workers to stop after their current job. A sync still running
+    past `timeout` is left to the daemon thread; recover_stale fails it later."""
+    _stop.set()
+    _wake.set()
+    for thread in _threads:
+        thread.join(timeout)
+    _threads.clear()
+
+
+def recover_stale(db: Session) -> int:
+    """Fail "running" jobs whose worker is gone; returns how many.
+
+    On Postgres a worker holds the connection lock for the whole sync, so a
+    free lock means the job is abandoned — past SYNC_JOB_STALE_GRACE_SECONDS,
+    the gap between `claim_next` and `run_job` taking the lock. Without
+    advisory locks, only jobs running over SYNC_JOB_STALE_MINUTES are failed.
+    """
+    if engine.dialect.name == "postgresql":
+        age = timedelta(seconds=settings.SYNC_JOB_STALE_GRACE_SECONDS)
+    else:
+        age = timedelta(minutes=settings.SYNC_JOB_STALE_MINUTES)
+    cutoff = datetime.utcnow() - age
+    stale = (
+        db.query(SyncJob)
+        .filter(SyncJob.status == RUNNING, SyncJob.started_at < cutoff)
+        .all()
+    )
+    recovered = 0
+    for job in stale:
+        with connection_lock(job.connection_id) as free:
+            if not free:
+                continue  # still syncing somewhere
+            db.refresh(job)
+            if job.status != RUNNING:  # finished while we took the lock
+                continue
+            job.status = ERROR
+            job.finished_at = datetime.utcnow()
+            job.error = f"Worker {job.worker} stopped before finishing"
+            db.commit()
+            recovered += 1
+    return recovered
+
+
+def prune(db: Session) -> int:
+    """Delete finished jobs older than SYNC_JOB_RETENTION_DAYS; returns how many."""
+    cutoff = datetime.utcnow() - timedelta(days=settings.SYNC_JOB_RETENTION_DAYS)
+    deleted = (
+        db.query(SyncJob)
+        .filter(SyncJob.status.notin_(ACTIVE), SyncJob.queued_at < cutoff)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
@@ -0,0 +1,179 @@
+"""Live progress of productivity syncs, for GET /connections/{id}/sync-events.
+
+The UI used to poll GET /connections/{id} for `last_sync_status`, so a sync
+over many repos looked frozen until it finished. `sync_connection` now
+`publish`es small structured events as it goes (sync/repo started and
+finished, repos skipped, commits and PRs so far, GitHub budget left), and the
+SSE endpoint `subscribe`s to the connection's events.
+
+Syncs run on whichever process claimed the job (an API worker or the
+scheduler), so on Postgres events travel over NOTIFY on CHANNEL: one listener
+thread per process LISTENs and hands them to that process's subscribers.
+Elsewhere (SQLite in tests) they go straight to the subscribers here.
+Publishing never raises; a lost event only makes the progress view coarser.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import text
+
+from app.core.db import SessionLocal, engine
+from app.models.productivity_connection import ProductivityConnection
+from app.models.sync_job import SyncJob
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "sync_progress"
+
+# Events a subscriber may fall behind by before newer ones are dropped.
+_QUEUE_SIZE = 1000
+# NOTIFY payloads must stay under 8000 bytes; larger events are not sent.
+_MAX_PAYLOAD = 7900
+
+# {connection id: {(loop, queue)}}
+_subscribers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+_lock = threading.Lock()
+_listener: threading.Thread | None = None
+
+
+def _on_postgres() -> bool:
+    return engine.dialect.name == "postgresql"
+
+
+def _offer(queue: asyncio.Queue, event: dict) -> None:
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        pass
+
+
+def _deliver(event: dict) -> None:
+    with _lock:
+        targets = list(_subscribers.get(event["connection_id"], ()))
+    for loop, queue in targets:
+        try:
+            loop.call_soon_threadsafe(_offer, queue, event)
+        except RuntimeError:  # that subscriber's loop is gone
+            pass
+
+
+def publish(connection_id: UUID, event: str, **fields) -> None:
+    """Send one progress event about the connection to every subscriber."""
+    payload = {
+        "event": event,
+        "connection_id": str(connection_id),
+        "at": datetime.utcnow().isoformat() + "Z",
+        **fields,
+    }
+    try:
+        if not _on_postgres():
+            _deliver(payload)
+            return
+        data = json.dumps(payload, default=str)
+        if len(data.encode()) > _MAX_PAYLOAD:
+            logger.warning(f"Sync progress event {event} too large for NOTIFY; dropped")
+            return
+        with engine.connect() as conn:
+            conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": data})
+            conn.commit()
+    except Exception as e:
+        logger.warning(f"Could not publish sync progress for {connection_id}: {e}")
+
+
+def _listen() -> None:
+    """LISTEN on CHANNEL forever on a connection of its own, reconnecting on errors."""
+    while True:
+        raw = None
+        try:
+            raw = engine.raw_connection()
+            raw.detach()  # held for good; don't take a slot from the pool
+            dbapi = raw.driver_connection
+            dbapi.autocommit = True
+            dbapi.cursor().execute(f"LISTEN {CHANNEL}")
+            while True:
+                if select.select([dbapi], [], [], 30.0) == ([], [], []):
+                    continue
+                dbapi.poll()
+                while dbapi.notifies:
+                    note = dbapi.notifies.pop(0)
+                    try:
+                        _deliver(json.loads(note.payload))
+                    except (ValueError, KeyError):
+                        logger.warning(f"Ignoring malformed sync progress payload: {note.payload[:200]}")
+        except Exception:
+            logger.exception("Sync progress listener failed; reconnecting")
+            time.sleep(5)
+        finally:
+            if raw is not None:
+                try:
+                    raw.close()
+                except Exception:
+                    pass
+
+
+def _ensure_listener() -> None:
+    global _listener
+    with _lock:
+        if _listener is None or not _listener.is_alive():
+            _listener = threading.Thread(target=_listen, name="sync-progress", daemon=True)
+            _listener.start()
+
+
+@asynccontextmanager
+async def subscribe(connection_id: UUID) -> AsyncIterator[asyncio.Queue]:
+    """A queue receiving the connection's events while the block runs."""
+    if _on_postgres():
+        _ensure_listener()
+    key = str(connection_id)
+    entry = (asyncio.get_running_loop(), asyncio.Queue(maxsize=_QUEUE_SIZE))
+    with _lock:
+        _subscribers.setdefault(key, set()).add(entry)
+    try:
+        yield entry[1]
+    finally:
+        with _lock:
+            subs = _subscribers.get(key)
+            if subs is not None:
+                subs.discard(entry)
+                if not subs:
+                    del _subscribers[key]
+
+
+def snapshot(connection_id: UUID) -> dict:
+    """Where the connection's syncing stands right now, from the DB: its
+    queued or running job (None when idle) and the last sync's outcome."""
+    db = SessionLocal()
+    try:
+        conn = db.get(ProductivityConnection, connection_id)
+        job = (
+            db.query(SyncJob)
+            # sync_jobs.ACTIVE; importing it here would be circular.
+            .filter(SyncJob.connection_id == connection_id, SyncJob.status.in_(("queued", "running")))
+            .first()
+        )
+        return {
+            "event": "snapshot",
+            "connection_id": str(connection_id),
+            "job": None if job is None else {
+                "id": str(job.id),
+                "status": job.status,
+                "queued_at": job.queued_at.isoformat(),
+                "started_at": job.started_at.isoformat() if job.started_at else None,
+            },
+            "last_sync_status": conn.last_sync_status if conn else None,
+            "last_sync_error": conn.last_sync_error if conn else None,
+            "last_sync_attempted_at": (
+                conn.last_sync_attempted_at.isoformat()
+                if conn and conn.last_sync_attempted_at else None
+            ),
+        }
+    finally:
+        db.close()
@@ -0,0 +1,149 @@
+"""Stale-while-revalidate cache for GET /productivity/user-activity.
+
+The page used to make a live GitHub GraphQL call (contributionsCollection)
+on every view, so it was as slow as GitHub and spent the user's rate limit
+each time. Now the last summary per primary connection and date range is kept
+in `user_activity_cache`:
+
+- a fresh entry (under USER_ACTIVITY_CACHE_TTL_SECONDS old) is served as is;
+- an older one is still served at once, while a background refresh on the
+  shared HTTP pool loop replaces it (at most one per entry per process);
+- an entry fetched more than a day after its range ended is final — nothing
+  in a past range changes any more — and is never refetched.
+
+Only a miss waits for GitHub. Summaries matching the org blocklist are not
+stored (the DB trigger would refuse them). The background refresh touches the
+DB from a worker thread on its own session, like app/services/http_cache.py.
+"""
+import asyncio
+import json
+import logging
+import threading
+from datetime import date, datetime, time, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core import http_pool
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.core.encryption import decrypt_value
+from app.core.org_blocklist import ORG_RE
+from app.models.productivity_connection import ProductivityConnection
+from app.models.user_activity_cache import UserActivityCache
+from app.services import github_rate_limit
+from app.services.github_provider import GitHubProvider
+
+logger = logging.getLogger(__name__)
+
+# last_used_at is only rewritten when older than this, so views don't each write.
+_TOUCH_EVERY = timedelta(hours=1)
+
+_refreshing: set[tuple[UUID, date, date]] = set()
+_refreshing_lock = threading.Lock()
+
+
+def is_final(date_to: date, fetched_at: datetime) -> bool:
+    """Whether an entry was fetched over a day after its range ended."""
+    return fetched_at >= datetime.combine(date_to + timedelta(days=2), time.min)
+
+
+def _is_fresh(fetched_at: datetime, now: datetime) -> bool:
+    return now - fetched_at < timedelta(seconds=settings.USER_ACTIVITY_CACHE_TTL_SECONDS)
+
+
+async def _fetch(pat: str, username: str, date_from: date, date_to: date, priority: str) -> dict:
+    provider = GitHubProvider(pat=pat, username=username, priority=priority)
+    from_dt = datetime.combine(date_from, time.min, tzinfo=timezone.utc)
+    to_dt = datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=timezone.utc) - timedelta(seconds=1)
+    return await provider.fetch_user_activity(from_dt, to_dt)
+
+
+def _store(connection_id: UUID, username: str, date_from: date, date_to: date,
+           result: dict, fetched_at: datetime) -> None:
+    if ORG_RE.search(json.dumps(result)):
+        return
+    db = SessionLocal()
+    try:
+        db.merge(UserActivityCache(
+            connection_id=connection_id,
+            date_from=date_from,
+            date_to=date_to,
+            username=username,
+            result=result,
+            fetched_at=fetched_at,
+            last_used_at=fetched_at,
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _refresh(key: tuple[UUID, date, date], pat: str, username: str) -> None:
+    connection_id, date_from, date_to = key
+    try:
+        fetched_at = datetime.utcnow()
+        result = await _fetch(pat, username, date_from, date_to, github_rate_limit.BACKGROUND)
+        await asyncio.to_thread(_store, connection_id, username, date_from, date_to, result, fetched_at)
+    except Exception as e:
+        logger.warning(f"User activity refresh failed for connection {connection_id}: {e}")
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(key)
+
+
+def _refresh_in_background(conn: ProductivityConnection, date_from: date, date_to: date) -> None:
+    key = (conn.id, date_from, date_to)
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+    try:
+        http_pool.submit(_refresh(key, decrypt_value(conn.pat_encrypted), conn.username))
+    except Exception:
+        with _refreshing_lock:
+            _refreshing.discard(key)
+        raise
+
+
+def get_activity(
+    db: Session, conn: ProductivityConnection, date_from: date, date_to: date
+) -> tuple[dict, datetime]:
+    """(summary, fetched_at) of the connection's GitHub activity between the
+    two days, inclusive — cached when possible. Raises when a miss can't be
+    fetched."""
+    now = datetime.utcnow()
+    if settings.USER_ACTIVITY_CACHE_ENABLED:
+        entry = db.get(UserActivityCache, (conn.id, date_from, date_to))
+        if entry is not None and entry.username == conn.username:
+            result, fetched_at = entry.result, entry.fetched_at
+            if now - entry.last_used_at >= _TOUCH_EVERY:
+                entry.last_used_at = now
+                db.commit()
+            if not _is_fresh(fetched_at, now) and not is_final(date_to, fetched_at):
+                _refresh_in_background(conn, date_from, date_to)
+            return result, fetched_at
+
+    result = http_pool.run(_fetch(
+        decrypt_value(conn.pat_encrypted), conn.username, date_from, date_to,
+        github_rate_limit.INTERACTIVE,
+    ))
+    if settings.USER_ACTIVITY_CACHE_ENABLED:
+        try:
+            _store(conn.id, conn.username, date_from, date_to, result, now)
+        except Exception as e:
+            logger.warning(f"User activity cache update failed for connection {conn.id}: {e}")
+    return result, now
+
+
+def prune(db: Session) -> int:
+    """Delete entries nobody has read in USER_ACTIVITY_CACHE_MAX_AGE_DAYS;
+    returns how many. Run by the scheduler every cycle."""
+    cutoff = datetime.utcnow() - timedelta(days=settings.USER_ACTIVITY_CACHE_MAX_AGE_DAYS)
+    deleted = (
+        db.query(UserActivityCache)
+        .filter(UserActivityCache.last_used_at < cutoff)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return deleted
@@ -18,11 +18,14 @@ from uuid import UUID
 from sqlalchemy import nullsfirst, or_, select, text
 from sqlalchemy.orm import Session
 
+from app.core.encryption import decrypt_value
+from app.models.productivity_connection import ProductivityConnection
 from app.models.proposal import Proposal
 from app.models.watcher import Watcher
 from app.models.watcher_sighting import WatcherSighting
 from app.services import address_pr_service
 from app.services import code_review_service
+from app.services import github_rate_limit
 from app.services import platform_events_service as events
 
 
@@ -110,12 +113,38 @@ def run_now(db: Session, watcher: Watcher) -> dict:
 # --- Runner-facing operations ---
 
 
+def _rate_limited_connection_ids(db: Session) -> list[UUID]:
+    """GitHub connections whose token this process has seen run out of
+    budget. Their watchers wait for the reset instead of being claimed into a
+    tick that would only 403 (see github_rate_limit)."""
+    if not github_rate_limit.any_paused():
+        return []
+    rows = (
+        db.query(ProductivityConnection.id, ProductivityConnection.pat_encrypted)
+        .filter(ProductivityConnection.provider == "github")
+        .filter(
+            ProductivityConnection.id.in_(
+                select(Watcher.connection_id).where(Watcher.enabled.is_(True))
+            )
+        )
+        .all()
+    )
+    return [
+        conn_id
+        for conn_id, pat_encrypted in rows
+        if github_rate_limit.is_paused(github_rate_limit.token_key(decrypt_value(pat_encrypted)))
+    ]
+
+
 def claim_next_watcher(db: Session, runner_id: str) -> dict | None:  # noqa: ARG001
     now = datetime.utcnow()
     # last_run_at doubles as the lease: claiming a watcher immediately advances
     # it, so a second runner tick (or this same runner before the interval
     # elapses again) won't pick it up — no separate claimed_by/status needed.
-    due = text("watchers.last_run_at + watchers.interval_minutes * interval '1 minute' <= :now")
+    if db.get_bind().dialect.name == "sqlite":  # tests; no interval type there
+        due = text("datetime(watchers.last_run_at, watchers.interval_minutes || ' minutes') <= datetime(:now)")
+    else:
+        due = text("watchers.last_run_at + watchers.interval_minutes * interval '1 minute' <= :now")
     stmt = (
         select(Watcher)
         .where(Watcher.enabled.is_(True), or_(Watcher.last_run_at.is_(None), due))
@@ -124,6 +153,11 @@ def claim_next_watcher(db: Session, runner_id: str) -> dict | None:  # noqa: ARG
         .limit(1)
         .with_for_update(of=Watcher, skip_locked=True)
     )
+    paused = _rate_limited_connection_ids(db)
+    if paused:
+        stmt = stmt.where(
+            or_(Watcher.connection_id.is_(None), Watcher.connection_id.notin_(paused))
+        )
     watcher = db.execute(stmt).scalars().first()
     if watcher is None:
         return None
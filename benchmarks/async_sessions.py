@@ -0,0 +1,78 @@
+"""Requests/sec for the sync (`get_db`, threadpool) vs async (`get_async_db`)
+session paths.
+
+Mounts the same service call — `runner_service.build_overview`, the query
+behind `/runner/overview` — once as a sync `def` route and once as an
+`async def` route on `run_sync`, then drives both with the same number of
+concurrent in-process clients. Needs a reachable Postgres in DATABASE_URL
+(the docker-compose one is fine); nothing is written to it.
+
+    docker compose exec api python -m benchmarks.async_sessions --requests 2000 --concurrency 100
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401 — resolve every relationship before querying
+from app.core.db import get_async_db, get_db
+from app.services import runner_service
+
+bench_app = FastAPI()
+
+
+@bench_app.get("/sync")
+def sync_overview(db: Session = Depends(get_db)):
+    return runner_service.build_overview(db)
+
+
+@bench_app.get("/async")
+async def async_overview(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(runner_service.build_overview)
+
+
+async def _drive(path: str, total: int, concurrency: int) -> tuple[float, list[float]]:
+    transport = httpx.ASGITransport(app=bench_app)
+    latencies: list[float] = []
+    remaining = iter(range(total))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path)  # warm the pool and the async engine
+
+        async def worker() -> None:
+            for _ in remaining:
+                start = time.perf_counter()
+                resp = await client.get(path)
+                latencies.append(time.perf_counter() - start)
+                resp.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return elapsed, latencies
+
+
+def _report(label: str, total: int, elapsed: float, latencies: list[float]) -> None:
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"{label:>6}: {total / elapsed:8.1f} req/s   p50 {p50:7.2f} ms   p99 {p99:7.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    for label, path in (("sync", "/sync"), ("async", "/async")):
+        elapsed, latencies = asyncio.run(_drive(path, args.requests, args.concurrency))
+        _report(label, args.requests, elapsed, latencies)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Cold start to first request: fresh interpreter -> `import app.main` ->
+startup event -> first GET /health answered.
+
+Each run is a new process (what uvicorn `--reload` pays on every change), so
+nothing is warm but the OS file cache. Prints the median over the runs and the
+slowest boot steps from app.core.startup. Set DB_GUARD_ON_BOOT=false to leave
+the database out of it:
+
+    DB_GUARD_ON_BOOT=false python -m benchmarks.cold_start --runs 10
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+_CHILD = """
+import json, time
+import app.main
+from fastapi.testclient import TestClient
+from app.core import startup
+with TestClient(app.main.app) as client:
+    imported = time.time()
+    assert client.get("/health").status_code == 200
+    answered = time.time()
+print(json.dumps({"answered": answered, "first_request": answered - imported, **startup.report()}))
+"""
+
+
+def _run_once() -> dict:
+    started = time.time()
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD], capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    result["cold_start"] = result["answered"] - started
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [_run_once() for _ in range(args.runs)]
+    cold = [r["cold_start"] * 1000 for r in runs]
+    boot = [r["startup_ms"] for r in runs]
+    first = [r["first_request"] * 1000 for r in runs]
+    print(f"cold start to first response: median {statistics.median(cold):7.1f} ms  (min {min(cold):.1f})")
+    print(f"  of which app.main startup:  median {statistics.median(boot):7.1f} ms")
+    print(f"  first request itself:       median {statistics.median(first):7.1f} ms")
+
+    by_step: dict[str, list[float]] = {}
+    for r in runs:
+        for step in r["steps"]:
+            by_step.setdefault(step["name"], []).append(step["ms"])
+    print("\nslowest steps (median ms):")
+    for name, values in sorted(by_step.items(), key=lambda kv: -statistics.median(kv[1]))[:10]:
+        print(f"  {statistics.median(values):8.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""OrgBlocklistMiddleware body scanning: old buffer-and-replay vs streaming.
+
+Feeds clean bodies of 1 KB to 10 MB, split into 64 KB chunks (what uvicorn
+hands over), through both the current middleware and a copy of the previous
+implementation — `body += chunk`, decode everything, then BLOCKED_RE and
+TICKET_RE in turn — with an inner app that drains the body like an endpoint
+would. No database or network needed:
+
+    python -m benchmarks.org_blocklist_scan
+"""
+import asyncio
+import time
+
+from app.core.org_blocklist import BLOCKED_RE, TICKET_RE, OrgBlocklistMiddleware
+
+CHUNK = 64 * 1024
+SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+LINE = b'{"step": "implement", "log": "ran the tests, 42 passed; see PR #118"}\n'
+
+
+class BufferingMiddleware:
+    """The pre-streaming implementation, kept here only as the baseline."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        body = b""
+        more = True
+        while more:
+            message = await receive()
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+        text = body.decode("utf-8", "replace")
+        assert not (BLOCKED_RE.search(text) or TICKET_RE.search(text))
+
+        sent = False
+
+        async def replay():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, replay, send)
+
+
+async def _drain_app(scope, receive, send) -> None:
+    while True:
+        message = await receive()
+        if not message.get("more_body", False):
+            break
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def _body(size: int) -> list[bytes]:
+    data = (LINE * (size // len(LINE) + 1))[:size]
+    return [data[i:i + CHUNK] for i in range(0, len(data), CHUNK)]
+
+
+async def _run(middleware, chunks: list[bytes]) -> float:
+    queue = [
+        {"type": "http.request", "body": c, "more_body": i < len(chunks) - 1}
+        for i, c in enumerate(chunks)
+    ]
+
+    async def receive():
+        return queue.pop(0)
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "path": "/implementations/runner/runs/x", "query_string": b""}
+    start = time.perf_counter()
+    await middleware(scope, receive, send)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    old = BufferingMiddleware(_drain_app)
+    new = OrgBlocklistMiddleware(_drain_app)
+    print(f"{'body':>10} {'buffering':>12} {'streaming':>12} {'speedup':>8}")
+    for size in SIZES:
+        chunks = _body(size)
+        repeat = min(200, max(3, 20_000_000 // size))
+        t_old = min(asyncio.run(_run(old, chunks)) for _ in range(repeat))
+        t_new = min(asyncio.run(_run(new, chunks)) for _ in range(repeat))
+        print(f"{size:>10} {t_old * 1000:>10.3f}ms {t_new * 1000:>10.3f}ms {t_old / t_new:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
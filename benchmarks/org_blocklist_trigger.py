@@ -0,0 +1,128 @@
+"""Bulk-insert throughput on productivity_commits under the org-blocklist trigger.
+
+Copies the productivity_commits schema into a temporary table and times the
+same batched multi-row INSERT, then an UPDATE of a numeric column on every
+row (what a stats refresh does), with:
+
+  none       no trigger at all
+  row-json   the previous shared trigger — `to_jsonb(NEW)::text` and both
+             regexes on every write, whatever changed
+  columns    the per-table trigger install_db_guard generates now
+
+Everything runs in one transaction that is rolled back, so the real table and
+its trigger are left untouched. Needs a reachable Postgres in DATABASE_URL with
+migrations applied:
+
+    docker compose exec api python -m benchmarks.org_blocklist_trigger --rows 50000
+"""
+import argparse
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy import text
+
+from app.core.db import engine
+from app.core.org_blocklist import _PG_PATTERN, _PG_TICKET, _text_columns, table_guard_ddl
+
+TABLE = "bench_productivity_commits"
+
+_LEGACY_FN = f"""
+CREATE OR REPLACE FUNCTION bench_org_blocklist_row() RETURNS trigger AS $fn$
+DECLARE
+  row_text text := to_jsonb(NEW)::text;
+BEGIN
+  IF row_text ~* '{_PG_PATTERN}' OR row_text ~ '{_PG_TICKET}' THEN
+    RAISE EXCEPTION 'blocked' USING ERRCODE = 'check_violation';
+  END IF;
+  RETURN NEW;
+END;
+$fn$ LANGUAGE plpgsql;
+"""
+
+_INSERT = text(
+    f"INSERT INTO {TABLE} (id, connection_id, hash, short_hash, message, author, date, "
+    "additions, deletions, repository, pr_number, pr_url, is_merge, created_at) VALUES "
+    "(:id, :connection_id, :hash, :short_hash, :message, :author, :date, "
+    ":additions, :deletions, :repository, :pr_number, :pr_url, :is_merge, :created_at)"
+)
+
+
+def _rows(count: int) -> list[dict]:
+    connection_id = uuid.uuid4()
+    now = datetime.utcnow()
+    rows = []
+    for i in range(count):
+        sha = uuid.uuid4().hex + f"{i:08x}"
+        rows.append({
+            "id": uuid.uuid4(),
+            "connection_id": connection_id,
+            "hash": sha,
+            "short_hash": sha[:7],
+            "message": f"fix(sync): handle pagination edge case in page {i}\n\nCloses #{i % 900}",
+            "author": "dev@example.com",
+            "date": now,
+            "additions": i % 300,
+            "deletions": i % 40,
+            "repository": "acme/brains-api",
+            "pr_number": i % 500,
+            "pr_url": f"https://github.com/acme/brains-api/pull/{i % 500}",
+            "is_merge": False,
+            "created_at": now,
+        })
+    return rows
+
+
+def _install(conn, variant: str, columns) -> None:
+    conn.execute(text(f'DROP TRIGGER IF EXISTS trg_org_blocklist ON "{TABLE}"'))
+    if variant == "row-json":
+        conn.execute(text(_LEGACY_FN))
+        conn.execute(text(
+            f'CREATE TRIGGER trg_org_blocklist BEFORE INSERT OR UPDATE ON "{TABLE}" '
+            "FOR EACH ROW EXECUTE FUNCTION bench_org_blocklist_row()"
+        ))
+    elif variant == "columns":
+        for statement in table_guard_ddl(TABLE, columns):
+            conn.execute(text(statement))
+
+
+def _time(conn, rows: list[dict], batch: int) -> tuple[float, float]:
+    conn.execute(text(f"TRUNCATE {TABLE}"))
+    start = time.perf_counter()
+    for i in range(0, len(rows), batch):
+        conn.execute(_INSERT, rows[i:i + batch])
+    inserted = time.perf_counter() - start
+    start = time.perf_counter()
+    conn.execute(text(f"UPDATE {TABLE} SET additions = additions + 1"))
+    updated = time.perf_counter() - start
+    return inserted, updated
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--batch", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = _rows(args.rows)
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            conn.execute(text(f"CREATE TEMP TABLE {TABLE} (LIKE productivity_commits INCLUDING DEFAULTS)"))
+            columns = _text_columns(conn, ["productivity_commits"])["productivity_commits"]
+            print(f"checked columns: {', '.join(c for c, _ in columns)}")
+            print(f"{'trigger':>10} {'insert rows/s':>14} {'update rows/s':>14}")
+            for variant in ("none", "row-json", "columns"):
+                _install(conn, variant, columns)
+                ins, upd = min(
+                    (_time(conn, rows, args.batch) for _ in range(args.repeat)),
+                    key=lambda t: t[0],
+                )
+                print(f"{variant:>10} {args.rows / ins:>14.0f} {args.rows / upd:>14.0f}")
+        finally:
+            trans.rollback()
+
+
+if __name__ == "__main__":
+    main()
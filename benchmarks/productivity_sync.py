@@ -0,0 +1,162 @@
+"""Wall-clock time of `productivity_sync.sync_connection` as the repo count
+grows, one repo at a time vs concurrently.
+
+Starts a fake GitHub (branches, GraphQL commit history, pulls) on localhost
+that answers every request after --latency ms, points GitHubProvider at it and
+syncs a throwaway connection with 1..N selected repos, first with
+SYNC_REPO_CONCURRENCY=1 (the old serial behaviour) and then with --concurrency.
+Needs a reachable Postgres in DATABASE_URL with migrations applied; the
+connection and everything it syncs are written inside one transaction that is
+rolled back at the end.
+
+    docker compose exec api python -m benchmarks.productivity_sync --repos 1,10,40 --latency 80
+"""
+import argparse
+import asyncio
+import socket
+import threading
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401 — resolve every relationship before querying
+from app.core.config import settings
+from app.core.db import engine
+from app.models.productivity_connection import ProductivityConnection
+from app.services import github_provider, productivity_sync
+from app.services.github_provider import GitHubProvider
+
+COMMITS_PER_REPO = 20
+PRS_PER_REPO = 5
+
+fake_github = FastAPI()
+fake_github.state.latency = 0.0
+
+
+@fake_github.middleware("http")
+async def _latency(request: Request, call_next):
+    await asyncio.sleep(fake_github.state.latency)
+    return await call_next(request)
+
+
+@fake_github.get("/repos/{owner}/{name}/branches")
+async def _branches(owner: str, name: str, page: int = 1):
+    return [{"name": "main"}] if page == 1 else []
+
+
+@fake_github.get("/repos/{owner}/{name}/pulls")
+async def _pulls(owner: str, name: str, page: int = 1):
+    if page > 1:
+        return []
+    now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    return [
+        {
+            "number": n,
+            "title": f"Change {n}",
+            "state": "open",
+            "merged_at": None,
+            "user": {"login": "bench"},
+            "html_url": f"https://github.invalid/{owner}/{name}/pull/{n}",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for n in range(1, PRS_PER_REPO + 1)
+    ]
+
+
+@fake_github.post("/graphql")
+async def _graphql(request: Request):
+    body = await request.json()
+    variables = body["variables"]
+    if "user(login" in body["query"]:
+        return {"data": {"user": {"id": "U_bench"}}}
+    now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    repo = f"{variables['owner']}/{variables['name']}"
+    nodes = [
+        {
+            "oid": uuid.uuid5(uuid.NAMESPACE_URL, f"{repo}#{i}").hex + "00000000",
+            "messageHeadline": f"Commit {i}",
+            "committedDate": now,
+            "additions": i,
+            "deletions": 1,
+            "author": {"name": "bench", "user": {"login": "bench"}},
+            "parents": {"totalCount": 1},
+        }
+        for i in range(COMMITS_PER_REPO)
+    ]
+    history = {"pageInfo": {"hasNextPage": False, "endCursor": None}, "nodes": nodes}
+    return {"data": {"repository": {"object": {"history": history}}}}
+
+
+def _serve() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(fake_github, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}"
+
+
+def _sync_once(db: Session, user_id, repo_count: int, concurrency: int) -> float:
+    conn = ProductivityConnection(
+        created_by_user_id=user_id,
+        provider="github",
+        pat_encrypted="unused",
+        username="bench",
+        display_name=f"bench-{uuid.uuid4().hex[:8]}",
+        selected_repos=[f"bench/repo-{uuid.uuid4().hex[:8]}" for _ in range(repo_count)],
+    )
+    db.add(conn)
+    db.commit()
+    settings.SYNC_REPO_CONCURRENCY = concurrency
+    start = time.perf_counter()
+    result = productivity_sync.sync_connection(conn.id, db)
+    elapsed = time.perf_counter() - start
+    assert not result["errors"], result["errors"]
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repos", default="1,5,10,20,40")
+    parser.add_argument("--concurrency", type=int, default=settings.SYNC_REPO_CONCURRENCY)
+    parser.add_argument("--latency", type=float, default=50.0, help="ms per fake GitHub request")
+    args = parser.parse_args()
+
+    base = _serve()
+    fake_github.state.latency = args.latency / 1000
+    github_provider.BASE_URL = base
+    github_provider.GRAPHQL_URL = f"{base}/graphql"
+    productivity_sync._get_provider = lambda connection: GitHubProvider(
+        pat="bench", username=connection.username
+    )
+
+    with engine.connect() as outer:
+        trans = outer.begin()
+        # Every db.commit() inside the sync releases a savepoint; the outer
+        # transaction is rolled back, so nothing is left behind.
+        db = Session(bind=outer, join_transaction_mode="create_savepoint")
+        user_id = outer.execute(text("SELECT id FROM users LIMIT 1")).scalar()
+        if user_id is None:
+            raise SystemExit("needs at least one row in users to own the bench connection")
+        try:
+            print(f"{'repos':>5}  {'serial':>9}  {f'x{args.concurrency}':>9}  speedup")
+            for count in (int(n) for n in args.repos.split(",")):
+                serial = _sync_once(db, user_id, count, 1)
+                concurrent = _sync_once(db, user_id, count, args.concurrency)
+                print(f"{count:>5}  {serial:8.2f}s  {concurrent:8.2f}s  {serial / concurrent:6.1f}x")
+        finally:
+            db.close()
+            trans.rollback()
+
+
+if __name__ == "__main__":
+    main()
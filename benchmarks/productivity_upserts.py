@@ -0,0 +1,143 @@
+"""Rows/sec storing synced commits and PRs: one statement per row (the old
+sync loop) vs the multi-row INSERT ... ON CONFLICT ... RETURNING chunks
+productivity_sync uses now, at a few chunk sizes.
+
+Each run stores --rows fresh commits (all inserted) and then the same commits
+again (all conflicts), plus --rows // 10 PRs upserted twice. Everything goes
+through the real tables, so the org-blocklist triggers are paid too, inside
+one transaction that is rolled back. Needs a reachable Postgres in
+DATABASE_URL with migrations applied and at least one user:
+
+    docker compose exec api python -m benchmarks.productivity_upserts --rows 5000
+"""
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401 — resolve every relationship before querying
+from app.core.config import settings
+from app.core.db import engine
+from app.models.productivity_commit import ProductivityCommit
+from app.models.productivity_connection import ProductivityConnection
+from app.models.productivity_pull_request import ProductivityPullRequest
+from app.services.productivity_sync import _store_commits, _store_pull_requests
+
+
+def _per_row_commits(db: Session, connection_id, commits: list[dict]) -> int:
+    inserted = 0
+    for c in commits:
+        stmt = pg_insert(ProductivityCommit).values(
+            connection_id=connection_id, **c
+        ).on_conflict_do_nothing(constraint="uq_commit_connection_hash_repo")
+        if db.execute(stmt).rowcount > 0:
+            inserted += 1
+    return inserted
+
+
+def _per_row_prs(db: Session, connection_id, prs: list[dict]) -> int:
+    upserted = 0
+    for pr in prs:
+        stmt = pg_insert(ProductivityPullRequest).values(
+            connection_id=connection_id, **pr
+        ).on_conflict_do_update(
+            constraint="uq_pr_connection_number_repo",
+            set_={"status": pr["status"], "title": pr["title"], "merged_at": pr["merged_at"]},
+        )
+        if db.execute(stmt).rowcount > 0:
+            upserted += 1
+    return upserted
+
+
+def _data(rows: int) -> tuple[list[dict], list[dict]]:
+    now = datetime.utcnow()
+    repo = f"bench/repo-{uuid.uuid4().hex[:8]}"
+    commits = []
+    for i in range(rows):
+        sha = uuid.uuid4().hex + f"{i:08x}"
+        commits.append({
+            "hash": sha,
+            "short_hash": sha[:7],
+            "message": f"fix(sync): handle pagination edge case {i}",
+            "author": "bench",
+            "date": now - timedelta(minutes=i),
+            "additions": i % 300,
+            "deletions": i % 40,
+            "repository": repo,
+            "is_merge": False,
+        })
+    prs = [
+        {
+            "number": n,
+            "title": f"Change {n}",
+            "status": "open",
+            "repository": repo,
+            "url": f"https://github.invalid/{repo}/pull/{n}",
+            "created_at_remote": now,
+            "merged_at": None,
+        }
+        for n in range(1, rows // 10 + 1)
+    ]
+    return commits, prs
+
+
+def _run(db: Session, connection_id, rows: int, chunk: int | None) -> tuple[float, int]:
+    commits, prs = _data(rows)
+    start = time.perf_counter()
+    if chunk is None:
+        written = _per_row_commits(db, connection_id, commits)
+        _per_row_commits(db, connection_id, commits)
+        _per_row_prs(db, connection_id, prs)
+        _per_row_prs(db, connection_id, prs)
+    else:
+        settings.SYNC_UPSERT_CHUNK_SIZE = chunk
+        written = _store_commits(db, connection_id, commits)
+        assert _store_commits(db, connection_id, commits) == 0
+        _store_pull_requests(db, connection_id, prs)
+        _store_pull_requests(db, connection_id, prs)
+    elapsed = time.perf_counter() - start
+    assert written == rows, (written, rows)
+    return elapsed, 2 * rows + 2 * len(prs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--chunks", default="100,500,1000")
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        trans = conn.begin()
+        db = Session(bind=conn)
+        try:
+            user_id = db.execute(text("SELECT id FROM users LIMIT 1")).scalar()
+            if user_id is None:
+                raise SystemExit("needs at least one row in users to own the bench connection")
+            connection = ProductivityConnection(
+                created_by_user_id=user_id,
+                provider="github",
+                pat_encrypted="unused",
+                username="bench",
+                display_name=f"bench-{uuid.uuid4().hex[:8]}",
+            )
+            db.add(connection)
+            db.flush()
+
+            print(f"{'mode':>10} {'rows/s':>10} {'seconds':>9}")
+            variants = [("per-row", None)] + [
+                (f"chunk {n}", n) for n in (int(c) for c in args.chunks.split(","))
+            ]
+            for label, chunk in variants:
+                elapsed, handled = _run(db, connection.id, args.rows, chunk)
+                print(f"{label:>10} {handled / elapsed:>10.0f} {elapsed:>9.2f}")
+        finally:
+            db.close()
+            trans.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,18 @@
 import uuid
+from contextlib import contextmanager
 
+import aiosqlite
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, String, event
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.core.auth import get_current_user
-from app.core.db import Base, get_db
+from app.core.db import Base, get_async_db, get_db
 from app.main import app
 from app.models.user import User
 
@@ -50,6 +53,17 @@ PG_UUID.bind_processor = _uuid_bind_processor_sqlite
 PG_UUID.result_processor = _uuid_result_processor_sqlite
 
 
+# 3. JSONB / ARRAY columns (automations, runs, watchers...) as plain JSON in SQLite
+@compiles(JSONB, "sqlite")
+def compile_jsonb_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@compiles(ARRAY, "sqlite")
+def compile_array_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
 # In-memory SQLite for tests
 engine = create_engine(
     "sqlite://",
@@ -59,6 +73,23 @@ engine = create_engine(
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+async def _shared_aiosqlite_connection():
+    # The in-memory database lives in the sync engine's one connection; the
+    # async engine drives that same sqlite3 connection from aiosqlite's thread.
+    shared = engine.raw_connection().driver_connection
+    return await aiosqlite.Connection(lambda: shared, iter_chunk_size=64)
+
+
+# Async twin for the `async def` routes on get_async_db (runner claims,
+# /briefing, /runner/overview), over the same in-memory database.
+async_engine = create_async_engine(
+    "sqlite+aiosqlite://",
+    poolclass=StaticPool,
+    async_creator=_shared_aiosqlite_connection,
+)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
 @pytest.fixture(autouse=True)
 def setup_db():
     Base.metadata.create_all(bind=engine)
@@ -74,6 +105,11 @@ def override_get_db():
         db.close()
 
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
+
 USER_A_ID = uuid.uuid4()
 USER_B_ID = uuid.uuid4()
 
@@ -86,6 +122,7 @@ class FakeUser:
         self.first_name = "Test"
         self.last_name = "User"
         self.firebase_id = str(user_id)
+        self.role = None
 
 
 def _make_user(user_id: uuid.UUID):
@@ -102,6 +139,7 @@ def make_override_current_user(user_id: uuid.UUID):
 def client_a() -> TestClient:
     """Test client authenticated as User A."""
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     app.dependency_overrides[get_current_user] = make_override_current_user(USER_A_ID)
     client = TestClient(app)
     yield client
@@ -112,6 +150,7 @@ def client_a() -> TestClient:
 def client_b() -> TestClient:
     """Test client authenticated as User B."""
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     app.dependency_overrides[get_current_user] = make_override_current_user(USER_B_ID)
     client = TestClient(app)
     yield client
@@ -122,7 +161,38 @@ def client_b() -> TestClient:
 def unauthenticated_client() -> TestClient:
     """Test client with no auth (dependency overrides only for DB)."""
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     app.dependency_overrides.pop(get_current_user, None)
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def query_budget():
+    """Fail the test when a block runs more SQL statements than declared:
+
+        with query_budget(4):
+            client_a.get("/invoices")
+
+    Seed enough rows that a per-row lazy load (an N+1) blows the budget.
+    Yields the list of statements run so far, for assertions or debugging.
+    """
+    @contextmanager
+    def budget(max_queries: int):
+        statements: list[str] = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        assert len(statements) <= max_queries, (
+            f"{len(statements)} SQL statements, budget is {max_queries}:\n"
+            + "\n".join(statements)
+        )
+
+    return budget
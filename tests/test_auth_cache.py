@@ -0,0 +1,194 @@
+import time
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import inspect
+
+from app.core import auth_cache
+from app.core.config import settings
+from app.models.user import User
+from app.models.user_role import UserRole
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    auth_cache.clear()
+    auth_cache.reset_stats()
+    yield
+    auth_cache.clear()
+    auth_cache.reset_stats()
+
+
+@pytest.fixture()
+def verified(monkeypatch) -> list[str]:
+    """Stand-in for Firebase: "token-<uid>" verifies as <uid>, valid for an hour.
+    Returns the tokens it was asked to verify."""
+    calls: list[str] = []
+
+    def verify(token: str) -> dict:
+        calls.append(token)
+        return {"uid": token.removeprefix("token-"), "exp": time.time() + 3600}
+
+    monkeypatch.setattr("app.core.auth.verify_firebase_token", verify)
+    return calls
+
+
+@pytest.fixture()
+def clock(monkeypatch) -> list[float]:
+    """auth_cache's wall clock, settable through now[0]."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(auth_cache, "time", SimpleNamespace(time=lambda: now[0], perf_counter=time.perf_counter))
+    return now
+
+
+def _user(admin: bool = False) -> User:
+    uid = uuid.uuid4().hex
+    db = TestingSessionLocal()
+    user = User(
+        email=f"{uid}@example.com",
+        first_name="Ada",
+        last_name="Lovelace",
+        firebase_id=uid,
+        role=UserRole(name="ADMIN") if admin else None,
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    db.expunge(user)
+    db.close()
+    return user
+
+
+def _auth(user: User) -> dict:
+    return {"Authorization": f"Bearer token-{user.firebase_id}"}
+
+
+def test_hit_skips_verification_and_is_counted(unauthenticated_client, verified):
+    user = _user()
+
+    for _ in range(3):
+        resp = unauthenticated_client.get("/users/me", headers=_auth(user))
+        assert resp.status_code == 200
+        assert resp.json()["id"] == str(user.id)
+
+    assert verified == [f"token-{user.firebase_id}"]
+    stats = auth_cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 2, 1)
+    assert stats["hit_ratio"] == round(2 / 3, 4)
+
+
+def test_cached_user_is_session_bound_and_edits_save(unauthenticated_client, verified):
+    user = _user(admin=True)
+    unauthenticated_client.get("/users/me", headers=_auth(user))  # miss: cache it
+
+    db = TestingSessionLocal()
+    try:
+        cached = auth_cache.lookup(db, f"token-{user.firebase_id}")
+        assert cached in db and inspect(cached).persistent
+        assert cached.role.name == "ADMIN"
+    finally:
+        db.close()
+
+    # A hit hands the route that merged user; its changes must still commit.
+    resp = unauthenticated_client.put("/users/me", json={"first_name": "Grace"}, headers=_auth(user))
+    assert resp.status_code == 200
+    assert resp.json()["first_name"] == "Grace"
+    db = TestingSessionLocal()
+    assert db.get(User, user.id).first_name == "Grace"
+    db.close()
+
+    # The update invalidated the entry: the next request verifies again.
+    assert auth_cache.stats()["entries"] == 0
+    assert unauthenticated_client.get("/users/me", headers=_auth(user)).json()["first_name"] == "Grace"
+    assert len(verified) == 2
+
+
+def test_soft_delete_drops_the_users_cached_tokens(unauthenticated_client, verified):
+    admin, victim = _user(admin=True), _user()
+    assert unauthenticated_client.get("/users/me", headers=_auth(victim)).status_code == 200
+
+    resp = unauthenticated_client.delete(f"/users/{victim.id}", headers=_auth(admin))
+    assert resp.status_code == 204
+
+    resp = unauthenticated_client.get("/users/me", headers=_auth(victim))
+    assert resp.status_code == 401
+    assert verified.count(f"token-{victim.firebase_id}") == 2
+
+
+def test_entry_expires_at_the_max_ttl(clock, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_CACHE_MAX_TTL_SECONDS", 300)
+    user = _user()
+    auth_cache.store("t", {"exp": clock[0] + 3600}, user, 0.01)
+
+    db = TestingSessionLocal()
+    try:
+        clock[0] += 299
+        assert auth_cache.lookup(db, "t") is not None
+        clock[0] += 2
+        assert auth_cache.lookup(db, "t") is None
+        assert auth_cache.stats()["entries"] == 0
+    finally:
+        db.close()
+
+
+def test_entry_expires_with_the_token(clock, monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_CACHE_MAX_TTL_SECONDS", 300)
+    user = _user()
+    auth_cache.store("t", {"exp": clock[0] + 100}, user, 0.01)
+
+    db = TestingSessionLocal()
+    try:
+        clock[0] += 99
+        assert auth_cache.lookup(db, "t") is not None
+        clock[0] += 2
+        assert auth_cache.lookup(db, "t") is None
+    finally:
+        db.close()
+
+
+def test_token_past_exp_is_never_stored(clock):
+    user = _user()
+    auth_cache.store("t", {"exp": clock[0] - 1}, user, 0.01)
+    auth_cache.store("u", {}, user, 0.01)  # no exp at all
+
+    stats = auth_cache.stats()
+    assert (stats["entries"], stats["misses"]) == (0, 2)
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_CACHE_SIZE", 2)
+    user = _user()
+    claims = {"exp": time.time() + 3600}
+    auth_cache.store("t1", claims, user, 0.01)
+    auth_cache.store("t2", claims, user, 0.01)
+
+    db = TestingSessionLocal()
+    try:
+        assert auth_cache.lookup(db, "t1") is not None  # t2 is now the oldest
+        auth_cache.store("t3", claims, user, 0.01)
+        assert auth_cache.stats()["entries"] == 2
+        assert auth_cache.lookup(db, "t2") is None
+        assert auth_cache.lookup(db, "t1") is not None
+        assert auth_cache.lookup(db, "t3") is not None
+    finally:
+        db.close()
+
+
+def test_hits_and_misses_feed_the_stats(clock):
+    user = _user()
+    auth_cache.store("t", {"exp": clock[0] + 3600}, user, 0.05)
+    db = TestingSessionLocal()
+    try:
+        auth_cache.lookup(db, "t")
+        auth_cache.lookup(db, "t")
+    finally:
+        db.close()
+
+    stats = auth_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["avg_miss_ms"]) == (2, 1, 50.0)
+    assert stats["saved_ms_total"] > 0
+
+    auth_cache.reset_stats()
+    assert (auth_cache.stats()["hits"], auth_cache.stats()["misses"]) == (0, 0)
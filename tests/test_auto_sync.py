@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.models.productivity_connection import ProductivityConnection
+from app.models.sync_job import SyncJob
+from app.scheduler import auto_sync
+from app.services import sync_jobs
+from tests.conftest import TestingSessionLocal
+from tests.test_productivity_sync import _seed_connection
+
+NOW = datetime(2026, 10, 16, 12, 0)
+
+
+def _set(conn_id, **fields) -> None:
+    db = TestingSessionLocal()
+    conn = db.get(ProductivityConnection, conn_id)
+    for name, value in fields.items():
+        setattr(conn, name, value)
+    db.commit()
+    db.close()
+
+
+def _queued(db) -> dict:
+    return {j.connection_id: j for j in db.query(SyncJob).filter(SyncJob.trigger == "scheduled")}
+
+
+def test_due_connections_are_queued_with_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "AUTO_SYNC_INTERVAL_MINUTES", 60)
+    fresh = _seed_connection(["acme/a"])
+    stale = _seed_connection(["acme/b"])
+    failing = _seed_connection(["acme/c"])
+    off = _seed_connection(["acme/d"])
+    _set(fresh, last_sync_attempted_at=NOW - timedelta(minutes=10))
+    _set(stale, last_sync_attempted_at=NOW - timedelta(minutes=90))
+    # Three failures in a row: 60 * 2^3 = 480 minutes before the next try.
+    _set(failing, last_sync_attempted_at=NOW - timedelta(minutes=300), sync_failures=3)
+    _set(off, last_sync_attempted_at=NOW - timedelta(days=3), auto_sync_interval_minutes=0)
+
+    db = TestingSessionLocal()
+    assert auto_sync.queue_due_syncs(db, spread_seconds=300, now=NOW) == 1
+    assert set(_queued(db)) == {stale}
+
+    _set(failing, last_sync_attempted_at=NOW - timedelta(minutes=540))
+    # `stale` already has a pending job; only `failing` is new.
+    assert auto_sync.queue_due_syncs(db, spread_seconds=300, now=NOW) == 1
+    assert set(_queued(db)) == {stale, failing}
+    db.close()
+
+
+def test_cycle_cap_takes_most_overdue_and_staggers_starts(monkeypatch):
+    monkeypatch.setattr(settings, "AUTO_SYNC_INTERVAL_MINUTES", 60)
+    monkeypatch.setattr(settings, "AUTO_SYNC_MAX_PER_CYCLE", 3)
+    ids = []
+    for hours in range(2, 7):
+        conn_id = _seed_connection([f"acme/{hours}"])
+        _set(conn_id, last_sync_attempted_at=NOW - timedelta(hours=hours))
+        ids.append(conn_id)
+
+    db = TestingSessionLocal()
+    assert auto_sync.queue_due_syncs(db, spread_seconds=300, now=NOW) == 3
+    queued = _queued(db)
+    # The three least recently synced, earliest first.
+    assert set(queued) == set(ids[-3:])
+    starts = sorted(j.run_after for j in queued.values())
+    assert starts == [NOW, NOW + timedelta(seconds=100), NOW + timedelta(seconds=200)]
+
+    # Not claimable before its run_after.
+    monkeypatch.setattr(sync_jobs, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(
+        sync_jobs, "sync_connection",
+        lambda connection_id, db: {"commits_synced": 0, "prs_synced": 0, "errors": []},
+    )
+    for job in queued.values():
+        job.run_after = datetime.utcnow() + timedelta(hours=1)
+    db.commit()
+    db.close()
+    assert sync_jobs.drain("test-worker") == 0
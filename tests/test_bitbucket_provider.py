@@ -0,0 +1,62 @@
+import asyncio
+
+import httpx
+
+from app.core import http_pool
+from app.core.config import settings
+from app.services import bitbucket_provider
+from app.services.bitbucket_provider import BitbucketProvider
+
+REPO = "ws/api"
+
+
+def _commit(sha: str, date: str) -> dict:
+    return {
+        "hash": sha,
+        "date": date,
+        "message": f"change {sha}",
+        "author": {"raw": "Dev <dev@example.com>", "user": {"account_id": "acc-1"}},
+        "parents": [{"hash": "p"}],
+    }
+
+
+def test_diffstats_fetched_concurrently_and_skipped_when_known(monkeypatch):
+    monkeypatch.setattr(settings, "BITBUCKET_DIFFSTAT_CONCURRENCY", 3)
+    pages = {
+        "1": {"values": [_commit(f"c{i}", "2026-10-10T00:00:00+00:00") for i in range(5)],
+              "next": f"https://{bitbucket_provider.HOST}/2.0/repositories/{REPO}/commits/main?page=2"},
+        "2": {"values": [_commit(f"c{i}", "2026-10-09T00:00:00+00:00") for i in range(5, 8)]},
+    }
+    diffstats: list[str] = []
+    active = peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active, peak
+        path = request.url.path
+        if "/diffstat/" in path:
+            sha = path.rsplit("/", 1)[1]
+            diffstats.append(sha)
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return httpx.Response(200, json={"values": [{"lines_added": int(sha[1:]), "lines_removed": 1}]})
+        if "/commits/" in path:
+            return httpx.Response(200, json=pages[request.url.params.get("page", "1")])
+        return httpx.Response(200, json={"mainbranch": {"name": "main"}})
+
+    http_pool.set_transport(bitbucket_provider.HOST, httpx.MockTransport(handler))
+    try:
+        provider = BitbucketProvider(pat="x", username="dev", workspace="ws", external_account_id="acc-1")
+        commits = http_pool.run(provider.fetch_commits(
+            REPO, known_diffstats={"c2": {"additions": 40, "deletions": 4}},
+        ))
+    finally:
+        http_pool.set_transport(bitbucket_provider.HOST, None)
+
+    assert [c["hash"] for c in commits] == [f"c{i}" for i in range(8)]
+    assert sorted(diffstats) == [f"c{i}" for i in range(8) if i != 2]
+    assert peak == 3
+    by_hash = {c["hash"]: (c["additions"], c["deletions"]) for c in commits}
+    assert by_hash["c2"] == (40, 4)
+    assert by_hash["c7"] == (7, 1)
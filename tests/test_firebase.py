@@ -0,0 +1,45 @@
+import pytest
+
+from app.core import auth_cache, firebase
+from app.core.config import settings
+
+
+@pytest.fixture(autouse=True)
+def uninitialized(monkeypatch):
+    monkeypatch.setattr(firebase, "_initialized", False)
+    monkeypatch.setattr(firebase, "_init_error", None)
+    auth_cache.clear()
+
+
+def test_bad_credentials_answer_500_not_401(unauthenticated_client, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "FIREBASE_SERVICE_ACCOUNT_PATH", "/nonexistent/service-account.json")
+    headers = {"Authorization": "Bearer some-token"}
+
+    resp = unauthenticated_client.get("/users/me", headers=headers)
+    assert resp.status_code == 500
+    assert "Firebase Admin SDK is not initialized" in caplog.text
+
+    # The failure is remembered, not retried on every request.
+    error = firebase._init_error
+    assert error is not None
+    assert unauthenticated_client.get("/users/me", headers=headers).status_code == 500
+    assert firebase._init_error is error
+
+
+def test_invalid_token_still_answers_401(unauthenticated_client, monkeypatch):
+    def reject(token):
+        raise ValueError("bad signature")
+
+    monkeypatch.setattr("app.core.auth.verify_firebase_token", reject)
+    resp = unauthenticated_client.get("/users/me", headers={"Authorization": "Bearer some-token"})
+    assert resp.status_code == 401
+    assert resp.json()["detail"] == "Invalid or expired token"
+
+
+def test_missing_service_account_file_fails_the_boot_check(monkeypatch):
+    monkeypatch.setattr(settings, "FIREBASE_SERVICE_ACCOUNT_PATH", "/nonexistent/service-account.json")
+    with pytest.raises(firebase.FirebaseInitError):
+        firebase.check_config()
+
+    monkeypatch.setattr(settings, "FIREBASE_SERVICE_ACCOUNT_PATH", "")
+    firebase.check_config()
@@ -0,0 +1,144 @@
+import time
+
+import httpx
+import pytest
+from cryptography.fernet import Fernet
+
+from app.core import http_pool
+from app.core.config import settings
+from app.core.encryption import encrypt_value
+from app.models.productivity_connection import ProductivityConnection
+from app.services import github_provider, github_rate_limit
+from app.services.github_provider import GitHubAccessError, GitHubProvider
+from tests.conftest import USER_A_ID, TestingSessionLocal
+
+
+@pytest.fixture(autouse=True)
+def fresh_budgets():
+    github_rate_limit.clear()
+    yield
+    github_rate_limit.clear()
+    http_pool.set_transport(github_provider.HOST, None)
+
+
+def _stub(responses: list[httpx.Response]) -> list[httpx.Request]:
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return responses.pop(0) if responses else httpx.Response(200, json=[])
+
+    http_pool.set_transport(github_provider.HOST, httpx.MockTransport(handler))
+    return seen
+
+
+def _headers(remaining: int, reset_in: int = 3600) -> dict:
+    return {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(time.time()) + reset_in),
+        "X-RateLimit-Resource": "core",
+    }
+
+
+def test_secondary_limit_pauses_and_retries_instead_of_failing():
+    seen = _stub([
+        httpx.Response(403, headers={"Retry-After": "0"}),
+        httpx.Response(200, json=[{"name": "main"}], headers=_headers(4000)),
+    ])
+    provider = GitHubProvider(pat="ghp_x", username="dev")
+
+    assert http_pool.run(provider.list_branches("acme/api")) == ["main"]
+    assert len(seen) == 3  # rate-limited, retried page 1, empty page 2
+    [budget] = github_rate_limit.snapshot(provider.budget_key)
+    # Page 2 reserved a point and its response carried no headers to reset it.
+    assert budget["remaining"] == 3999 and not budget["paused"]
+
+
+def test_background_calls_leave_the_reserve_to_interactive_ones(monkeypatch):
+    monkeypatch.setattr(settings, "GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS", 60)
+    seen = _stub([])
+    key = github_rate_limit.token_key("ghp_x")
+    github_rate_limit.observe(key, _headers(settings.GITHUB_RATE_LIMIT_RESERVE))
+
+    sync = GitHubProvider(pat="ghp_x", username="dev", priority=github_rate_limit.BACKGROUND)
+    with pytest.raises(GitHubAccessError) as exc:
+        http_pool.run(sync.list_branches("acme/api"))
+    assert exc.value.status == 429
+    assert seen == []
+
+    interactive = GitHubProvider(pat="ghp_x", username="dev")
+    assert http_pool.run(interactive.validate_token())
+    assert len(seen) == 1
+
+
+def test_interactive_calls_fail_fast_instead_of_waiting_out_the_reset(monkeypatch):
+    monkeypatch.setattr(settings, "GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS", 3600)
+    monkeypatch.setattr(settings, "GITHUB_RATE_LIMIT_INTERACTIVE_MAX_WAIT_SECONDS", 5)
+    seen = _stub([])
+    github_rate_limit.observe(github_rate_limit.token_key("ghp_x"), _headers(0, reset_in=600))
+
+    interactive = GitHubProvider(pat="ghp_x", username="dev")
+    started = time.monotonic()
+    with pytest.raises(GitHubAccessError) as exc:
+        http_pool.run(interactive.list_branches("acme/api"))
+    assert exc.value.status == 429
+    assert time.monotonic() - started < 1
+    assert seen == []
+
+
+def test_graphql_rate_limited_200_is_recorded_and_retried(monkeypatch):
+    recorded = []
+    exhausted = github_rate_limit.exhausted
+    monkeypatch.setattr(
+        github_rate_limit, "exhausted",
+        lambda key, resource, headers: recorded.append(resource) or exhausted(key, resource, headers),
+    )
+    limited = {"data": None, "errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]}
+    ok = {"data": {"viewer": {"login": "dev"}}}
+    seen = _stub([
+        httpx.Response(200, json=limited, headers={"Retry-After": "0", "X-RateLimit-Resource": "graphql"}),
+        httpx.Response(200, json=ok),
+    ])
+    provider = GitHubProvider(pat="ghp_x", username="dev")
+
+    async def query():
+        async with http_pool.client(github_provider.HOST) as client:
+            return await provider._graphql(client, "query { viewer { login } }", {})
+
+    assert http_pool.run(query()) == ok
+    assert len(seen) == 2
+    assert recorded == ["graphql"]
+
+
+def test_connection_rate_limit_endpoint(client_a, monkeypatch):
+    monkeypatch.setattr(settings, "ENCRYPTION_KEY", Fernet.generate_key().decode())
+    db = TestingSessionLocal()
+    conn = ProductivityConnection(
+        created_by_user_id=USER_A_ID,
+        provider="github",
+        pat_encrypted=encrypt_value("ghp_x"),
+        username="dev",
+        display_name="dev",
+    )
+    db.add(conn)
+    db.commit()
+    conn_id = conn.id
+    db.close()
+
+    # Nothing seen here yet (the sync may run in another process): ask GitHub.
+    reset = int(time.time()) + 1800
+    seen = _stub([httpx.Response(200, json={"resources": {
+        "core": {"limit": 5000, "remaining": 4321, "used": 679, "reset": reset},
+        "graphql": {"limit": 5000, "remaining": 3, "used": 4997, "reset": reset},
+    }})])
+    core, graphql = client_a.get(f"/productivity/connections/{conn_id}/rate-limit").json()
+    assert [r.url.path for r in seen] == ["/rate_limit"]
+    assert (core["resource"], core["remaining"], core["paused"]) == ("core", 4321, False)
+    assert (graphql["resource"], graphql["remaining"], graphql["paused"]) == ("graphql", 3, True)
+
+    # A fresh local view is served as is.
+    github_rate_limit.observe(github_rate_limit.token_key("ghp_x"), _headers(3))
+    budgets = client_a.get(f"/productivity/connections/{conn_id}/rate-limit").json()
+    assert len(seen) == 1
+    assert budgets[0]["remaining"] == 3 and budgets[0]["paused"] is True
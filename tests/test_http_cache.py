@@ -0,0 +1,59 @@
+import httpx
+import pytest
+
+from app.core import http_pool
+from app.models.http_validator_cache import HttpValidatorCache
+from app.services import github_provider, github_rate_limit, http_cache
+from app.services.github_provider import GitHubProvider
+from tests.conftest import TestingSessionLocal
+
+
+@pytest.fixture()
+def github(monkeypatch):
+    """A GitHub stub that honours If-None-Match on /branches."""
+    monkeypatch.setattr(http_cache, "SessionLocal", TestingSessionLocal)
+    github_rate_limit.clear()
+    state = {"branches": [{"name": "main"}], "requests": []}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"].append(request)
+        if request.url.params.get("page") != "1":
+            return httpx.Response(200, json=[])
+        etag = f'"{len(state["branches"])}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, json=state["branches"], headers={"ETag": etag})
+
+    http_pool.set_transport(github_provider.HOST, httpx.MockTransport(handler))
+    yield state
+    http_pool.set_transport(github_provider.HOST, None)
+
+
+def _validators_sent(state) -> list[str | None]:
+    return [r.headers.get("If-None-Match") for r in state["requests"] if r.url.params["page"] == "1"]
+
+
+def test_unchanged_page_is_served_from_cache(github):
+    provider = GitHubProvider(pat="ghp_x", username="dev")
+
+    assert http_pool.run(provider.list_branches("acme/api")) == ["main"]
+    assert http_pool.run(provider.list_branches("acme/api")) == ["main"]
+    assert _validators_sent(github) == [None, '"1"']
+
+    github["branches"].append({"name": "dev"})
+    assert http_pool.run(provider.list_branches("acme/api")) == ["main", "dev"]
+
+
+def test_cache_is_per_token(github):
+    http_pool.run(GitHubProvider(pat="one", username="dev").list_branches("acme/api"))
+    http_pool.run(GitHubProvider(pat="two", username="dev").list_branches("acme/api"))
+    assert _validators_sent(github) == [None, None]
+
+
+def test_blocklisted_bodies_are_not_stored(github):
+    github["branches"] = [{"name": "novoed-hotfix"}]
+    http_pool.run(GitHubProvider(pat="ghp_x", username="dev").list_branches("acme/api"))
+
+    db = TestingSessionLocal()
+    assert db.query(HttpValidatorCache).count() == 0
+    db.close()
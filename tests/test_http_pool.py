@@ -0,0 +1,81 @@
+import base64
+
+import httpx
+import pytest
+
+from app.core import http_pool
+from app.services import bitbucket_provider, github_provider
+from app.services.bitbucket_provider import BitbucketProvider
+from app.services.github_provider import GitHubProvider
+
+
+@pytest.fixture()
+def stub():
+    """Route both provider hosts to an in-process handler; record each request."""
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.url.host == bitbucket_provider.HOST:
+            return httpx.Response(200, json={"account_id": "acc-1", "nickname": "dev"})
+        page = int(request.url.params.get("page", 1))
+        return httpx.Response(200, json=[{"name": "main"}, {"name": "dev"}] if page == 1 else [])
+
+    transport = httpx.MockTransport(handler)
+    http_pool.set_transport(github_provider.HOST, transport)
+    http_pool.set_transport(bitbucket_provider.HOST, transport)
+    yield seen
+    http_pool.set_transport(github_provider.HOST, None)
+    http_pool.set_transport(bitbucket_provider.HOST, None)
+
+
+async def _github_client():
+    async with http_pool.client(github_provider.HOST) as client:
+        return client
+
+
+def test_one_client_per_host_across_calls(stub):
+    first = http_pool.run(_github_client())
+    provider = GitHubProvider(pat="ghp_x", username="dev")
+    assert http_pool.run(provider.list_branches("acme/api")) == ["main", "dev"]
+    assert http_pool.run(_github_client()) is first
+    assert not first.is_closed
+    assert [r.url.params["page"] for r in stub] == ["1", "2"]
+    assert all(r.headers["Authorization"] == "token ghp_x" for r in stub)
+
+
+def test_credentials_are_per_request_on_the_shared_client(stub):
+    http_pool.run(BitbucketProvider(pat="one", username="a").get_current_user())
+    http_pool.run(BitbucketProvider(pat="two", username="b").get_current_user())
+    auths = [base64.b64decode(r.headers["Authorization"].split()[1]) for r in stub]
+    assert auths == [b"a:one", b"b:two"]
+
+
+def test_cookies_from_one_token_never_reach_another():
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(
+            200,
+            json={"account_id": "acc-1", "nickname": "dev"},
+            headers={"Set-Cookie": "session=secret-of-a; Path=/"},
+        )
+
+    http_pool.set_transport(bitbucket_provider.HOST, httpx.MockTransport(handler))
+    try:
+        http_pool.run(BitbucketProvider(pat="one", username="a").get_current_user())
+        http_pool.run(BitbucketProvider(pat="two", username="b").get_current_user())
+    finally:
+        http_pool.set_transport(bitbucket_provider.HOST, None)
+
+    assert len(seen) == 2
+    assert "cookie" not in seen[1].headers
+
+
+def test_run_refuses_to_block_its_own_loop():
+    async def nested():
+        http_pool.run(_github_client())
+
+    with pytest.raises(RuntimeError):
+        http_pool.run(nested())
@@ -0,0 +1,152 @@
+import gzip
+import json
+
+import pytest
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.local_commit import LocalCommit
+from tests.conftest import TestingSessionLocal, engine
+
+
+def _line(h: str, remote: str = "git@github.com:acme/api.git", **extra) -> str:
+    return json.dumps({
+        "hash": h,
+        "message": f"commit {h}",
+        "author": "Dev",
+        "email": "dev@example.com",
+        "timestamp": "2026-10-15T10:00:00+00:00",
+        "branch": "main",
+        "additions": 3,
+        "deletions": 1,
+        "repo": "api",
+        "remote": remote,
+        **extra,
+    })
+
+
+def _stored() -> list[tuple[str, str]]:
+    db = TestingSessionLocal()
+    try:
+        return sorted((c.hash, c.remote_url) for c in db.query(LocalCommit))
+    finally:
+        db.close()
+
+
+def test_flush_counts_stay_exact_across_chunks(client_a, monkeypatch):
+    monkeypatch.setattr(settings, "LOCAL_COMMITS_FLUSH_CHUNK_SIZE", 2)
+    lines = [
+        _line("a" * 40),
+        "",
+        _line("b" * 40),
+        "{not json",
+        _line("a" * 40),  # duplicate within the body, next chunk
+        json.dumps({"message": "no hash"}),
+        _line("c" * 40),
+        _line("c" * 40),  # duplicate within the same chunk
+        _line("a" * 40, remote=""),  # same hash, other remote: distinct
+    ]
+    resp = client_a.post("/productivity/local-commits/flush", content="\n".join(lines))
+    body = resp.json()
+
+    assert (body["received"], body["stored"], body["duplicates"]) == (8, 4, 2)
+    assert body["errors"][0].startswith("line 3: invalid JSON")
+    assert body["errors"][1] == "line 5: 'hash'"
+    assert len(_stored()) == 4
+
+    again = client_a.post("/productivity/local-commits/flush", content="\n".join(lines)).json()
+    assert (again["received"], again["stored"], again["duplicates"]) == (8, 0, 6)
+
+
+def test_flush_accepts_gzip_and_scans_it_for_the_blocklist(client_a):
+    body = gzip.compress("\n".join([_line("d" * 40), _line("e" * 40)]).encode())
+    resp = client_a.post(
+        "/productivity/local-commits/flush",
+        content=body,
+        headers={"Content-Encoding": "gzip"},
+    )
+    assert resp.json() == {"received": 2, "stored": 2, "duplicates": 0, "errors": []}
+
+    blocked = gzip.compress(_line("f" * 40, remote="git@github.com:novoed/app.git").encode())
+    resp = client_a.post(
+        "/productivity/local-commits/flush",
+        content=blocked,
+        headers={"Content-Encoding": "gzip"},
+    )
+    assert resp.status_code == 451
+    assert [h for h, _ in _stored()] == ["d" * 40, "e" * 40]
+
+    resp = client_a.post(
+        "/productivity/local-commits/flush",
+        content=body[:-8],
+        headers={"Content-Encoding": "gzip"},
+    )
+    assert resp.status_code == 400
+
+
+@pytest.fixture
+def real_savepoints():
+    """pysqlite defers BEGIN until the first write, so a SAVEPOINT opened
+    before it acts as the outer transaction and its RELEASE commits. Emit
+    BEGIN explicitly so begin_nested() nests like it does on Postgres."""
+    dbapi = engine.raw_connection().driver_connection  # the one StaticPool connection
+    saved = dbapi.isolation_level
+    dbapi.isolation_level = None
+
+    def begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    event.listen(engine, "begin", begin)
+    yield
+    event.remove(engine, "begin", begin)
+    dbapi.isolation_level = saved
+
+
+@pytest.mark.usefixtures("real_savepoints")
+def test_blocked_line_rolls_back_the_chunks_already_stored(client_a, monkeypatch):
+    monkeypatch.setattr(settings, "LOCAL_COMMITS_FLUSH_CHUNK_SIZE", 1)
+    body = gzip.compress("\n".join([
+        _line("d" * 40),
+        _line("e" * 40),
+        _line("f" * 40, remote="git@github.com:novoed/app.git"),
+    ]).encode())
+    resp = client_a.post(
+        "/productivity/local-commits/flush",
+        content=body,
+        headers={"Content-Encoding": "gzip"},
+    )
+    assert resp.status_code == 451
+    assert _stored() == []
+
+
+def test_oversized_line_is_reported_not_buffered(client_a, monkeypatch):
+    monkeypatch.setattr(settings, "LOCAL_COMMITS_MAX_LINE_BYTES", 400)
+    lines = [_line("a" * 40, message="x" * 1000), _line("b" * 40)]
+    body = client_a.post("/productivity/local-commits/flush", content="\n".join(lines)).json()
+
+    assert (body["received"], body["stored"]) == (2, 1)
+    assert body["errors"] == ["line 1: longer than 400 bytes"]
+
+
+def test_by_repo_merges_remote_variants_from_the_rollup(client_a):
+    from tests.conftest import USER_A_ID
+
+    me = f"{USER_A_ID}@test.com".upper()
+    lines = [
+        _line("1" * 40, email=me, timestamp="2026-10-01T09:00:00+00:00"),
+        _line("2" * 40, remote="https://github.com/acme/api.git", email=me,
+              timestamp="2026-10-02T23:30:00-03:00"),  # 2026-10-03 UTC
+        _line("3" * 40, remote="", repo="scratch", email=me, timestamp="2026-10-02T10:00:00+00:00"),
+        _line("4" * 40, email="someone@else.com"),
+        _line("5" * 40, email=me, timestamp="2026-09-30T23:59:00+00:00"),  # before the range
+    ]
+    client_a.post("/productivity/local-commits/flush", content="\n".join(lines))
+
+    rows = client_a.get(
+        "/productivity/local-commits/by-repo", params={"from": "2026-10-01", "to": "2026-10-03"}
+    ).json()
+    assert [(r["display"], r["commits"], r["additions"]) for r in rows] == [
+        ("acme/api", 2, 6),
+        ("(local) scratch", 1, 3),
+    ]
+    assert rows[0]["last_commit"].startswith("2026-10-03T02:30:00")
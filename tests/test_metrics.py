@@ -0,0 +1,42 @@
+import re
+
+from app.core import metrics
+
+
+def _sample(text: str, name: str, **labels) -> float:
+    wanted = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    for line in text.splitlines():
+        if line.startswith(f"{name}{{") and wanted in line:
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{name} {labels} not in metrics")
+
+
+def test_server_timing_header_counts_queries(client_a):
+    resp = client_a.post("/customers", json={"legal_name": "Acme Corp"})
+    assert resp.status_code == 201
+    timing = resp.headers["server-timing"]
+    queries = int(re.search(r'desc="(\d+) queries"', timing).group(1))
+    assert queries >= 1
+    assert timing.startswith("app;dur=")
+
+
+def test_metrics_labels_by_route_template(client_a):
+    metrics.reset()
+    customer = client_a.post("/customers", json={"legal_name": "Acme Corp"}).json()
+    client_a.get(f"/customers/{customer['id']}")
+    client_a.get(f"/customers/{customer['id']}")
+
+    text = client_a.get("/metrics").text
+    assert customer["id"] not in text
+    assert _sample(text, "http_requests_total", method="GET", route="/customers/{customer_id}", status="200") == 2
+    assert _sample(text, "http_request_duration_seconds_count", method="GET", route="/customers/{customer_id}") == 2
+    assert _sample(text, "http_request_db_queries_sum", method="POST", route="/customers") >= 1
+    assert _sample(text, "http_response_size_bytes_total", method="GET", route="/customers/{customer_id}") > 0
+
+
+def test_unmatched_paths_share_one_label(client_a):
+    metrics.reset()
+    client_a.get("/no-such-route/1")
+    client_a.get("/no-such-route/2")
+    text = client_a.get("/metrics").text
+    assert _sample(text, "http_requests_total", method="GET", route="<unmatched>", status="404") == 2
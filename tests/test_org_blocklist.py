@@ -0,0 +1,106 @@
+import asyncio
+import json
+
+from app.core.org_blocklist import OrgBlocklistMiddleware, _StreamScanner, find_blocked
+
+
+def _scan(chunks: list[bytes]) -> str | None:
+    scanner = _StreamScanner()
+    for i, chunk in enumerate(chunks):
+        term = scanner.feed(chunk, final=i == len(chunks) - 1)
+        if term:
+            return term
+    return None
+
+
+def _run_middleware(chunks: list[bytes], path: str = "/echo"):
+    """Drive the middleware with a body split into `chunks`. The inner app
+    reads the whole body, like every FastAPI endpoint does, and echoes its size."""
+    seen: list[bytes] = []
+    sent: list[dict] = []
+
+    async def app(scope, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise RuntimeError("client disconnected")
+            seen.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        payload = json.dumps({"size": sum(len(c) for c in seen)}).encode()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": payload})
+
+    queue = [
+        {"type": "http.request", "body": c, "more_body": i < len(chunks) - 1}
+        for i, c in enumerate(chunks)
+    ]
+
+    async def receive():
+        return queue.pop(0) if queue else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "path": path, "query_string": b""}
+    asyncio.run(OrgBlocklistMiddleware(app)(scope, receive, send))
+    return seen, sent
+
+
+# --- Scanner ---
+
+def test_scanner_catches_terms_split_at_every_offset():
+    for text in (
+        "deploy to origami_develop now",
+        "see NOV-1234 for details",
+        "the Venture Shell repo",
+        '{"org": "NovoEdWeb"}',
+    ):
+        body = ("x " * 100 + text + " y" * 100).encode()
+        for cut in range(1, len(body)):
+            assert _scan([body[:cut], body[cut:]]) == find_blocked(body.decode()), (text, cut)
+
+
+def test_scanner_respects_ticket_word_boundary_across_chunks():
+    # "NOV-123" followed by more word characters is not a ticket key.
+    assert _scan([b"ref NOV-123", b"abc and more"]) is None
+    assert _scan([b"ref NOV-123", b"4 and more"]) == "NOV-1234"
+    assert _scan([b"xNOV-123 ", b"tail"]) is None
+
+
+def test_scanner_handles_multibyte_characters_split_across_chunks():
+    body = "ação venture shell".encode()
+    assert _scan([body[:2], body[2:]]) == "venture shell"
+
+
+def test_scanner_clean_body_in_small_chunks():
+    body = b"nothing to see here, november 25 " * 500
+    chunks = [body[i:i + 7] for i in range(0, len(body), 7)]
+    assert _scan(chunks) is None
+
+
+# --- Middleware ---
+
+def test_middleware_streams_clean_body_through_unchanged():
+    chunks = [b'{"a": "', b"x" * 1000, b'"}']
+    seen, sent = _run_middleware(chunks)
+    assert seen == chunks
+    assert sent[0]["status"] == 200
+
+
+def test_middleware_rejects_term_in_last_chunk_before_app_sees_it():
+    seen, sent = _run_middleware([b'{"log": "', b"ok " * 100, b'origami_master"}'])
+    assert b"origami" not in b"".join(seen)
+    assert sent[0]["status"] == 451
+    assert "origami_master" in json.loads(sent[1]["body"])["detail"]
+
+
+def test_middleware_rejects_term_split_across_chunks():
+    _, sent = _run_middleware([b'{"ticket": "NOV-', b'4821"}'])
+    assert sent[0]["status"] == 451
+
+
+def test_middleware_rejects_blocked_path_without_calling_app():
+    seen, sent = _run_middleware([b"{}"], path="/repos/novoedweb")
+    assert seen == []
+    assert sent[0]["status"] == 451
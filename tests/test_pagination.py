@@ -0,0 +1,66 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.models.transaction import Transaction
+from tests.conftest import USER_A_ID, TestingSessionLocal
+
+
+def _seed_transactions(n: int) -> None:
+    db = TestingSessionLocal()
+    # Several rows per date, so paging has to break ties on created_at and id.
+    db.add_all([
+        Transaction(
+            created_by_user_id=USER_A_ID,
+            type="expense",
+            context="business",
+            description=f"Payment {i}",
+            amount=Decimal("10.00"),
+            date=date(2025, 1, 1) + timedelta(days=i // 4),
+        )
+        for i in range(n)
+    ])
+    db.commit()
+    db.close()
+
+
+def _walk(client, path: str, limit: int) -> tuple[list[dict], int]:
+    items, pages, cursor = [], 0, None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        resp = client.get(path, params=params)
+        assert resp.status_code == 200
+        assert len(resp.json()) <= limit
+        items += resp.json()
+        pages += 1
+        cursor = resp.headers.get("x-next-cursor")
+        if not cursor:
+            return items, pages
+
+
+def test_cursor_pages_match_unpaginated_list(client_a):
+    _seed_transactions(53)
+    everything = client_a.get("/transactions").json()
+    assert len(everything) == 53
+
+    paged, pages = _walk(client_a, "/transactions", limit=10)
+    assert pages == 6
+    assert [t["id"] for t in paged] == [t["id"] for t in everything]
+
+
+def test_legacy_request_without_limit_returns_everything(client_a):
+    _seed_transactions(30)
+    resp = client_a.get("/transactions")
+    assert len(resp.json()) == 30
+    assert "x-next-cursor" not in resp.headers
+
+
+def test_last_page_has_no_cursor(client_a):
+    _seed_transactions(5)
+    resp = client_a.get("/transactions", params={"limit": 5})
+    assert len(resp.json()) == 5
+    assert "x-next-cursor" not in resp.headers
+
+
+def test_invalid_cursor_is_rejected(client_a):
+    resp = client_a.get("/transactions", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
@@ -0,0 +1,87 @@
+from datetime import datetime
+
+from app.models.productivity_daily import ProductivityDaily
+from app.services import productivity_rollup
+from app.services.productivity_sync import _store_commits, _store_pull_requests
+from tests.conftest import TestingSessionLocal
+from tests.test_productivity_sync import _seed_connection
+
+
+def _commit(h: str, repo: str, date: datetime, is_merge: bool = False) -> dict:
+    return {
+        "hash": h * 40, "short_hash": h * 7, "message": h, "author": "dev",
+        "date": date, "additions": 10, "deletions": 2, "repository": repo,
+        "is_merge": is_merge,
+    }
+
+
+def _pr(number: int, repo: str, created: datetime, status: str = "open") -> dict:
+    return {
+        "number": number, "title": f"PR {number}", "status": status, "repository": repo,
+        "url": f"https://example.com/{number}", "created_at_remote": created,
+    }
+
+
+def _rollup(conn_id) -> list[tuple]:
+    db = TestingSessionLocal()
+    try:
+        rows = db.query(ProductivityDaily).filter(ProductivityDaily.connection_id == conn_id)
+        return sorted(
+            (r.repository, r.day.isoformat(), r.commits, r.additions, r.deletions, r.prs)
+            for r in rows
+        )
+    finally:
+        db.close()
+
+
+def _sync_rows(conn_id) -> None:
+    db = TestingSessionLocal()
+    oct1, oct2 = datetime(2026, 10, 1, 9), datetime(2026, 10, 2, 23, 59)
+    _store_commits(db, conn_id, [
+        _commit("a", "acme/api", oct1),
+        _commit("b", "acme/api", oct1),
+        _commit("m", "acme/api", oct1, is_merge=True),
+        _commit("c", "acme/web", oct2),
+    ])
+    _store_pull_requests(db, conn_id, [_pr(1, "acme/api", oct1), _pr(2, "acme/web", oct2)])
+    db.commit()
+    # A resync returns the same commits and PRs, one of them now merged.
+    _store_commits(db, conn_id, [_commit("a", "acme/api", oct1), _commit("d", "acme/api", oct2)])
+    _store_pull_requests(db, conn_id, [_pr(1, "acme/api", oct1, status="merged")])
+    db.commit()
+    db.close()
+
+
+def test_sync_maintains_the_rollup_and_rebuild_matches():
+    conn_id = _seed_connection(["acme/api", "acme/web"])
+    _sync_rows(conn_id)
+
+    expected = [
+        ("acme/api", "2026-10-01", 2, 20, 4, 1),
+        ("acme/api", "2026-10-02", 1, 10, 2, 0),
+        ("acme/web", "2026-10-02", 1, 10, 2, 1),
+    ]
+    assert _rollup(conn_id) == expected
+
+    db = TestingSessionLocal()
+    assert productivity_rollup.rebuild(db, conn_id) == 3
+    db.commit()
+    db.close()
+    assert _rollup(conn_id) == expected
+
+
+def test_stats_endpoints_read_the_rollup(client_a):
+    conn_id = _seed_connection(["acme/api", "acme/web"])
+    _sync_rows(conn_id)
+
+    stats = client_a.get(
+        f"/productivity/connections/{conn_id}/stats",
+        params={"date_from": "2026-10-02", "date_to": "2026-10-02"},
+    ).json()
+    assert (stats["commits_count"], stats["prs_count"], stats["total_additions"]) == (2, 1, 20)
+
+    totals = client_a.get("/productivity/stats").json()
+    assert (totals["total_commits"], totals["total_prs"], totals["total_deletions"]) == (4, 2, 8)
+
+    bad = client_a.get("/productivity/stats", params={"date_from": "10/02/2026"})
+    assert bad.status_code == 400
@@ -0,0 +1,209 @@
+import asyncio
+import threading
+import uuid
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.models.productivity_connection import ProductivityConnection
+from app.services import productivity_sync
+from app.services.github_provider import GitHubAccessError, GitHubProvider
+from tests.conftest import USER_A_ID, TestingSessionLocal
+
+
+class FakeProvider:
+    """Records how many repos are being fetched at once; fails on demand."""
+
+    def __init__(self, fail: dict[str, int] | None = None):
+        self.fail = fail or {}
+        self.active = 0
+        self.peak = 0
+        self.fetched: list[str] = []
+
+    async def fetch_commits(self, repo, since=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            self.fetched.append(repo)
+            if repo in self.fail:
+                raise GitHubAccessError(self.fail[repo], f"{repo} failed")
+            return []
+        finally:
+            self.active -= 1
+
+    async def fetch_pull_requests(self, repo, since=None):
+        return []
+
+
+def _seed_connection(repos: list[str]) -> uuid.UUID:
+    db = TestingSessionLocal()
+    conn = ProductivityConnection(
+        created_by_user_id=USER_A_ID,
+        provider="github",
+        pat_encrypted="unused",
+        username="dev",
+        display_name="dev",
+        selected_repos=repos,
+    )
+    db.add(conn)
+    db.commit()
+    conn_id = conn.id
+    db.close()
+    return conn_id
+
+
+def _sync(monkeypatch, provider: FakeProvider, repos: list[str], concurrency: int):
+    monkeypatch.setattr(productivity_sync, "_get_provider", lambda connection: provider)
+    monkeypatch.setattr(settings, "SYNC_REPO_CONCURRENCY", concurrency)
+    conn_id = _seed_connection(repos)
+    db = TestingSessionLocal()
+    try:
+        result = productivity_sync.sync_connection(conn_id, db)
+        conn = db.get(ProductivityConnection, conn_id)
+        return result, conn
+    finally:
+        db.close()
+
+
+def test_repos_fetched_concurrently_up_to_the_cap(monkeypatch):
+    repos = [f"acme/repo-{i}" for i in range(10)]
+    provider = FakeProvider()
+    result, conn = _sync(monkeypatch, provider, repos, concurrency=3)
+
+    assert result["errors"] == []
+    assert provider.peak == 3
+    assert sorted(provider.fetched) == sorted(repos)
+    assert set(conn.repo_synced_at) == set(repos)
+    assert conn.last_sync_status == "success"
+
+
+def test_connection_wide_error_skips_remaining_repos(monkeypatch):
+    repos = ["acme/a", "acme/b", "acme/c"]
+    provider = FakeProvider(fail={"acme/a": 429})
+    result, conn = _sync(monkeypatch, provider, repos, concurrency=1)
+
+    assert provider.fetched == ["acme/a"]
+    assert result["errors"] == [
+        "Commits error for acme/a: acme/a failed",
+        "Skipped acme/b: acme/a failed",
+        "Skipped acme/c: acme/a failed",
+    ]
+    assert conn.repo_synced_at == {}
+    assert conn.last_sync_status == "error"
+
+
+def test_repo_error_only_holds_back_its_own_watermark(monkeypatch):
+    repos = ["acme/a", "acme/b", "acme/c"]
+    provider = FakeProvider(fail={"acme/b": 404})
+    result, conn = _sync(monkeypatch, provider, repos, concurrency=3)
+
+    assert result["errors"] == ["Commits error for acme/b: acme/b failed"]
+    assert set(conn.repo_synced_at) == {"acme/a", "acme/c"}
+
+
+class FakeGitHub(GitHubProvider):
+    """Branch heads from a dict; records which branches had history crawled."""
+
+    def __init__(self, heads: dict[str, dict[str, str]], search=None):
+        super().__init__(pat="ghp_x", username="dev")
+        self.heads = heads
+        self.search = search
+        self.crawled: list[tuple[str, list[str]]] = []
+        self.listed_prs: list[str] = []
+
+    async def fetch_branch_heads(self, repos):
+        return {repo: dict(self.heads[repo]) for repo in repos}
+
+    async def fetch_commits(self, repo, since=None, branches=None):
+        self.crawled.append((repo, sorted(branches)))
+        return []
+
+    async def search_pull_requests(self, since=None, repos=None):
+        if isinstance(self.search, Exception):
+            raise self.search
+        return self.search
+
+    async def fetch_pull_requests(self, repo, since=None):
+        self.listed_prs.append(repo)
+        return []
+
+
+def test_unchanged_branch_heads_are_not_crawled(monkeypatch):
+    provider = FakeGitHub({
+        "acme/a": {"main": "a1", "dev": "d1"},
+        "acme/b": {"main": "b1"},
+    })
+    monkeypatch.setattr(productivity_sync, "_get_provider", lambda connection: provider)
+    conn_id = _seed_connection(["acme/a", "acme/b"])
+    db = TestingSessionLocal()
+
+    first = productivity_sync.sync_connection(conn_id, db)
+    assert (first["branches_crawled"], first["branches_skipped"]) == (3, 0)
+
+    provider.heads["acme/a"]["dev"] = "d2"
+    provider.crawled.clear()
+    second = productivity_sync.sync_connection(conn_id, db)
+    assert (second["branches_crawled"], second["branches_skipped"]) == (1, 2)
+    assert provider.crawled == [("acme/a", ["dev"])]
+
+    db.expire_all()
+    conn = db.get(ProductivityConnection, conn_id)
+    assert conn.branch_heads["acme/a"] == {"main": "a1", "dev": "d2"}
+    db.close()
+
+
+def _pr(repo: str, number: int) -> dict:
+    return {
+        "number": number,
+        "title": f"PR {number}",
+        "status": "open",
+        "repository": repo,
+        "url": f"https://github.com/{repo}/pull/{number}",
+        "created_at_remote": datetime.now(timezone.utc).isoformat(),
+        "merged_at": None,
+    }
+
+
+def test_pr_search_fans_out_per_repo_and_falls_back_to_rest(monkeypatch):
+    stored: dict[str, list[int]] = {}
+
+    def store(db, connection_id, prs):
+        for pr in prs:
+            stored.setdefault(pr["repository"], []).append(pr["number"])
+        return len(prs)
+
+    monkeypatch.setattr(productivity_sync, "_store_pull_requests", store)
+    provider = FakeGitHub(
+        {"acme/a": {"main": "a1"}, "acme/b": {"main": "b1"}},
+        search={"acme/a": [_pr("acme/a", 1), _pr("acme/a", 2)]},
+    )
+    monkeypatch.setattr(productivity_sync, "_get_provider", lambda connection: provider)
+    conn_id = _seed_connection(["acme/a", "acme/b"])
+    db = TestingSessionLocal()
+
+    result = productivity_sync.sync_connection(conn_id, db)
+    assert result["prs_synced"] == 2
+    assert stored == {"acme/a": [1, 2]}
+    assert provider.listed_prs == []
+
+    provider.search = RuntimeError("search unavailable")
+    result = productivity_sync.sync_connection(conn_id, db)
+    assert result["errors"] == []
+    assert sorted(provider.listed_prs) == ["acme/a", "acme/b"]
+    db.close()
+
+
+def test_db_work_runs_off_the_http_pool_loop(monkeypatch):
+    store_threads = []
+
+    def store(db, connection_id, rows):
+        store_threads.append(threading.current_thread().name)
+        return 0
+
+    monkeypatch.setattr(productivity_sync, "_store_commits", store)
+    monkeypatch.setattr(productivity_sync, "_store_pull_requests", store)
+    result, conn = _sync(monkeypatch, FakeProvider(), ["acme/a", "acme/b"], concurrency=2)
+
+    assert result["errors"] == [] and conn.last_sync_status == "success"
+    assert len(store_threads) == 4
+    assert "http-pool" not in store_threads
@@ -0,0 +1,331 @@
+"""SQL statement budgets for list endpoints.
+
+Each test seeds well over 100 rows (with related rows where the response
+touches a relationship) and caps the statements the endpoint may run. A
+relationship loaded once per row instead of eagerly blows the cap, so an
+N+1 shows up here as a failure listing every statement.
+"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from app.models.address_pr_run import AddressPrRun
+from app.models.address_pr_step import AddressPrStep
+from app.models.automation import Automation
+from app.models.automation_run import AutomationRun
+from app.models.bank_account import BankAccount
+from app.models.code_review_run import CodeReviewRun
+from app.models.code_review_step import CodeReviewStep
+from app.models.contract import Contract
+from app.models.customer import Customer
+from app.models.idea import Idea
+from app.models.implementation_run import ImplementationRun
+from app.models.implementation_step import ImplementationStep
+from app.models.invoice import Invoice
+from app.models.invoice_service import InvoiceService
+from app.models.productivity_commit import ProductivityCommit
+from app.models.productivity_connection import ProductivityConnection
+from app.models.productivity_pull_request import ProductivityPullRequest
+from app.models.transaction import Transaction
+from app.models.transaction_category import TransactionCategory
+from app.models.video import Video
+from app.models.watcher import Watcher
+from app.services.platform_events_service import _awaiting_approval_items
+from tests.conftest import USER_A_ID, TestingSessionLocal
+
+ROWS = 120
+
+
+def _seed(*objects) -> None:
+    db = TestingSessionLocal()
+    db.add_all(objects)
+    db.commit()
+    db.close()
+
+
+def _customers(n: int = ROWS) -> list[Customer]:
+    return [Customer(created_by_user_id=USER_A_ID, legal_name=f"Acme {i:03d}") for i in range(n)]
+
+
+def _bank_account() -> BankAccount:
+    return BankAccount(
+        created_by_user_id=USER_A_ID,
+        label="USD Account",
+        beneficiary_full_name="Test Company Inc.",
+        beneficiary_account_number="123456789",
+        swift_code="CITIUS33",
+    )
+
+
+def _connection(**fields) -> ProductivityConnection:
+    return ProductivityConnection(
+        created_by_user_id=USER_A_ID,
+        provider="github",
+        pat_encrypted="x",
+        username="dev",
+        display_name="Acme",
+        **fields,
+    )
+
+
+def _seed_connection() -> ProductivityConnection:
+    connection = _connection()
+    db = TestingSessionLocal()
+    db.add(connection)
+    db.commit()
+    db.refresh(connection)
+    db.close()
+    return connection
+
+
+# --- Finance ---
+
+def test_list_customers_budget(client_a, query_budget):
+    _seed(*_customers())
+    with query_budget(1):
+        assert len(client_a.get("/customers").json()) == ROWS
+
+
+def test_list_invoices_budget(client_a, query_budget):
+    account = _bank_account()
+    invoices = [
+        Invoice(
+            created_by_user_id=USER_A_ID,
+            customer=customer,
+            bank_account=account,
+            invoice_number=f"INV-{i:06d}",
+            issue_date=date(2025, 1, 1) + timedelta(days=i),
+            due_date=date(2025, 2, 1) + timedelta(days=i),
+            total_amount=Decimal("100.00"),
+            services=[InvoiceService(created_by_user_id=USER_A_ID, service_title="Dev", amount=Decimal("100.00"))],
+        )
+        for i, customer in enumerate(_customers())
+    ]
+    _seed(*invoices)
+    with query_budget(1):
+        assert len(client_a.get("/invoices").json()) == ROWS
+
+
+def test_list_contracts_budget(client_a, query_budget):
+    _seed(*[
+        Contract(created_by_user_id=USER_A_ID, customer=customer, name=f"Contract {i}")
+        for i, customer in enumerate(_customers())
+    ])
+    with query_budget(1):
+        assert len(client_a.get("/contracts").json()) == ROWS
+
+
+def test_list_transactions_budget(client_a, query_budget):
+    account = _bank_account()
+    categories = [TransactionCategory(created_by_user_id=USER_A_ID, name=f"Cat {i}") for i in range(10)]
+    _seed(*[
+        Transaction(
+            created_by_user_id=USER_A_ID,
+            type="expense",
+            context="business",
+            description=f"Payment {i}",
+            amount=Decimal("10.00"),
+            date=date(2025, 1, 1) + timedelta(days=i),
+            category=categories[i % 10],
+            bank_account=account,
+        )
+        for i in range(ROWS)
+    ])
+    with query_budget(1):
+        assert len(client_a.get("/transactions").json()) == ROWS
+
+
+def test_search_budget(client_a, query_budget):
+    customers = _customers()
+    _seed(*customers, *[
+        Invoice(
+            created_by_user_id=USER_A_ID,
+            customer=customer,
+            invoice_number=f"INV-{i:06d}",
+            issue_date=date(2025, 1, 1),
+            due_date=date(2025, 2, 1),
+        )
+        for i, customer in enumerate(customers)
+    ])
+    # One query per category searched; users only for admins.
+    with query_budget(6):
+        assert client_a.get("/search", params={"q": "Acme"}).status_code == 200
+
+
+# --- Agent platform ---
+
+def test_list_automations_budget(client_a, query_budget):
+    today = date(2025, 6, 1)
+    automations = [
+        Automation(
+            user_id=USER_A_ID,
+            name=f"Automation {i}",
+            skill="/report",
+            frequency="daily",
+            runs=[
+                AutomationRun(scheduled_for=today - timedelta(days=d), status="done")
+                for d in range(8)
+            ],
+        )
+        for i in range(ROWS)
+    ]
+    _seed(*automations)
+    with query_budget(2):
+        body = client_a.get("/automations").json()
+    assert len(body) == ROWS
+    recent = body[0]["recent_runs"]
+    assert len(recent) == 5
+    assert recent[0]["scheduled_for"] == today.isoformat()
+
+
+def test_list_implementation_runs_budget(client_a, query_budget):
+    connection = _connection()
+    _seed(*[
+        ImplementationRun(
+            created_by_user_id=USER_A_ID,
+            connection=connection,
+            ticket_url=f"https://jira.example.com/browse/T-{i}",
+            steps=[ImplementationStep(kind=kind, position=p) for p, kind in enumerate(("plan", "implement", "pr"))],
+        )
+        for i in range(ROWS)
+    ])
+    with query_budget(2):
+        body = client_a.get("/implementations/runs").json()
+    assert len(body) == ROWS
+    assert len(body[0]["steps"]) == 3
+
+
+def test_list_code_review_runs_budget(client_a, query_budget):
+    connection = _connection()
+    _seed(*[
+        CodeReviewRun(
+            created_by_user_id=USER_A_ID,
+            connection=connection,
+            pr_url=f"https://github.com/acme/api/pull/{i}",
+            steps=[CodeReviewStep(kind=kind, position=p) for p, kind in enumerate(("review_draft", "post_review"))],
+        )
+        for i in range(ROWS)
+    ])
+    with query_budget(2):
+        body = client_a.get("/code-reviews/runs").json()
+    assert len(body) == ROWS
+    assert body[0]["connection_name"] == "Acme"
+    assert len(body[0]["steps"]) == 2
+
+
+def test_list_address_pr_runs_budget(client_a, query_budget):
+    connection = _connection()
+    _seed(*[
+        AddressPrRun(
+            created_by_user_id=USER_A_ID,
+            connection=connection,
+            pr_url=f"https://github.com/acme/api/pull/{i}",
+            steps=[AddressPrStep(kind=kind, position=p) for p, kind in enumerate(("triage", "apply"))],
+        )
+        for i in range(ROWS)
+    ])
+    with query_budget(2):
+        body = client_a.get("/address-pr/runs").json()
+    assert len(body) == ROWS
+    assert body[0]["connection_name"] == "Acme"
+    assert len(body[0]["steps"]) == 2
+
+
+def test_list_watchers_budget(client_a, query_budget):
+    connection = _connection()
+    _seed(*[Watcher(user_id=USER_A_ID, kind="pr_review", connection=connection) for _ in range(ROWS)])
+    with query_budget(1):
+        assert len(client_a.get("/watchers").json()) == ROWS
+
+
+# --- Productivity ---
+
+def test_list_productivity_connections_budget(client_a, query_budget):
+    contract = Contract(created_by_user_id=USER_A_ID, customer=_customers(1)[0], name="Retainer")
+    _seed(*[_connection(contract=contract) for _ in range(ROWS)])
+    with query_budget(1):
+        assert len(client_a.get("/productivity/connections").json()) == ROWS
+
+
+def test_list_productivity_commits_budget(client_a, query_budget):
+    connection = _seed_connection()
+    _seed(*[
+        ProductivityCommit(
+            connection_id=connection.id,
+            hash=f"{i:040x}",
+            short_hash=f"{i:07x}",
+            message=f"Commit {i}",
+            author="dev",
+            date=datetime(2025, 1, 1) + timedelta(hours=i),
+            repository="acme/api",
+        )
+        for i in range(ROWS)
+    ])
+    # The connection lookup, then the page.
+    with query_budget(2):
+        assert len(client_a.get(f"/productivity/connections/{connection.id}/commits").json()) == ROWS
+
+
+def test_list_productivity_pull_requests_budget(client_a, query_budget):
+    connection = _seed_connection()
+    _seed(*[
+        ProductivityPullRequest(
+            connection_id=connection.id,
+            number=i,
+            title=f"PR {i}",
+            status="open",
+            repository="acme/api",
+            url=f"https://github.com/acme/api/pull/{i}",
+            created_at_remote=datetime(2025, 1, 1) + timedelta(hours=i),
+        )
+        for i in range(ROWS)
+    ])
+    with query_budget(2):
+        assert len(client_a.get(f"/productivity/connections/{connection.id}/pull-requests").json()) == ROWS
+
+
+# --- Content ---
+
+def test_list_ideas_budget(client_a, query_budget):
+    ideas = [Idea(user_id=USER_A_ID, slug=f"idea-{i}", title=f"Idea {i}") for i in range(ROWS)]
+    _seed(*ideas, *[
+        Video(user_id=USER_A_ID, title=f"Video {i}", idea=idea)
+        for i, idea in enumerate(ideas)
+        for _ in range(2)
+    ])
+    # The ideas, then the video counts for all of them in one GROUP BY.
+    with query_budget(2):
+        body = client_a.get("/content/ideas").json()
+    assert len(body) == ROWS
+    assert {i["video_count"] for i in body} == {2}
+
+
+def test_awaiting_approval_items_budget(query_budget):
+    connection = _connection()
+    _seed(
+        *[
+            CodeReviewRun(
+                created_by_user_id=USER_A_ID,
+                connection=connection,
+                pr_url=f"https://github.com/acme/api/pull/{i}",
+                status="awaiting_approval",
+            )
+            for i in range(ROWS)
+        ],
+        *[
+            AutomationRun(
+                automation=Automation(user_id=USER_A_ID, name=f"A{i}", skill="/report", frequency="daily"),
+                scheduled_for=date(2025, 6, 1),
+                status="awaiting_approval",
+            )
+            for i in range(ROWS)
+        ],
+    )
+    db = TestingSessionLocal()
+    try:
+        # One query per run type.
+        with query_budget(4):
+            items = _awaiting_approval_items(db)
+    finally:
+        db.close()
+    assert len(items) == 2 * ROWS
+    assert {i["connection_name"] for i in items if i["source"] == "code_review"} == {"Acme"}
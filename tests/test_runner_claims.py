@@ -0,0 +1,154 @@
+"""The runner-facing claim endpoints and the dashboards that run as `async def`
+on get_async_db, each doing its sync service work through `run_sync`."""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.models.address_pr_run import AddressPrRun
+from app.models.agent_task import AgentTask
+from app.models.automation import Automation
+from app.models.automation_run import AutomationRun
+from app.models.code_review_run import CodeReviewRun
+from app.models.implementation_run import ImplementationRun
+from app.models.productivity_connection import ProductivityConnection
+from app.models.watcher import Watcher
+from tests.conftest import USER_A_ID, TestingSessionLocal
+
+RUNNER = {"X-Runner-Token": "runner-secret"}
+
+
+@pytest.fixture(autouse=True)
+def runner_token(monkeypatch):
+    monkeypatch.setattr(settings, "RUNNER_TOKEN", "runner-secret")
+
+
+def _seed(*objects):
+    db = TestingSessionLocal()
+    db.add_all(objects)
+    db.commit()
+    ids = [o.id for o in objects]
+    db.close()
+    return ids
+
+
+def _connection() -> ProductivityConnection:
+    return ProductivityConnection(
+        created_by_user_id=USER_A_ID,
+        provider="github",
+        pat_encrypted="x",
+        username="dev",
+        display_name="Acme",
+    )
+
+
+def _claim(client, path: str):
+    return client.post(path, json={"runner_id": "laptop"}, headers=RUNNER)
+
+
+@pytest.mark.parametrize("path", [
+    "/implementations/runner/claim",
+    "/code-reviews/runner/claim",
+    "/address-pr/runner/claim",
+    "/automations/runner/claim",
+    "/watchers/runner/claim",
+    "/empresa/runner/claim",
+])
+def test_claim_requires_the_runner_token(client_a, monkeypatch, path):
+    assert client_a.post(path, json={"runner_id": "laptop"}).status_code == 401
+    monkeypatch.setattr(settings, "RUNNER_TOKEN", "")
+    assert _claim(client_a, path).status_code == 503
+
+
+def test_claim_implementation_run(client_a):
+    [run_id] = _seed(ImplementationRun(
+        created_by_user_id=USER_A_ID,
+        connection=_connection(),
+        ticket_url="https://jira.example.com/browse/T-1",
+    ))
+
+    body = _claim(client_a, "/implementations/runner/claim").json()
+    assert (body["id"], body["status"], body["connection_name"]) == (str(run_id), "running", "Acme")
+    assert _claim(client_a, "/implementations/runner/claim").json() is None
+
+
+def test_claim_code_review_run(client_a):
+    [run_id] = _seed(CodeReviewRun(
+        created_by_user_id=USER_A_ID,
+        connection=_connection(),
+        pr_url="https://github.com/acme/api/pull/1",
+    ))
+
+    body = _claim(client_a, "/code-reviews/runner/claim").json()
+    assert (body["id"], body["status"], body["connection_name"]) == (str(run_id), "running", "Acme")
+    assert _claim(client_a, "/code-reviews/runner/claim").json() is None
+
+
+def test_claim_address_pr_run(client_a):
+    [run_id] = _seed(AddressPrRun(
+        created_by_user_id=USER_A_ID,
+        connection=_connection(),
+        pr_url="https://github.com/acme/api/pull/2",
+    ))
+
+    body = _claim(client_a, "/address-pr/runner/claim").json()
+    assert (body["id"], body["status"], body["connection_name"]) == (str(run_id), "running", "Acme")
+    assert _claim(client_a, "/address-pr/runner/claim").json() is None
+
+
+def test_claim_automation_run(client_a):
+    [run_id] = _seed(AutomationRun(
+        automation=Automation(user_id=USER_A_ID, name="Daily report", skill="/report", frequency="daily"),
+        scheduled_for=date(2025, 6, 1),
+        is_manual=True,
+    ))
+
+    resp = _claim(client_a, "/automations/runner/claim")
+    assert resp.status_code == 200
+    assert (resp.json()["id"], resp.json()["skill"]) == (str(run_id), "/report")
+    assert _claim(client_a, "/automations/runner/claim").status_code == 204
+
+
+def test_claim_watcher(client_a):
+    connection = _connection()
+    never_run, overdue, _ = _seed(
+        Watcher(user_id=USER_A_ID, kind="pr_review", connection=connection),
+        Watcher(user_id=USER_A_ID, kind="pr_review", connection=connection,
+                last_run_at=datetime.utcnow() - timedelta(minutes=11)),
+        Watcher(user_id=USER_A_ID, kind="pr_review", connection=connection,
+                last_run_at=datetime.utcnow() - timedelta(minutes=9)),
+    )
+
+    resp = _claim(client_a, "/watchers/runner/claim")
+    assert resp.status_code == 200
+    assert (resp.json()["id"], resp.json()["connection_name"]) == (str(never_run), "Acme")
+    assert _claim(client_a, "/watchers/runner/claim").json()["id"] == str(overdue)
+    # Claiming advanced last_run_at, and the third isn't due for another minute.
+    assert _claim(client_a, "/watchers/runner/claim").status_code == 204
+
+
+def test_claim_agent_task(client_a):
+    [task_id] = _seed(AgentTask(agent_slug="cto", skill="/plan"))
+
+    body = _claim(client_a, "/empresa/runner/claim").json()
+    assert (body["id"], body["status"], body["claimed_by"]) == (str(task_id), "running", "laptop")
+    assert _claim(client_a, "/empresa/runner/claim").json() is None
+
+
+def test_briefing(client_a):
+    _seed(CodeReviewRun(
+        created_by_user_id=USER_A_ID,
+        connection=_connection(),
+        pr_url="https://github.com/acme/api/pull/3",
+        status="awaiting_approval",
+    ))
+
+    resp = client_a.get("/briefing", params={"date": "2025-06-01"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["date"] == "2025-06-01"
+    assert [i["connection_name"] for i in body["awaiting_approval"]] == ["Acme"]
+
+
+def test_runner_overview(client_a):
+    assert client_a.get("/runner/overview").status_code == 200
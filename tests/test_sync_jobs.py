@@ -0,0 +1,154 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.productivity_connection import ProductivityConnection
+from app.models.sync_job import SyncJob
+from app.services import sync_jobs
+from tests.conftest import TestingSessionLocal
+from tests.test_productivity_sync import _seed_connection
+
+
+@pytest.fixture(autouse=True)
+def _testing_db(monkeypatch):
+    monkeypatch.setattr(sync_jobs, "SessionLocal", TestingSessionLocal)
+
+
+def _job(job_id) -> SyncJob:
+    db = TestingSessionLocal()
+    try:
+        return db.get(SyncJob, job_id)
+    finally:
+        db.close()
+
+
+def test_enqueue_returns_the_pending_job():
+    conn_id = _seed_connection(["acme/a"])
+    db = TestingSessionLocal()
+    first, created = sync_jobs.enqueue(db, conn_id, trigger="manual")
+    again, created_again = sync_jobs.enqueue(db, conn_id, trigger="manual")
+    db.close()
+
+    assert created and not created_again
+    assert again.id == first.id
+    assert first.status == sync_jobs.QUEUED
+
+
+def test_drain_runs_jobs_and_records_results(monkeypatch):
+    synced = []
+
+    def fake_sync(connection_id, db):
+        synced.append(connection_id)
+        return {"commits_synced": 3, "prs_synced": 1, "errors": []}
+
+    monkeypatch.setattr(sync_jobs, "sync_connection", fake_sync)
+    conn_id = _seed_connection(["acme/a"])
+    db = TestingSessionLocal()
+    job, _ = sync_jobs.enqueue(db, conn_id, trigger="created")
+    db.close()
+
+    assert sync_jobs.drain("test-worker") == 1
+    assert synced == [conn_id]
+    done = _job(job.id)
+    assert (done.status, done.worker, done.commits_synced, done.prs_synced) == (
+        sync_jobs.DONE, "test-worker", 3, 1,
+    )
+    assert done.started_at and done.finished_at
+
+    # Finished jobs don't block the next one.
+    db = TestingSessionLocal()
+    _, created = sync_jobs.enqueue(db, conn_id, trigger="manual")
+    db.close()
+    assert created
+
+
+def test_failed_sync_marks_job_and_connection(monkeypatch):
+    def boom(connection_id, db):
+        raise RuntimeError("provider exploded")
+
+    monkeypatch.setattr(sync_jobs, "sync_connection", boom)
+    conn_id = _seed_connection(["acme/a"])
+    db = TestingSessionLocal()
+    job, _ = sync_jobs.enqueue(db, conn_id, trigger="manual")
+    db.close()
+
+    sync_jobs.drain("test-worker")
+
+    failed = _job(job.id)
+    assert (failed.status, failed.error) == (sync_jobs.ERROR, "provider exploded")
+    db = TestingSessionLocal()
+    conn = db.get(ProductivityConnection, conn_id)
+    assert (conn.last_sync_status, conn.last_sync_error) == ("error", "provider exploded")
+    db.close()
+
+
+def test_recover_stale_fails_abandoned_running_jobs():
+    conn_id = _seed_connection(["acme/a"])
+    db = TestingSessionLocal()
+    sync_jobs.enqueue(db, conn_id, trigger="manual")
+    job_id = sync_jobs.claim_next(db, "gone:1")
+    db.get(SyncJob, job_id).started_at = datetime.utcnow() - timedelta(hours=2)
+    db.commit()
+
+    assert sync_jobs.recover_stale(db) == 1
+    db.close()
+    assert _job(job_id).status == sync_jobs.ERROR
+
+
+def _running_job(started_ago: timedelta):
+    conn_id = _seed_connection(["acme/a"])
+    db = TestingSessionLocal()
+    sync_jobs.enqueue(db, conn_id, trigger="manual")
+    job_id = sync_jobs.claim_next(db, "gone:1")
+    db.get(SyncJob, job_id).started_at = datetime.utcnow() - started_ago
+    db.commit()
+    db.close()
+    return conn_id, job_id
+
+
+def test_recover_stale_trusts_a_free_lock_after_a_short_grace(monkeypatch):
+    # Postgres: a free connection lock means the worker is gone.
+    monkeypatch.setattr(sync_jobs, "engine", SimpleNamespace(dialect=SimpleNamespace(name="postgresql")))
+    held = set()
+
+    @contextmanager
+    def fake_lock(connection_id):
+        yield connection_id not in held
+
+    monkeypatch.setattr(sync_jobs, "connection_lock", fake_lock)
+    _, abandoned = _running_job(timedelta(minutes=2))
+    busy_conn, busy = _running_job(timedelta(minutes=2))
+    held.add(busy_conn)
+    _, just_claimed = _running_job(timedelta(seconds=5))
+
+    db = TestingSessionLocal()
+    assert sync_jobs.recover_stale(db) == 1
+    db.close()
+    assert _job(abandoned).status == sync_jobs.ERROR
+    assert _job(busy).status == sync_jobs.RUNNING
+    assert _job(just_claimed).status == sync_jobs.RUNNING
+
+
+def test_start_workers_recovers_abandoned_jobs_first():
+    _, job_id = _running_job(timedelta(hours=2))
+
+    sync_jobs.start_workers(count=0)
+
+    assert _job(job_id).status == sync_jobs.ERROR
+
+
+def test_trigger_sync_enqueues_once(client_a):
+    conn_id = _seed_connection(["acme/a"])
+
+    first = client_a.post(f"/productivity/connections/{conn_id}/sync").json()
+    second = client_a.post(f"/productivity/connections/{conn_id}/sync").json()
+    assert first["status"] == "started"
+    assert second["status"] == "in_progress"
+    assert second["job_id"] == first["job_id"]
+
+    jobs = client_a.get(f"/productivity/connections/{conn_id}/sync-jobs").json()
+    assert [(j["id"], j["status"], j["trigger"]) for j in jobs] == [
+        (first["job_id"], "queued", "manual"),
+    ]
@@ -0,0 +1,62 @@
+import json
+import threading
+
+from app.services import productivity_sync, sync_jobs, sync_progress
+from tests.conftest import TestingSessionLocal
+from tests.test_productivity_sync import FakeProvider, _seed_connection
+
+
+def _events(body: str) -> list[dict]:
+    return [
+        json.loads(line[len("data: "):])
+        for line in body.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+def test_sync_events_stream_a_running_sync(client_a, monkeypatch):
+    monkeypatch.setattr(sync_jobs, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(sync_progress, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(productivity_sync, "_get_provider", lambda connection: FakeProvider())
+
+    # Start the worker once the stream has subscribed and read its snapshot.
+    streaming = threading.Event()
+    snapshot = sync_progress.snapshot
+
+    def snapshot_then_signal(connection_id):
+        try:
+            return snapshot(connection_id)
+        finally:
+            streaming.set()
+
+    monkeypatch.setattr(sync_progress, "snapshot", snapshot_then_signal)
+
+    conn_id = _seed_connection(["acme/a", "acme/b"])
+    db = TestingSessionLocal()
+    sync_jobs.enqueue(db, conn_id, trigger="manual")
+    db.close()
+
+    def worker():
+        streaming.wait(5)
+        sync_jobs.drain("test-worker")
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    resp = client_a.get(f"/productivity/connections/{conn_id}/sync-events")
+    thread.join(5)
+
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = _events(resp.text)
+    assert events[0]["event"] == "snapshot" and events[0]["job"]["status"] == "queued"
+    assert (events[1]["event"], events[1]["repos_total"]) == ("sync_started", 2)
+    finished = [e for e in events if e["event"] == "repo_finished"]
+    assert sorted(e["repo"] for e in finished) == ["acme/a", "acme/b"]
+    assert finished[-1]["repos_done"] == 2
+    assert events[-1]["event"] == "sync_finished"
+    assert events[-1]["status"] == "success"
+
+    # Idle connection: just the snapshot.
+    idle = _events(client_a.get(f"/productivity/connections/{conn_id}/sync-events").text)
+    assert [(e["event"], e["job"], e["last_sync_status"]) for e in idle] == [
+        ("snapshot", None, "success"),
+    ]
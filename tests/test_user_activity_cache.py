@@ -0,0 +1,87 @@
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.models.productivity_connection import ProductivityConnection
+from app.models.user_activity_cache import UserActivityCache
+from app.services import user_activity_cache
+from tests.conftest import TestingSessionLocal
+from tests.test_productivity_sync import _seed_connection
+
+
+class FakeFetch:
+    def __init__(self):
+        self.calls: list[tuple] = []
+        self.done = threading.Event()
+
+    async def __call__(self, pat, username, date_from, date_to, priority):
+        self.calls.append((date_from, date_to, priority))
+        self.done.set()
+        return {
+            "totals": {"commits": len(self.calls), "prs": 0},
+            "organizations": [],
+            "diagnostics": {"github_total_commits": 0, "github_total_prs": 0, "restricted_contributions": 0},
+        }
+
+
+@pytest.fixture
+def fetch(monkeypatch):
+    fake = FakeFetch()
+    monkeypatch.setattr(user_activity_cache, "SessionLocal", TestingSessionLocal)
+    monkeypatch.setattr(user_activity_cache, "decrypt_value", lambda value: value)
+    monkeypatch.setattr(user_activity_cache, "_fetch", fake)
+    conn_id = _seed_connection([])
+    db = TestingSessionLocal()
+    db.get(ProductivityConnection, conn_id).is_primary = True
+    db.commit()
+    db.close()
+    fake.conn_id = conn_id
+    return fake
+
+
+def _age(conn_id, date_from: date, date_to: date, fetched_at: datetime) -> None:
+    db = TestingSessionLocal()
+    db.get(UserActivityCache, (conn_id, date_from, date_to)).fetched_at = fetched_at
+    db.commit()
+    db.close()
+
+
+def _commits(client, date_from: date, date_to: date) -> int:
+    params = {"date_from": date_from.isoformat(), "date_to": date_to.isoformat()}
+    return client.get("/productivity/user-activity", params=params).json()["totals"]["commits"]
+
+
+def test_miss_fetches_once_then_serves_the_cache(client_a, fetch):
+    today = datetime.utcnow().date()
+    assert _commits(client_a, today - timedelta(days=6), today) == 1
+    assert _commits(client_a, today - timedelta(days=6), today) == 1
+    assert [p for *_, p in fetch.calls] == ["interactive"]
+
+
+def test_stale_entry_is_served_and_refreshed_in_background(client_a, fetch):
+    today = datetime.utcnow().date()
+    start = today - timedelta(days=6)
+    _commits(client_a, start, today)
+    _age(fetch.conn_id, start, today, datetime.utcnow() - timedelta(hours=1))
+    fetch.done.clear()
+
+    assert _commits(client_a, start, today) == 1  # the stale copy, at once
+    assert fetch.done.wait(5)
+    deadline = time.monotonic() + 5
+    while user_activity_cache._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)  # the refresh is still storing its result
+    assert fetch.calls[-1][2] == "background"
+    assert _commits(client_a, start, today) == 2
+
+
+def test_past_range_is_final(client_a, fetch):
+    last_month = date(2026, 9, 1), date(2026, 9, 30)
+    _commits(client_a, *last_month)
+    _age(fetch.conn_id, *last_month, datetime(2026, 10, 5))
+
+    assert _commits(client_a, *last_month) == 1
+    assert len(fetch.calls) == 1
+    assert user_activity_cache.is_final(date(2026, 9, 30), datetime(2026, 10, 2))
+    assert not user_activity_cache.is_final(date(2026, 9, 30), datetime(2026, 10, 1, 12))